@@ -0,0 +1,161 @@
+"""
+Benchmark cases for public entry points of Emmet. Every case is created by
+a factory which receives input size scale and returns a function to measure:
+input data is generated once, before measuring
+"""
+from emmet import expand, extract, extract_all
+from emmet.html_matcher import match as html_match, balanced_outward as html_outward, \
+    balanced_inward as html_inward
+from emmet.css_matcher import match as css_match, balanced_outward as css_outward, \
+    balanced_inward as css_inward
+from emmet.action_utils import select_item_html, select_item_css, get_css_section
+from emmet.math_expression import evaluate
+
+MB = 1024 * 1024
+
+html_block = """<section class="item" id="s{0}">
+    <!-- Item {0} -->
+    <h2 class="title"><a href="/items/{0}" title="Item {0}">Item {0}</a></h2>
+    <p>Lorem ipsum dolor sit amet, <b>consectetur</b> adipisicing elit.<br>
+    Aliquam <em>quibusdam</em> <img src="/img/{0}.png" alt="">sapiente.</p>
+    <ul class="tags">
+        <li><a href="#a">a</a></li><li><a href="#b">b</a></li>
+    </ul>
+    <script>if (a < b && c > d) {{ render("{0}"); }}</script>
+</section>
+"""
+
+css_block = """.item-{0} {{
+    padding: 10px 20px;
+    background: url("/img/{0}.png") no-repeat;
+    /* Item {0} */
+    &:hover {{ color: #f00; border: 1px solid rgba(0, 0, 0, .5); }}
+    @media (min-width: 768px) {{
+        .title {{ font: bold 14px/1.5 Arial, sans-serif; }}
+    }}
+}}
+"""
+
+
+def repeat_block(block: str, size: int, sep='') -> str:
+    "Repeats formatted block until result reaches given size"
+    parts = []
+    total = 0
+    ix = 0
+    while total < size:
+        part = block.format(ix)
+        parts.append(part)
+        total += len(part) + len(sep)
+        ix += 1
+    return sep.join(parts)
+
+
+def html_document(size: int) -> str:
+    return '<!DOCTYPE html>\n<html>\n<body>\n%s</body>\n</html>\n' % repeat_block(html_block, size)
+
+
+def css_document(size: int) -> str:
+    return repeat_block(css_block, size)
+
+
+def deep_html(depth: int) -> str:
+    return '<div class="a">' * depth + 'text' + '</div>' * depth
+
+
+def long_line_html(size: int) -> str:
+    "Minified document: the whole markup is a single line"
+    return html_document(size).replace('\n', '')
+
+
+def long_line_css(size: int) -> str:
+    return ' '.join(css_document(size).split())
+
+
+def middle(code: str, needle: str) -> int:
+    "Returns location inside `needle` found closest to the middle of code"
+    pos = code.find(needle, len(code) // 2)
+    return (pos if pos != -1 else code.find(needle)) + 1
+
+
+def expand_case(abbr: str, config: dict=None):
+    return lambda scale: lambda: expand(abbr, config or {})
+
+
+def extract_case(line_factory, pos=None, options=None):
+    def factory(scale: float):
+        line = line_factory(scale)
+        return lambda: extract(line, pos, options or {})
+    return factory
+
+
+def extract_all_case(document_factory, options=None):
+    def factory(scale: float):
+        code = document_factory(scale)
+        return lambda: extract_all(code, options or {})
+    return factory
+
+
+def call_case(fn, document_factory, needle: str, *args):
+    def factory(scale: float):
+        code = document_factory(scale)
+        pos = middle(code, needle)
+        return lambda: fn(code, pos, *args)
+    return factory
+
+
+def evaluate_case(expr_factory):
+    def factory(scale: float):
+        expr = expr_factory(scale)
+        return lambda: evaluate(expr)
+    return factory
+
+
+large_html = lambda scale: html_document(int(2 * MB * scale))
+large_css = lambda scale: css_document(int(2 * MB * scale))
+sample_html = lambda scale: html_document(8 * 1024)
+sample_css = lambda scale: css_document(8 * 1024)
+
+cases = [
+    # name, case factory
+    ('expand/markup/simple', expand_case('ul#nav>li.item$*5>a[href="#"]{Item $}')),
+    ('expand/markup/snippet', expand_case('html:5')),
+    ('expand/markup/jsx', expand_case('div.a>(header>h1)+footer', { 'options': { 'jsx.enabled': True } })),
+    ('expand/markup/deep_nesting', expand_case('>'.join(['div.level'] * 200))),
+    ('expand/markup/huge_repeat', expand_case('ul>li.item$@-*5000>a')),
+    ('expand/markup/nested_groups', expand_case('(' * 50 + 'a' + ')' * 50)),
+    ('expand/markup/lorem', expand_case('lorem5000', { 'options': { 'lorem.seed': 1 } })),
+    ('expand/stylesheet/property', expand_case('p10', { 'type': 'stylesheet' })),
+    ('expand/stylesheet/fuzzy', expand_case('bdrs', { 'type': 'stylesheet' })),
+    ('expand/stylesheet/multiple', expand_case('p10+m5-a+bd1-s#f00+fz12+lh1.5', { 'type': 'stylesheet' })),
+    ('expand/stylesheet/value', expand_case('n', { 'type': 'stylesheet', 'context': { 'name': 'display' } })),
+
+    ('extract/markup', extract_case(lambda scale: 'Hello ul>li.item*5')),
+    ('extract/stylesheet', extract_case(lambda scale: '    p10+m5', None, { 'type': 'stylesheet' })),
+    ('extract/long_line', extract_case(lambda scale: 'text ' * int(20000 * scale) + 'ul>li')),
+    ('extract/brackets', extract_case(lambda scale: '[' * int(10000 * scale) + 'a')),
+    ('extract/prefix', extract_case(lambda scale: '<' * int(5000 * scale) + 'div>p', None, { 'prefix': '<' })),
+    ('extract/all/document', extract_all_case(lambda scale: html_document(int(100 * 1024 * scale)))),
+    ('extract/all/jsx', extract_all_case(lambda scale: long_line_html(int(100 * 1024 * scale)), { 'prefix': '<' })),
+
+    ('html_matcher/match/sample', call_case(html_match, sample_html, '<b>')),
+    ('html_matcher/match/large', call_case(html_match, large_html, '<b>')),
+    ('html_matcher/balanced_outward/large', call_case(html_outward, large_html, '<b>')),
+    ('html_matcher/balanced_inward/large', call_case(html_inward, large_html, '<b>')),
+    ('html_matcher/match/deep_nesting', call_case(html_match, lambda scale: deep_html(int(20000 * scale)), 'text')),
+    ('html_matcher/match/long_line', call_case(html_match, lambda scale: long_line_html(int(MB * scale)), '<b>')),
+
+    ('css_matcher/match/sample', call_case(css_match, sample_css, 'padding')),
+    ('css_matcher/match/large', call_case(css_match, large_css, 'padding')),
+    ('css_matcher/balanced_outward/large', call_case(css_outward, large_css, 'padding')),
+    ('css_matcher/balanced_inward/large', call_case(css_inward, large_css, 'padding')),
+    ('css_matcher/match/long_line', call_case(css_match, lambda scale: long_line_css(int(MB * scale)), 'padding')),
+
+    ('action_utils/select_item_html/next', call_case(select_item_html, large_html, '<img', False)),
+    ('action_utils/select_item_html/prev', call_case(select_item_html, large_html, '<img', True)),
+    ('action_utils/select_item_css/next', call_case(select_item_css, large_css, 'padding', False)),
+    ('action_utils/select_item_css/prev', call_case(select_item_css, large_css, 'padding', True)),
+    ('action_utils/get_css_section', call_case(get_css_section, large_css, 'padding', True)),
+
+    ('math_expression/evaluate/simple', evaluate_case(lambda scale: '2 + 3 * (4 - 1) / 2')),
+    ('math_expression/evaluate/long', evaluate_case(lambda scale: '+'.join(['(1*2-3/4)'] * int(1000 * scale)))),
+]
@@ -0,0 +1,71 @@
+"""
+Measures import cost of `emmet` package and its public entry points with
+`python -X importtime` and checks it against time budget. Each entry point is
+measured in a fresh interpreter; import time is a sum of cumulative times of
+top-level imports made by package, the best of several runs is taken.
+Exits with non-zero code if any entry point exceeds its budget.
+
+Usage: python benchmarks/import_time.py [--runs N] [--scale FACTOR]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+entry_points = (
+    # name, code, budget in milliseconds
+    ('import emmet', 'import emmet', 10),
+    ('expand markup', 'import emmet; emmet.expand("ul>li")', 150),
+    ('expand stylesheet', 'import emmet; emmet.expand("p10", {"type": "stylesheet"})', 150),
+    ('extract', 'import emmet; emmet.extract("foo ul>li", 9)', 20),
+    ('html_matcher', 'import emmet.html_matcher', 50),
+    ('css_matcher', 'import emmet.css_matcher', 40),
+    ('action_utils', 'import emmet.action_utils', 80),
+)
+
+
+def import_time(code: str) -> float:
+    "Returns import time of `emmet` modules for given code, in milliseconds"
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=root, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                            universal_newlines=True, check=True).stderr
+    total = 0
+    for line in output.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[2].startswith(' ') or parts[2].startswith('  '):
+            # Not a top-level import
+            continue
+
+        name = parts[2].strip()
+        if name == 'emmet' or name.startswith('emmet.'):
+            total += int(parts[1])
+
+    return total / 1000.0
+
+
+def measure(runs=5) -> list:
+    "Measures import time of every entry point, returns list of (name, time, budget)"
+    return [(name, min(import_time(code) for _ in range(runs)), budget)
+            for name, code, budget in entry_points]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Checks import time budget of emmet package')
+    parser.add_argument('--runs', type=int, default=5, help='Amount of runs per entry point')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier of time budgets for slow machines')
+    args = parser.parse_args()
+
+    failed = False
+    for name, time, budget in measure(args.runs):
+        budget *= args.scale
+        ok = time <= budget
+        failed = failed or not ok
+        print('%-20s %8.2f ms  (budget %6.2f ms)  %s' % (name, time, budget, 'ok' if ok else 'FAIL'))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
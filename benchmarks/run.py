@@ -0,0 +1,129 @@
+"""
+Runs Emmet benchmarks and prints results as JSON. For every case, function
+is called in batches large enough to take at least `--min-time` seconds,
+time of a single call is measured in several batches and summarized
+with min, max, mean, median and standard deviation (in seconds).
+
+Usage: python benchmarks/run.py [--filter PATTERN] [--repeat N]
+       [--min-time SECONDS] [--scale FACTOR] [--output FILE]
+       [--compare BASELINE] [--list]
+"""
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from cases import cases
+
+
+def calibrate(fn: callable, min_time: float) -> int:
+    "Returns amount of calls in batch which takes at least `min_time` seconds"
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed else number * 10
+
+
+def measure(fn: callable, repeat=5, min_time=0.1) -> dict:
+    "Measures time of a single `fn` call and returns its statistical summary"
+    number = calibrate(fn, min_time)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'timings': timings
+    }
+
+
+def run(pattern: str=None, repeat=5, min_time=0.1, scale=1.0, log=None) -> dict:
+    "Runs benchmark cases matching given pattern and returns report"
+    results = []
+    for name, factory in cases:
+        if pattern and not re.search(pattern, name):
+            continue
+
+        if log:
+            log('%s... ' % name)
+
+        result = measure(factory(scale), repeat, min_time)
+        result['name'] = name
+        results.append(result)
+
+        if log:
+            log('%.6f s\n' % result['median'])
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'scale': scale,
+        'results': results
+    }
+
+
+def compare(report: dict, baseline: dict, log: callable):
+    "Logs median time change of every case against baseline report"
+    base = dict((result['name'], result) for result in baseline.get('results', []))
+    for result in report['results']:
+        prev = base.get(result['name'])
+        if prev and prev['median']:
+            log('%-45s %+7.1f%%\n' % (result['name'], (result['median'] / prev['median'] - 1) * 100))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs Emmet benchmarks and emits results as JSON')
+    parser.add_argument('--filter', dest='pattern', help='Run only cases which names match given regexp')
+    parser.add_argument('--repeat', type=int, default=5, help='Amount of measured batches per case')
+    parser.add_argument('--min-time', type=float, default=0.1, help='Minimum duration of a single batch, in seconds')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier of generated input sizes')
+    parser.add_argument('--output', help='Write JSON report into given file instead of stdout')
+    parser.add_argument('--compare', help='Report median time change against given JSON report')
+    parser.add_argument('--list', action='store_true', help='List available cases and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, _ in cases:
+            print(name)
+        return 0
+
+    report = run(args.pattern, args.repeat, args.min_time, args.scale, sys.stderr.write)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f), sys.stderr.write)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,41 +1,167 @@
-from .config import Config
-from .markup import parse as markup_abbreviation, \
-    stringify as stringify_markup, \
-    abbreviation as parse_markup_abbreviation, \
-    Abbreviation, AbbreviationNode, AbbreviationAttribute
-from .stylesheet import parse as stylesheet_abbreviation, \
-    stringify as stringify_stylesheet, \
-    abbreviation as parse_stylesheet_abbreviation, \
-    convert_snippets as parse_stylesheet_snippets
-from .extract_abbreviation import extract_abbreviation as extract
+from importlib import import_module as _import_module
 from .scanner import ScannerException
 
+__doc__ = """
+Emmet abbreviation expander. Public names of package are loaded lazily, on
+first access: `import emmet` doesn’t import markup, stylesheet or extractor
+modules until they’re actually used
+"""
+
+_lazy_names = {
+    'Config': ('.config', 'Config'),
+    'get_config': ('.config', 'get_config'),
+    'ResultCache': ('.cache', 'ResultCache'),
+    'iter_output': ('.output_stream', 'iter_output'),
+    'markup_abbreviation': ('.markup', 'parse'),
+    'stringify_markup': ('.markup', 'stringify'),
+    'parse_markup_abbreviation': ('.markup', 'abbreviation'),
+    'Abbreviation': ('.markup', 'Abbreviation'),
+    'AbbreviationNode': ('.markup', 'AbbreviationNode'),
+    'AbbreviationAttribute': ('.markup', 'AbbreviationAttribute'),
+    'stylesheet_abbreviation': ('.stylesheet', 'parse'),
+    'stringify_stylesheet': ('.stylesheet', 'stringify'),
+    'parse_stylesheet_abbreviation': ('.stylesheet', 'abbreviation'),
+    'parse_stylesheet_snippets': ('.stylesheet', 'convert_snippets'),
+    'extract': ('.extract_abbreviation', 'extract_abbreviation'),
+    'extract_all': ('.extract_abbreviation', 'extract_all'),
+    'profile': ('.profiler', 'profile'),
+    'Profiler': ('.profiler', 'Profiler'),
+    'ExpandReport': ('.profiler', 'ExpandReport'),
+}
+"Public names of package and modules they’re imported from"
+
+
+__all__ = list(_lazy_names) + [
+    'expand', 'expand_many', 'iter_expand', 'expand_markup', 'expand_stylesheet',
+    'ScannerException'
+]
+
+
+def __getattr__(name: str):
+    if name in _lazy_names:
+        module, attr = _lazy_names[name]
+        value = getattr(_import_module(module, __name__), attr)
+        globals()[name] = value
+        return value
+
+    if not name.startswith('_'):
+        # Submodules like `emmet.markup` are available right after `import emmet`
+        try:
+            return _import_module('.' + name, __name__)
+        except ModuleNotFoundError as err:
+            if err.name != '%s.%s' % (__name__, name):
+                raise
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+def expand(abbr: str, config: dict={}, global_config: dict={}, result_cache: 'ResultCache'=None) -> str:
+    """
+    Expands given abbreviation into code snippet. If `result_cache` is given,
+    expansion result is looked up in and stored to this cache
+    """
+    from .config import Config, get_config
+    if result_cache is not None:
+        key = result_cache.key(abbr, config, global_config)
+        if key is not None:
+            result = result_cache.get(key)
+            if result is None:
+                result = expand(abbr, config, global_config)
+                result_cache.set(key, result)
+            return result
 
-def expand(abbr: str, config: dict={}, global_config: dict={}) -> str:
-    "Expands given abbreviation into code snippet"
     if isinstance(config, Config):
         resolved_config = config
     else:
-        resolved_config = Config(config, global_config)
+        resolved_config = get_config(config, global_config)
     if resolved_config.type == 'stylesheet':
         return expand_stylesheet(abbr, resolved_config)
 
     return expand_markup(abbr, resolved_config)
 
 
-def expand_markup(abbr: str, config: Config) -> str:
+def expand_many(abbrs: list, config: dict={}, global_config: dict={}) -> list:
+    """
+    Expands given abbreviations with the same config and returns list of results
+    in the same order. Config is resolved only once and all expansions share
+    converted stylesheet snippets, parsed markup snippets and parser options
+    """
+    from .config import Config, get_config
+    from .profiler import get_profiler
+    if isinstance(config, Config):
+        resolved_config = config.derive(dict(config.user_config))
+    else:
+        resolved_config = get_config(config, global_config).derive(dict(config))
+
+    if resolved_config.cache is None:
+        resolved_config.cache = {}
+
+    if get_profiler() is not None:
+        # Profiler should report every expansion separately
+        expander = expand_stylesheet if resolved_config.type == 'stylesheet' else expand_markup
+        return [expander(abbr, resolved_config) for abbr in abbrs]
+
+    if resolved_config.type == 'stylesheet':
+        from .stylesheet import parse, prepare, stringify
+    else:
+        from .markup import parse, prepare, stringify
+
+    prepared = prepare(resolved_config)
+    return [stringify(parse(abbr, resolved_config, prepared), resolved_config) for abbr in abbrs]
+
+
+def iter_expand(abbr: str, config: dict={}, global_config: dict={}, max_pending=4):
+    """
+    Expands given abbreviation and yields output in chunks as soon as they’re
+    produced. Markup is formatted in a separate thread which is paused when
+    `max_pending` chunks are waiting to be consumed
+    """
+    from .config import Config, get_config
+    from .output_stream import iter_output
+    from .markup import parse as markup_abbreviation, stringify as stringify_markup
+    if isinstance(config, Config):
+        resolved_config = config
+    else:
+        resolved_config = get_config(config, global_config)
+
+    if resolved_config.type == 'stylesheet':
+        yield expand_stylesheet(abbr, resolved_config)
+    else:
+        abbr = markup_abbreviation(abbr, resolved_config)
+        yield from iter_output(lambda sink: stringify_markup(abbr, resolved_config, sink), max_pending)
+
+
+def expand_markup(abbr: str, config: 'Config', sink=None) -> str:
     """
     Expands given *markup* abbreviation (e.g. regular Emmet abbreviation that
     produces structured output like HTML) and outputs it according to options
-    provided in config
+    provided in config. If `sink` is given, output is written into it
     """
-    return stringify_markup(markup_abbreviation(abbr, config), config)
+    from .markup import parse as markup_abbreviation, stringify as stringify_markup
+    from .profiler import get_profiler
+    profiler = get_profiler()
+    if profiler is not None:
+        return profiler.expand(abbr, config.type, lambda: profiler.measure(
+            'formatter', stringify_markup, markup_abbreviation(abbr, config), config, sink))
 
+    return stringify_markup(markup_abbreviation(abbr, config), config, sink)
 
-def expand_stylesheet(abbr: str, config: Config):
+
+def expand_stylesheet(abbr: str, config: 'Config'):
     """
     Expands given *stylesheet* abbreviation (a special Emmet abbreviation designed for
     stylesheet languages like CSS, SASS etc.) and outputs it according to options
     provided in config
     """
+    from .stylesheet import parse as stylesheet_abbreviation, stringify as stringify_stylesheet
+    from .profiler import get_profiler
+    profiler = get_profiler()
+    if profiler is not None:
+        return profiler.expand(abbr, config.type, lambda: profiler.measure(
+            'formatter', stringify_stylesheet, stylesheet_abbreviation(abbr, config), config))
+
     return stringify_stylesheet(stylesheet_abbreviation(abbr, config), config)
@@ -1,14 +1,38 @@
 from .tokenizer import tokenize
-from .convert import convert, Abbreviation, AbbreviationAttribute, AbbreviationNode
+from .tokenizer.fast import tokenize as fast_tokenize
+from .convert import convert, Abbreviation, AbbreviationAttribute, AbbreviationNode, RepeatedNodes, VirtualRepeater
 from .parser import parse as parser
 from ..scanner import ScannerException
+from ..profiler import get_profiler, count_nodes
+
+TOKENIZERS = {
+    'default': tokenize,
+    'fast': fast_tokenize
+}
 
 def parse(abbr: str, options={}):
     try:
-        tokens = tokenize(abbr) if isinstance(abbr, str) else abbr
+        profiler = get_profiler()
+        if profiler is not None:
+            return profiled_parse(profiler, abbr, options)
+
+        tokens = TOKENIZERS.get(options.get('tokenizer'), tokenize)(abbr) if isinstance(abbr, str) else abbr
         return convert(parser(tokens, options), options)
     except ScannerException as err:
         if isinstance(abbr, str):
             err.message += '\n%s\n%s^' % (abbr, '-' * err.pos)
 
         raise err
+
+
+def profiled_parse(profiler, abbr, options: dict):
+    "Same as `parse()` but records pipeline stages in given profiler"
+    tokens = abbr
+    if isinstance(abbr, str):
+        tokens = profiler.measure('tokenize', TOKENIZERS.get(options.get('tokenizer'), tokenize), abbr)
+    profiler.count('tokens', len(tokens))
+
+    tree = profiler.measure('parser', parser, tokens, options)
+    result = profiler.measure('convert', convert, tree, options)
+    profiler.count('nodes', count_nodes(result.children))
+    return result
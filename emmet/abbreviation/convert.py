@@ -1,16 +1,17 @@
 import re
+from bisect import bisect_right
 from .parser import TokenGroup, TokenElement, TokenAttribute, is_quote, is_bracket
 from .tokenizer import tokens
-from .stringify import stringify
+from .stringify import stringify, repeater_number
 
 re_url = re.compile(r'(https?:|ftp:|file:)?\/\/|(www|ftp)\.')
 re_email = re.compile(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,5}$', re.I)
 
 class ConvertState:
     __slots__ = ('inserted', 'text', 'repeat_guard', 'repeaters', 'variables',
-                 '_text_inserted', 'clean_text')
+                 '_text_inserted', 'clean_text', 'lazy_repeat')
 
-    def __init__(self, text: str = None, variables={}, max_repeat=None):
+    def __init__(self, text: str = None, variables={}, max_repeat=None, lazy_repeat=0):
         self.inserted = False
         self.text = text
 
@@ -24,6 +25,12 @@ class ConvertState:
         self.repeaters = []
         self._text_inserted = False
 
+        self.lazy_repeat = lazy_repeat or 0
+        """
+        Minimum repeat count of node to be repeated virtually: instead of node
+        copies, a single node is created and repeated at output time
+        """
+
     def get_text(self, pos: int):
         self._text_inserted = True
         if isinstance(self.text, list):
@@ -46,6 +53,12 @@ class Abbreviation:
         self.type = 'Abbreviation'
         self.children = []
 
+    def clone(self):
+        "Creates deep copy of current abbreviation tree"
+        abbr = Abbreviation()
+        abbr.children = [child.clone() for child in self.children]
+        return abbr
+
 class AbbreviationNode:
     __slots__ = ('type', 'name', 'value', 'repeat', 'attributes', 'children', 'self_closing')
 
@@ -59,6 +72,115 @@ class AbbreviationNode:
         self.self_closing = node.self_close
         "Indicates current element is self-closing, e.g. should not contain closing pair"
 
+    def clone(self):
+        "Creates deep copy of current node"
+        node = AbbreviationNode.__new__(AbbreviationNode)
+        node.type = self.type
+        node.name = self.name
+        node.value = self.value[:] if self.value is not None else None
+        node.attributes = [attr.copy(True) for attr in self.attributes] if self.attributes is not None else None
+        node.children = [child.clone() for child in self.children]
+        node.repeat = clone_repeater(self.repeat) if self.repeat else None
+        node.self_closing = self.self_closing
+        return node
+
+
+class VirtualRepeater(tokens.Repeater):
+    """
+    Repeater of virtually repeated node: such node is a template which should
+    be outputted `count` times, with `value` updated for each output
+    """
+    __slots__ = ()
+
+
+class LazyNumber:
+    """
+    Repeater number in value of virtually repeated node: actual number is
+    calculated from repeater state at output time
+    """
+    __slots__ = ('token', 'repeater', 'parent')
+
+    def __init__(self, token: tokens.RepeaterNumber, repeaters: list):
+        last_ix = len(repeaters) - 1
+        parent_ix = max(0, last_ix - token.parent)
+        self.token = token
+        self.repeater = capture_repeater(repeaters[-1])
+        self.parent = capture_repeater(repeaters[parent_ix]) if token.parent and parent_ix != last_ix else None
+
+    def __str__(self):
+        return repeater_number(self.token, self.repeater, self.parent)
+
+
+class RepeatedNodes:
+    """
+    List-like view of child nodes where virtually repeated nodes are expanded:
+    indexing and iteration return template nodes. Use `walk()` to iterate over
+    nodes with repeater state of each virtual copy
+    """
+    __slots__ = ('nodes', 'segments', 'offsets', 'size')
+
+    def __init__(self, nodes: list):
+        self.nodes = nodes
+        "Original list of nodes"
+
+        self.segments = []
+        "List of `(nodes, repeater)` segments, `repeater` is set for virtually repeated nodes"
+
+        self.offsets = []
+        "Index of first node of each segment"
+
+        self.size = 0
+        i = 0
+        l = len(nodes)
+
+        while i < l:
+            repeater = nodes[i].repeat
+            j = i + 1
+            if isinstance(repeater, VirtualRepeater):
+                # A single virtual node may be resolved into multiple nodes
+                # (e.g. snippet), all of them share the same repeater
+                while j < l and nodes[j].repeat is repeater:
+                    j += 1
+            else:
+                repeater = None
+
+            self.segments.append((nodes[i:j], repeater))
+            self.offsets.append(self.size)
+            self.size += (j - i) * (repeater.count if repeater else 1)
+            i = j
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('list index out of range')
+
+        ix = bisect_right(self.offsets, index) - 1
+        segment = self.segments[ix][0]
+        return segment[(index - self.offsets[ix]) % len(segment)]
+
+    def __iter__(self):
+        for segment, repeater in self.segments:
+            for _ in range(repeater.count if repeater else 1):
+                yield from segment
+
+    def walk(self):
+        "Iterates over `(index, node)` pairs, updating virtual repeater for each node copy"
+        index = 0
+        for segment, repeater in self.segments:
+            for i in range(repeater.count if repeater else 1):
+                if repeater:
+                    repeater.value = i
+                for node in segment:
+                    yield index, node
+                    index += 1
+
 
 class AbbreviationAttribute:
     __slots__ = ('name', 'value', 'value_type', 'boolean', 'implied', 'multiple')
@@ -78,15 +200,16 @@ class AbbreviationAttribute:
         self.multiple = multiple
         "Indicates that current attribute was repeated multiple times in a row"
 
-    def copy(self):
-        return AbbreviationAttribute(self.name, self.value, self.value_type, self.boolean, self.implied, self.multiple)
+    def copy(self, copy_value=False):
+        value = self.value[:] if copy_value and self.value is not None else self.value
+        return AbbreviationAttribute(self.name, value, self.value_type, self.boolean, self.implied, self.multiple)
 
 
 def convert(abbr: TokenGroup, params={}):
     "Converts given token-based abbreviation into simplified and unrolled node-based abbreviation"
     text = params.get('text')
     options = params.get('options') or {}
-    state = ConvertState(text, params.get('variables'), params.get('max_repeat'))
+    state = ConvertState(text, params.get('variables'), params.get('max_repeat'), params.get('lazy_repeat'))
     result = Abbreviation()
     result.children = convert_group(abbr, state)
 
@@ -118,6 +241,11 @@ def convert_statement(node: TokenElement, state: ConvertState):
         else:
             repeat.count = repeat.count or 1
 
+        if can_repeat_virtually(node, repeat, state):
+            items = convert_virtual(node, repeat, state)
+            if items is not None:
+                return items
+
         state.repeaters.append(repeat)
         i = 0
 
@@ -153,6 +281,92 @@ def convert_statement(node: TokenElement, state: ConvertState):
     return result
 
 
+def convert_virtual(node: TokenElement, repeat: tokens.Repeater, state: ConvertState):
+    """
+    Converts given repeated node into a single virtually repeated node.
+    Returns `None` if node can’t be repeated virtually with the same output
+    as regular repeat
+    """
+    original = node.repeat
+    repeat_guard = state.repeat_guard
+    repeater = VirtualRepeater(repeat.count, 0, False)
+
+    state.repeaters.append(repeater)
+    node.repeat = repeater
+    items = convert_element(node, state)
+    node.repeat = original
+    state.repeaters.pop()
+
+    # Every regular repeat spends the same amount of repeat guard as template
+    # conversion plus one for repeated node itself. Make sure regular repeat
+    # won’t hit the guard
+    used_guard = repeat_guard - state.repeat_guard
+    if len(items) != 1 or repeat.count * (used_guard + 1) >= repeat_guard or not is_valid_template(items[0]):
+        state.repeat_guard = repeat_guard
+        return None
+
+    items[0].repeat = repeater
+    state.repeat_guard = repeat_guard - repeat.count * (used_guard + 1)
+    return items
+
+
+def can_repeat_virtually(node: TokenElement, repeat: tokens.Repeater, state: ConvertState):
+    "Check if given repeated node can be converted into virtually repeated one"
+    return state.lazy_repeat > 0 and repeat.count >= state.lazy_repeat and \
+        state.text is None and not repeat.implicit and \
+        isinstance(node, TokenElement) and has_static_shape(node)
+
+
+def has_static_shape(node: TokenElement):
+    """
+    Check if given node and its descendants produce the same names for every
+    repeat: names can’t contain repeater numbers and placeholders
+    """
+    if isinstance(node, TokenElement):
+        if node.name and some(node.name, is_repeater_token):
+            return False
+
+        if node.value and some(node.value, is_repeater_placeholder):
+            return False
+
+        if node.attributes:
+            for attr in node.attributes:
+                if (attr.name and some(attr.name, is_repeater_token)) or \
+                    (attr.value and some(attr.value, is_repeater_placeholder)):
+                    return False
+
+    for child in node.elements:
+        if not has_static_shape(child):
+            return False
+
+    return True
+
+
+def is_valid_template(node: AbbreviationNode):
+    """
+    Check if given converted node can be used as template of virtually repeated node:
+    lazy numbers in its values should not affect output formatting
+    """
+    if node.name and node.name.lower().startswith('lorem'):
+        # Lorem ipsum text is generated for every copy of node
+        return False
+
+    if node.value and some(node.value, is_lazy_number):
+        if some(node.value, has_newline) or (isinstance(node.value[0], str) and node.value[0].startswith('<')):
+            return False
+
+    if node.attributes:
+        for attr in node.attributes:
+            if attr.value and some(attr.value, is_lazy_number) and some(attr.value, has_newline):
+                return False
+
+    for child in node.children:
+        if not is_valid_template(child):
+            return False
+
+    return True
+
+
 def convert_element(node: TokenElement, state: ConvertState):
     elem = AbbreviationNode(node, state)
     result = [elem]
@@ -245,6 +459,13 @@ def stringify_value(token_list: list, state: ConvertState):
                 accum = []
 
             result.append(token)
+        elif isinstance(token, tokens.RepeaterNumber) and has_virtual_repeater(token, state):
+            # Number of virtually repeated node is resolved at output time
+            if accum:
+                result.append(''.join(accum))
+                accum = []
+
+            result.append(LazyNumber(token, state.repeaters))
         else:
             accum.append(stringify(token, state))
 
@@ -316,6 +537,38 @@ def attach_repeater(items: list, repeater: tokens.Repeater):
 def clone_repeater(repeater: tokens.Repeater):
     return tokens.Repeater(repeater.count, repeater.value, repeater.implicit)
 
+
+def capture_repeater(repeater: tokens.Repeater):
+    "Returns repeater which should be used for lazy number: virtual repeaters are referenced, the rest are copied"
+    return repeater if isinstance(repeater, VirtualRepeater) else clone_repeater(repeater)
+
+
+def has_virtual_repeater(token: tokens.RepeaterNumber, state: ConvertState):
+    "Check if value of given repeater number depends on virtual repeater"
+    repeaters = state.repeaters
+    if not repeaters:
+        return False
+
+    last_ix = len(repeaters) - 1
+    return isinstance(repeaters[-1], VirtualRepeater) or \
+        (token.parent > 0 and isinstance(repeaters[max(0, last_ix - token.parent)], VirtualRepeater))
+
+
+def is_repeater_token(token: tokens.Token):
+    return isinstance(token, (tokens.RepeaterNumber, tokens.RepeaterPlaceholder))
+
+
+def is_repeater_placeholder(token: tokens.Token):
+    return isinstance(token, tokens.RepeaterPlaceholder)
+
+
+def is_lazy_number(token):
+    return isinstance(token, LazyNumber)
+
+
+def has_newline(token):
+    return isinstance(token, str) and ('\n' in token or '\r' in token)
+
 def some(items: list, fn: callable):
     for item in items:
         if fn(item): return True
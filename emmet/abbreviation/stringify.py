@@ -70,20 +70,31 @@ def RepeaterPlaceholder(token: tokens.RepeaterPlaceholder, state):
 
 
 def RepeaterNumber(token: tokens.RepeaterNumber, state):
-    value = 1
+    repeater = parent = None
     last_ix = len(state.repeaters) - 1
 
     if last_ix >= 0:
         repeater = state.repeaters[-1]
+        if token.parent:
+            parent_ix = max(0, last_ix - token.parent)
+            if parent_ix != last_ix:
+                parent = state.repeaters[parent_ix]
+
+    return repeater_number(token, repeater, parent)
+
+
+def repeater_number(token: tokens.RepeaterNumber, repeater: tokens.Repeater=None, parent: tokens.Repeater=None):
+    "Returns string value of given repeater number for given state of closest and parent repeaters"
+    value = 1
+
+    if repeater:
         if token.reverse:
             value = token.base + repeater.count - repeater.value - 1
         else:
             value = token.base + repeater.value
 
-        if token.parent:
-            parent_ix = max(0, last_ix - token.parent)
-            if parent_ix != last_ix:
-                value += repeater.count * state.repeaters[parent_ix].value
+        if parent:
+            value += repeater.count * parent.value
 
     result = str(value)
     prefix = '0' * max(0, token.size - len(result))
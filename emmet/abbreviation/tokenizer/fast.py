@@ -0,0 +1,162 @@
+import re
+from ...scanner import Scanner
+from ...scanner_utils import is_quote, is_space
+from .utils import Chars, escaped
+from . import tokens, field, repeater_placeholder, repeater_number, repeater, \
+    operator, quote, bracket, is_allowed_operator, is_allowed_space, \
+    is_allowed_repeater, is_element_name, bracket_type
+
+__doc__ = """
+Alternative abbreviation tokenizer which produces the same tokens as default
+`tokenize()` but is faster on long abbreviations: tokens are dispatched by their
+first character and plain runs of literal characters are consumed with
+precompiled regular expressions instead of per-character checks
+"""
+
+re_space = re.compile(r'[ \t\xa0\n\r]+')
+
+re_name = re.compile(r'[A-Za-z_\-:!\d]+')
+"Characters of element name which are consumed as is"
+
+re_attribute = re.compile(r'[^\\$= \t\xa0\n\r\'"()\[\]{}]+')
+"Characters of unquoted attribute which are consumed as is"
+
+re_expression = {
+    None: re.compile(r'[^\\${}]+'),
+    '"': re.compile(r'[^\\${}"]+'),
+    "'": re.compile(r'[^\\${}\']+')
+}
+"Characters of expression, by current quote, which are consumed as is"
+
+re_quoted = {
+    '"': re.compile(r'[^\\$"]+'),
+    "'": re.compile(r'[^\\$\']+')
+}
+"Characters of quoted value, by quote, which are consumed as is"
+
+
+def tokenize(source: str):
+    scanner = Scanner(source)
+    result = []
+    ctx = {
+        'group': 0,
+        'attribute': 0,
+        'expression': 0,
+        'quote': None
+    }
+
+    while not scanner.eof():
+        ch = scanner.peek()
+        if ch == Chars.Dollar:
+            token = field(scanner, ctx) or \
+                repeater_placeholder(scanner) or \
+                repeater_number(scanner)
+        elif ch == Chars.Asterisk:
+            token = repeater(scanner)
+        elif is_space(ch):
+            token = white_space(scanner)
+        elif ch != Chars.Slash and is_allowed_operator(ch, ctx):
+            # Literal can’t start with operator, except `/` between numbers
+            token = operator(scanner)
+        else:
+            token = literal(scanner, ctx) or \
+                operator(scanner) or \
+                quote(scanner) or \
+                bracket(scanner)
+
+        if token:
+            result.append(token)
+            if token.type == 'Quote':
+                ctx['quote'] = None if ch == ctx['quote'] else ch
+            elif token.type == 'Bracket':
+                ctx[token.context] += 1 if token.open else -1
+        else:
+            raise scanner.error('Unexpected character')
+
+    return result
+
+
+def white_space(scanner: Scanner):
+    "Consumes white space characters as string literal from given scanner"
+    m = re_space.match(scanner.string, scanner.pos)
+    start = scanner.pos
+    scanner.pos = m.end()
+    return tokens.WhiteSpace(m.group(0), start, scanner.pos)
+
+
+def literal(scanner: Scanner, ctx: dict):
+    """
+    Consumes literal from given scanner. Same as default `literal()` consumer,
+    but runs of characters with no special meaning in current context are
+    consumed at once
+    """
+    start = scanner.pos
+    expression_start = ctx['expression']
+    value = []
+    string = scanner.string
+
+    if expression_start:
+        pattern = re_expression[ctx['quote']]
+    elif ctx['quote']:
+        pattern = re_quoted[ctx['quote']]
+    elif ctx['attribute']:
+        pattern = re_attribute
+    else:
+        pattern = re_name
+
+    while not scanner.eof():
+        m = pattern.match(string, scanner.pos, scanner.end) if pattern else None
+        if m:
+            value.append(m.group(0))
+            scanner.pos = m.end()
+            if scanner.eof():
+                break
+
+        # Character with special meaning in current context,
+        # handle it as default consumer does
+        if escaped(scanner):
+            value.append(scanner.current())
+            continue
+
+        ch = scanner.peek()
+
+        if ch == '/' and not ctx['quote'] and not ctx['expression'] and not ctx['attribute']:
+            # Special case for `/` character between numbers in class names
+            prev = string[scanner.pos - 1] if scanner.pos > 0 else ''
+            next = string[scanner.pos + 1] if scanner.pos < scanner.end - 1 else ''
+            if prev.isdigit() and next.isdigit():
+                value.append(scanner.next())
+                continue
+
+        if ch == ctx['quote'] or ch == Chars.Dollar or is_allowed_operator(ch, ctx):
+            break
+
+        if expression_start:
+            # Consume nested expressions, e.g. span{{foo}}
+            if ch == Chars.CurlyBracketOpen:
+                ctx['expression'] += 1
+            elif ch == Chars.CurlyBracketClose:
+                if ctx['expression'] > expression_start:
+                    ctx['expression'] -= 1
+                else:
+                    break
+
+            if not ctx['expression']:
+                # Unbalanced brackets in abbreviation: expression context
+                # is changed, handle the rest of literal char by char
+                pattern = None
+        elif not ctx['quote']:
+            if not ctx['attribute'] and not is_element_name(ch):
+                break
+
+            if is_allowed_space(ch, ctx) or \
+               is_allowed_repeater(ch, ctx) or \
+               is_quote(ch) or \
+               bracket_type(ch):
+                break
+
+        value.append(scanner.next())
+
+    if start != scanner.pos:
+        scanner.start = start
+        return tokens.Literal(''.join(value), start, scanner.pos)
@@ -1,3 +1,3 @@
 from .html import ContextTag, get_open_tag, select_item_html
-from .css import CSSSection, CSSProperty, select_item_css, get_css_section
+from .css import CSSSection, CSSProperty, select_item_css, get_css_section, get_css_sections
 from .utils import SelectItemModel
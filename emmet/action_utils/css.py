@@ -1,4 +1,5 @@
-from ..css_matcher import scan, split_value, TokenType
+from bisect import bisect_left, bisect_right
+from ..css_matcher import scan, scan_tokens, split_value, TokenType
 from .utils import push_range, SelectItemModel
 
 class CSSSection:
@@ -57,10 +58,11 @@ class ParseState:
         self.value_delimiter = -1
 
 
-def get_css_section(code: str, pos: int, properties=False) -> CSSSection:
+def get_css_section(code: str, pos: int, properties=False, index=None) -> CSSSection:
     """
     Returns context CSS section for given location in source code
     :param properties Parse inner properties
+    :param index `CSSIndex` of given code to take tokens from
     """
     stack = []
     pool = []
@@ -81,7 +83,7 @@ def get_css_section(code: str, pos: int, properties=False) -> CSSSection:
             release_range(pool, sel)
 
 
-    scan(code, scan_callback)
+    scan_tokens(code, pos, scan_callback, index)
     section = result[0]
 
     if section and properties:
@@ -90,6 +92,48 @@ def get_css_section(code: str, pos: int, properties=False) -> CSSSection:
     return section
 
 
+def get_css_sections(code: str, positions: list, properties=False) -> list:
+    """
+    Same as `get_css_section()` but finds context CSS sections for all given
+    `positions` in a single pass over `code`. Locations inside the same section
+    share the same `CSSSection` object, as well as its parsed properties.
+    Returns list of sections (or `None`), one for each location in `positions`
+    :param properties Parse inner properties
+    """
+    stack = []
+    pool = []
+    pending = sorted(set(positions))
+    result = {}
+
+    def scan_callback(token_type: str, start: int, end: int, delimiter: int):
+        if not stack:
+            # Top-level token: locations before it are not inside any section
+            del pending[:bisect_left(pending, start)]
+
+        if token_type == TokenType.Selector:
+            stack.append(alloc_range(pool, start, end, delimiter))
+        elif token_type == TokenType.BlockEnd:
+            sel = stack and stack.pop()
+            if sel:
+                lo = bisect_left(pending, sel[0])
+                hi = bisect_right(pending, end)
+                if lo < hi:
+                    section = CSSSection(sel[0], end, sel[2] + 1, start)
+                    if properties:
+                        section.properties = parse_properties(code, section.body_start, section.body_end)
+                    for pos in pending[lo:hi]:
+                        result[pos] = section
+                    del pending[lo:hi]
+            release_range(pool, sel)
+
+        if not pending:
+            return False
+
+    if pending:
+        scan(code, scan_callback)
+    return [result.get(pos) for pos in positions]
+
+
 def select_item_css(code: str, pos: int, is_prev=False) -> SelectItemModel:
     "Returns list of ranges for Select Next/Previous CSS Item  action"
     if is_prev:
@@ -40,7 +40,7 @@ def get_open_tag(code: str, pos: int) -> ContextTag:
         if start < pos < end:
             tag[0] = ContextTag(name, elem_type, start, end)
             if elem_type in (ElementType.Open, ElementType.SelfClose):
-                tag[0].attributes = shift_attribute_ranges(attributes(code[start:end], name), start)
+                tag[0].attributes = attributes(code, name, start, end)
 
             return False
         if end > pos:
@@ -113,24 +113,23 @@ def get_tag_selection_model(code: str, name: str, start: int, end: int) -> Selec
     ranges = [(start + 1, start + 1 + len(name))]
 
     # Parse and add attributes ranges
-    tag_src = code[start:end]
-    for attr in attributes(tag_src, name):
-        if attr.value is not None:
+    for attr in attributes(code, name, start, end):
+        if attr.value_start is not None:
             # Attribute with value
-            push_range(ranges, (start + attr.name_start, start + attr.value_end))
+            push_range(ranges, (attr.name_start, attr.value_end))
 
             # Add (unquoted) value range
             val = value_range(attr)
             if val[0] != val[1]:
-                push_range(ranges, (start + val[0], start + val[1]))
+                push_range(ranges, val)
 
                 if attr.name == 'class':
                     # For class names, split value into space-separated tokens
-                    for token in token_list(tag_src[val[0]:val[1]], start + val[0]):
+                    for token in token_list(code[val[0]:val[1]], val[0]):
                         push_range(ranges, token)
         else:
             # Attribute without value (boolean)
-            push_range(ranges, (start + attr.name_start, start + attr.name_end))
+            push_range(ranges, (attr.name_start, attr.name_end))
 
     return SelectItemModel(start, end, ranges)
 
@@ -155,7 +154,16 @@ def value_range(attr: AttributeToken) -> tuple:
     return (attr.value_start, attr.value_end)
 
 def shift_attribute_ranges(attrs: list, offset: int):
+    """
+    Shifts ranges of given attributes by `offset`. Useful for attributes parsed
+    from a fragment of source code; prefer `attributes(source, name, start, end)`
+    which reports ranges in source right away
+    """
     for attr in attrs:
+        # Extract lazy name and value before their ranges are changed
+        attr.name = attr.name
+        attr.value = attr.value
+        attr.source = None
         attr.name_start += offset
         attr.name_end += offset
         if attr.value is not None:
@@ -0,0 +1,263 @@
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from threading import Lock
+
+__doc__ = "Bounded caches shared by Emmet internals"
+
+missing = object()
+
+
+class LRUCache:
+    """
+    Thread-safe dictionary with least-recently-used eviction: when `max_size`
+    entries are stored, adding new entry evicts the one that wasn’t accessed
+    for the longest time
+    """
+    __slots__ = ('max_size', 'hits', 'misses', '_data', '_lock')
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        "Maximum amount of entries stored in cache"
+
+        self.hits = 0
+        "Amount of successful lookups"
+
+        self.misses = 0
+        "Amount of failed lookups"
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        "Returns cached value for given key or `default` if there’s no such value"
+        with self._lock:
+            value = self._data.get(key, missing)
+            if value is missing:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        "Stores given value in cache, evicting the least recently used entries"
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > max(self.max_size, 0):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        "Removes all entries and resets stats"
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        "Returns cache usage stats"
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def freeze(value):
+    """
+    Converts given value into hashable structure which can be used as a cache key.
+    Dicts and lists are converted into tuples, preserving item order, so that
+    equal structures produce equal keys. Raises `TypeError` if value contains
+    unhashable items
+    """
+    if isinstance(value, Mapping):
+        return (dict, tuple((k, freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(v) for v in value))
+
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(freeze(v) for v in value))
+
+    # Keep value type in key so that `1`, `1.0` and `True` won’t produce
+    # the same key
+    hash(value)
+    return (type(value), value)
+
+
+class ResultCache:
+    """
+    Opt-in cache of expanded abbreviations, keyed by abbreviation and config
+    fingerprint. Cache is bounded by amount of entries and, optionally, by
+    time-to-live of each entry (in seconds) and by total size of stored results
+    (in bytes). Expansions which are not pure functions of abbreviation and config
+    are never cached: the ones with lorem ipsum text, unless `lorem.seed` option
+    is set, with callbacks in config which are not listed in `pure` or with
+    resolved `Config` instance instead of config dict
+    """
+    __slots__ = ('max_size', 'ttl', 'max_memory', 'pure', 'memory',
+                 'hits', 'misses', 'bypasses', '_data', '_lock')
+
+    def __init__(self, max_size=256, ttl: float=None, max_memory: int=None, pure=()):
+        self.max_size = max_size
+        "Maximum amount of entries stored in cache"
+
+        self.ttl = ttl
+        "Time-to-live of cached entry, in seconds"
+
+        self.max_memory = max_memory
+        "Maximum total size of stored results, in bytes"
+
+        self.pure = set(pure)
+        "Config callbacks known to be pure, e.g. configs with them can be cached"
+
+        self.memory = 0
+        "Total size of stored results, in bytes"
+
+        self.hits = 0
+        "Amount of successful lookups"
+
+        self.misses = 0
+        "Amount of failed lookups"
+
+        self.bypasses = 0
+        "Amount of expansions which can’t be cached"
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def key(self, abbr: str, user_config: dict, global_config: dict):
+        """
+        Returns cache key for expansion of given abbreviation with given configs
+        or `None` if such expansion can’t be cached. Resolved `Config` instance
+        as `user_config` is never cached since its data may be changed in place
+        """
+        key = None
+        if isinstance(abbr, str) and isinstance(user_config, Mapping) and \
+            (has_lorem_seed(user_config, global_config) or ('lorem' not in abbr.lower() and \
+                not has_lorem_snippets(user_config) and not has_lorem_snippets(global_config))) and \
+            all(fn in self.pure for fn in callables(user_config)) and \
+            all(fn in self.pure for fn in callables(global_config)):
+            try:
+                # Unset fields don’t affect output and `cache` holds internal data only
+                user_config = dict((k, v) for k, v in user_config.items() if k != 'cache' and v is not None)
+                key = freeze((abbr, user_config, global_config))
+            except TypeError:
+                pass
+
+        if key is None:
+            self.bypasses += 1
+
+        return key
+
+    def get(self, key, default=None):
+        "Returns cached result for given key or `default` if there’s no such result"
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                # Entry is expired
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value: str):
+        "Stores given result in cache, evicting the least recently used entries"
+        size = sys.getsizeof(value)
+        if self.max_memory is not None and size > self.max_memory:
+            # Result doesn’t fit memory budget at all
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = (value, expires, size)
+            self.memory += size
+
+            while self._data and (len(self._data) > max(self.max_size, 0) or \
+                (self.max_memory is not None and self.memory > self.max_memory)):
+                self._remove(next(iter(self._data)))
+
+    def clear(self):
+        "Removes all entries and resets stats"
+        with self._lock:
+            self._data.clear()
+            self.memory = self.hits = self.misses = self.bypasses = 0
+
+    def stats(self):
+        "Returns cache usage stats"
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'memory': self.memory,
+            'max_memory': self.max_memory,
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses
+        }
+
+    def _remove(self, key):
+        self.memory -= self._data.pop(key)[2]
+
+
+def callables(value):
+    "Yields all callables from given config data"
+    if callable(value):
+        yield value
+    elif isinstance(value, Mapping):
+        for v in value.values():
+            yield from callables(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from callables(v)
+
+
+def has_lorem_snippets(config: dict):
+    "Check if given config data contains snippets which may produce lorem ipsum text"
+    for k, v in config.items():
+        if isinstance(v, Mapping):
+            if k == 'snippets':
+                if any('lorem' in str(s).lower() for s in v.values()):
+                    return True
+            elif has_lorem_snippets(v):
+                return True
+
+    return False
+
+
+def has_lorem_seed(user_config: dict, global_config: dict):
+    """
+    Check if given configs set seed value for lorem ipsum generator, e.g. produce
+    the same text for the same abbreviation
+    """
+    syntax = user_config.get('syntax', 'html')
+    seed = None
+    for config in (user_config, global_config.get(syntax, {}), global_config.get(user_config.get('type', 'markup'), {})):
+        options = config.get('options')
+        if isinstance(options, Mapping) and 'lorem.seed' in options:
+            seed = options['lorem.seed']
+            break
+
+    # Random instance changes its state on every expansion
+    return isinstance(seed, (int, float, str, bytes))
@@ -1,4 +1,6 @@
+from types import MappingProxyType
 from .snippets import markup_snippets, stylesheet_snippets, xsl_snippets, pug_snippets, variables
+from .cache import LRUCache, freeze
 
 DEFAULT_SYNTAXES = { 'markup': 'html', 'stylesheet': 'css' }
 "Default syntaxes for abbreviation types"
@@ -41,6 +43,8 @@ DEFAULT_OPTIONS = {
     'output.text': lambda text, **kwargs: text,
 
     'markup.href': True,
+    'markup.tokenizer': 'default',
+    'markup.lazyRepeat': 0,
 
     'comment.enabled': False,
     'comment.trigger': ['id', 'class'],
@@ -53,6 +57,8 @@ DEFAULT_OPTIONS = {
 
     'jsx.enabled': False,
 
+    'lorem.seed': None,
+
     'stylesheet.keywords': ['auto', 'inherit', 'unset', 'none'],
     'stylesheet.unitless': ['z-index', 'line-height', 'opacity', 'font-weight', 'zoom', 'flex', 'flex-grow', 'flex-shrink'],
     'stylesheet.shortHex': True,
@@ -157,6 +163,23 @@ class Config:
         self.options = merged_data(syntax_type, syntax, 'options', user_config, global_config)
         self.cache = user_config.get('cache')
 
+    def derive(self, user_config: dict):
+        """
+        Creates new config which shares resolved variables, snippets and options
+        with current one but uses `user_config` for per-call data like `text`
+        or `context`
+        """
+        config = Config.__new__(Config)
+        config.type = self.type
+        config.syntax = self.syntax
+        config.variables = self.variables
+        config.snippets = self.snippets
+        config.options = self.options
+        config.user_config = user_config
+        config.context = user_config.get('context')
+        config.cache = user_config.get('cache', self.cache)
+        return config
+
     def get(self, key: str):
         if key in dir(self):
             return self.__getattribute__(key)
@@ -183,3 +206,55 @@ def merged_data(syntax_type: str, syntax: str, key: str, user_config: dict, glob
     result.update(user_config.get(key, empty))
 
     return result
+
+
+config_cache = LRUCache(64)
+"Shared configs, resolved by `get_config()`"
+
+per_call_keys = ('text', 'context', 'cache', 'maxRepeat', 'max_repeat')
+"User config keys which may vary between calls of shared config"
+
+
+def get_config(user_config: dict={}, global_config: dict={}) -> Config:
+    """
+    Returns config for given user and global config. Unlike `Config` constructor,
+    resolved config data is memoized: repeated calls with the same syntax, type,
+    variables, snippets and options reuse the same read-only variables, snippets
+    and options dicts, as well as internal cache of parsed snippets.
+    Per-call fields like `text` and `context` are taken from given `user_config`
+    """
+    key = config_key(user_config, global_config)
+    if key is None:
+        # Config contains unhashable data, unable to share it
+        return Config(user_config, global_config)
+
+    config = config_cache.get(key)
+    if config is None:
+        config = Config(dict((k, v) for k, v in user_config.items() if k not in per_call_keys), global_config)
+        config.variables = MappingProxyType(config.variables)
+        config.snippets = MappingProxyType(config.snippets)
+        config.options = MappingProxyType(config.options)
+        config.cache = {}
+        config_cache.set(key, config)
+
+    return config.derive(user_config)
+
+
+def config_key(user_config: dict, global_config: dict):
+    "Returns hashable key of given config data or `None` if data can’t be hashed"
+    try:
+        return freeze((
+            user_config.get('type'),
+            user_config.get('syntax'),
+            user_config.get('variables'),
+            user_config.get('snippets'),
+            user_config.get('options'),
+            global_config
+        ))
+    except TypeError:
+        return None
+
+
+def clear_config_cache():
+    "Removes all shared configs"
+    config_cache.clear()
@@ -1,10 +1,15 @@
 from .tokenizer import tokenize, tokens
 from .parser import parser, CSSProperty, CSSValue, FunctionCall
 from ..scanner import ScannerException
+from ..profiler import get_profiler
 
 def parse(abbr: str, options={}):
     "Parses given abbreviation into property set"
     try:
+        profiler = get_profiler()
+        if profiler is not None:
+            return profiled_parse(profiler, abbr, options)
+
         tokens = tokenize(abbr, options.get('value', False)) if isinstance(abbr, str) else abbr
         return parser(tokens, options)
     except ScannerException as err:
@@ -12,3 +17,15 @@ def parse(abbr: str, options={}):
             err.message += '\n%s\n%s^' % (abbr, '-' * err.pos)
 
         raise err
+
+
+def profiled_parse(profiler, abbr, options: dict):
+    "Same as `parse()` but records pipeline stages in given profiler"
+    tokens = abbr
+    if isinstance(abbr, str):
+        tokens = profiler.measure('tokenize', tokenize, abbr, options.get('value', False))
+    profiler.count('tokens', len(tokens))
+
+    result = profiler.measure('parser', parser, tokens, options)
+    profiler.count('nodes', len(result))
+    return result
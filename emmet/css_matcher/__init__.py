@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from .scan import scan, TokenType
 from ..scanner_utils import is_space
 from .parse import split_value
@@ -31,7 +32,11 @@ class InwardRange:
         self.first_child = None
 
 
-def match(source: str, pos: int) -> MatchResult:
+def match(source: str, pos: int, index=None) -> MatchResult:
+    """
+    Finds matched selector or property for given `pos` location in CSS `source`.
+    If `index` is given, tokens are taken from it instead of scanning source
+    """
     pool = []
     stack = []
     result = [None]
@@ -64,14 +69,70 @@ def match(source: str, pos: int) -> MatchResult:
             release_pending()
 
 
-    scan(source, scan_callback)
+    scan_tokens(source, pos, scan_callback, index)
     return result[0]
 
 
-def balanced_outward(source: str, pos: int) -> list:
+def match_many(source: str, positions: list) -> list:
+    """
+    Same as `match()` but finds matched selectors or properties for all given
+    `positions` in a single pass over `source`. Returns list of matches
+    (or `None`), one for each location in `positions`
+    """
+    pool = []
+    stack = []
+    pending = sorted(set(positions))
+    result = {}
+    pending_property = []
+    pending_property.append(None)
+
+    def release_pending():
+        if pending_property[0]:
+            release_range(pool, pending_property[0])
+            pending_property[0] = None
+
+    def resolve(match_type: str, start: int, end: int, body_start: int, body_end: int, limit: int):
+        # Resolve pending locations between `start` and `limit`
+        lo = bisect_right(pending, start)
+        hi = bisect_left(pending, limit)
+        if lo < hi:
+            match_result = MatchResult(match_type, start, end, body_start, body_end)
+            for pos in pending[lo:hi]:
+                result[pos] = match_result
+            del pending[lo:hi]
+
+    def scan_callback(token_type: str, start: int, end: int, delimiter: int):
+        if token_type == TokenType.Selector:
+            release_pending()
+            stack.append(alloc_range(pool, start, end, delimiter))
+        elif token_type == TokenType.BlockEnd:
+            release_pending()
+            parent = stack and stack.pop()
+            if parent:
+                resolve('selector', parent[0], end, parent[2] + 1, start, end)
+                release_range(pool, parent)
+        elif token_type == TokenType.PropertyName:
+            release_pending()
+            pending_property[0] = alloc_range(pool, start, end, delimiter)
+        elif token_type == TokenType.PropertyValue:
+            prop = pending_property[0]
+            if prop:
+                resolve('property', prop[0], delimiter + 1, start, end, end)
+            release_pending()
+
+        if not pending:
+            return False
+
+    if pending:
+        scan(source, scan_callback)
+    return [result.get(pos) for pos in positions]
+
+
+def balanced_outward(source: str, pos: int, index=None) -> list:
     """
     Returns balanced CSS model: a list of all ranges that could possibly match
-    given location when moving in outward direction
+    given location when moving in outward direction.
+    If `index` is given, tokens are taken from it instead of scanning source
     """
     pool = []
     stack = []
@@ -92,7 +153,8 @@ def balanced_outward(source: str, pos: int) -> list:
                 push(result, (left[0], end))
             if left:
                 release_range(pool, left)
-            if not stack:
+            if not stack and result:
+                # Top-level section with given location is closed
                 return False
         elif token_type == TokenType.PropertyName:
             if prop[0]:
@@ -110,14 +172,15 @@ def balanced_outward(source: str, pos: int) -> list:
             release_range(pool, prop[0])
             prop[0] = None
 
-    scan(source, scan_callback)
+    scan_tokens(source, pos, scan_callback, index)
     return result
 
 
-def balanced_inward(source: str, pos: int) -> list:
+def balanced_inward(source: str, pos: int, index=None) -> list:
     """
     Returns balanced CSS selectors: a list of all ranges that could possibly match
-    given location when moving in inward direction
+    given location when moving in inward direction.
+    If `index` is given, tokens are taken from it instead of scanning source
     """
     # Collecting ranges for inward balancing is a bit trickier: we have to store
     # first child of every matched selector until we find the one that matches given
@@ -216,10 +279,21 @@ def balanced_inward(source: str, pos: int) -> list:
             stack.append(alloc(start, end, delimiter))
             release_pending()
 
-    scan(source, scan_callback)
+    scan_tokens(source, pos, scan_callback, index)
     return result
 
 
+def scan_tokens(source: str, pos: int, callback: callable, index=None):
+    """
+    Invokes `callback` for tokens of given source. If `index` is given, tokens
+    of section which may contain `pos` location are taken from it
+    """
+    if index is not None:
+        index.replay(callback, pos)
+    else:
+        scan(source, callback)
+
+
 def inner_range(source: str, start: int, end: int):
     """
     Returns inner range for given selector bounds: narrows it to first non-empty
@@ -252,3 +326,12 @@ def push(ranges: list, r: list):
     prev = ranges and ranges[-1]
     if (not prev or prev[0] != r[0] or prev[1] != r[1]) and r[0] != r[1]:
         ranges.append(r)
+
+
+def __getattr__(name: str):
+    # Index module is imported on first use
+    if name == 'CSSIndex':
+        from .index import CSSIndex
+        return CSSIndex
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
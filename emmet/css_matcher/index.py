@@ -0,0 +1,235 @@
+from array import array
+from .scan import scan, ScanState, TokenType, Chars
+from . import MatchResult, match, balanced_outward, balanced_inward
+
+__doc__ = """
+Persistent index of tokens in CSS, LESS or SCSS document. Index scans document
+once and replays stored tokens to the same callbacks `match()`,
+`balanced_outward()` and `balanced_inward()` functions use, starting from the
+top-level section which contains queried location. Text edits are applied
+incrementally: only damaged part of document is re-scanned
+"""
+
+token_types = (TokenType.Selector, TokenType.PropertyName, TokenType.PropertyValue, TokenType.BlockEnd)
+token_codes = dict((t, i) for i, t in enumerate(token_types))
+selector_code = token_codes[TokenType.Selector]
+block_end_code = token_codes[TokenType.BlockEnd]
+value_code = token_codes[TokenType.PropertyValue]
+
+
+class CSSIndex:
+    """
+    Index of tokens in CSS source. Each token is stored in compact arrays as
+    type code, range, delimiter and depth of section it belongs to. For tokens
+    which end statement, index also stores location where scanner may resume
+    and its expression context: such tokens are used as safe points to restart
+    scanning when document is updated
+    """
+    __slots__ = ('source', 'types', 'starts', 'ends', 'delimiters', 'depths',
+                 'resume', 'expressions')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array('b')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.delimiters = array('i')
+        self.depths = array('i')
+        self.resume = array('i')
+        self.expressions = array('i')
+        self._scan(0, 0, 0, 0)
+
+    def __len__(self):
+        return len(self.types)
+
+    def edit(self, offset: int, length: int, text: str=''):
+        """
+        Updates index after replacing `length` characters of source at `offset`
+        with given `text`
+        """
+        source = self.source
+        if offset < 0 or length < 0 or offset + length > len(source):
+            raise ValueError('Edit range is out of source bounds')
+
+        self.source = source[:offset] + text + source[offset + length:]
+
+        # Find the last statement which ends before edited text: scanner
+        # state after it is the same as before edit
+        ix = self._find(offset + 1) - 1
+        while ix >= 0 and not (0 <= self.resume[ix] <= offset):
+            ix -= 1
+
+        if ix >= 0:
+            self._scan(ix + 1, self.resume[ix], self.expressions[ix], self._depth_after(ix),
+                       offset + len(text), offset + length, len(text) - length)
+        else:
+            self._scan(0, 0, 0, 0, offset + len(text), offset + length, len(text) - length)
+
+    def replay(self, callback: callable, pos: int):
+        """
+        Invokes `callback` with the same arguments as `scan()` does for every token
+        of top-level section which may contain given location
+        """
+        types = self.types
+        starts = self.starts
+        depths = self.depths
+        size = len(types)
+        ix = self._find(pos) - 1
+        while ix > 0 and (depths[ix] or types[ix] != selector_code):
+            ix -= 1
+
+        ix = max(ix, 0)
+        while ix < size:
+            start = starts[ix]
+            if start > pos and not depths[ix] and types[ix] != value_code:
+                # Top-level token after given location: it can’t contain
+                # location, as well as tokens after it. Property value is
+                # an exception since property starts with preceding name
+                break
+
+            if callback(token_types[types[ix]], start, self.ends[ix], self.delimiters[ix]) is False:
+                break
+
+            ix += 1
+
+    def match(self, pos: int) -> MatchResult:
+        "Same as `match()` function but uses indexed tokens"
+        return match(self.source, pos, self)
+
+    def balanced_outward(self, pos: int) -> list:
+        "Same as `balanced_outward()` function but uses indexed tokens"
+        return balanced_outward(self.source, pos, self)
+
+    def balanced_inward(self, pos: int) -> list:
+        "Same as `balanced_inward()` function but uses indexed tokens"
+        return balanced_inward(self.source, pos, self)
+
+    def _find(self, pos: int) -> int:
+        """
+        Returns index of the first token which starts at or after given location.
+        Property name may have no start location, its delimiter location is used
+        instead
+        """
+        starts = self.starts
+        lo = 0
+        hi = len(starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = starts[mid]
+            if start == -1:
+                start = self.delimiters[mid]
+
+            if start < pos:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def _depth_after(self, ix: int) -> int:
+        "Returns section depth right after token at `ix`"
+        depth = self.depths[ix]
+        if self.types[ix] == selector_code:
+            return depth + 1
+        if self.types[ix] == block_end_code:
+            return max(0, depth - 1)
+        return depth
+
+    def _scan(self, ix: int, start: int, expression: int, depth: int, sync=None, sync_old=0, delta=0):
+        """
+        Scans source from `start` location and replaces indexed tokens from `ix`
+        with the found ones. If `sync` location is given, scanning stops as soon
+        as statement ends at or after `sync` location in the same scanner state
+        as indexed statement which ends at or after `sync_old`, shifted by `delta`:
+        the rest of the index is reused
+        """
+        source = self.source
+        types = array('b')
+        starts = array('i')
+        ends = array('i')
+        delimiters = array('i')
+        depths = array('i')
+        resume = array('i')
+        expressions = array('i')
+        old_resume = self.resume
+        old_expressions = self.expressions
+        state = ScanState()
+        state.expression = expression
+        ctx = [depth, ix, len(old_resume)]
+
+        def scan_callback(token_type: str, start: int, end: int, delimiter: int):
+            code = token_codes[token_type]
+            types.append(code)
+            starts.append(start)
+            ends.append(end)
+            delimiters.append(delimiter)
+            depths.append(ctx[0])
+            expressions.append(state.expression)
+
+            if code == selector_code:
+                ctx[0] += 1
+            elif code == block_end_code:
+                ctx[0] = max(0, ctx[0] - 1)
+
+            # Scanner resumes from clean state after block start, block end
+            # or property end
+            if code == block_end_code or (delimiter != -1 and source[delimiter] in (Chars.LeftCurly, Chars.Semicolon)):
+                resume.append(delimiter + 1)
+            else:
+                resume.append(-1)
+                return
+
+            if sync is not None and delimiter + 1 >= sync:
+                # Look for indexed statement which ends at the same location
+                target = delimiter + 1 - delta
+                old = ctx[1]
+                while old < len(old_resume) and old_resume[old] < target:
+                    old += 1
+                ctx[1] = old
+
+                if old < len(old_resume) and old_resume[old] == target \
+                    and target >= sync_old \
+                    and old_expressions[old] == state.expression:
+                    # Scanner state is the same as before: from now on it
+                    # will produce the same tokens
+                    ctx[2] = old + 1
+                    return False
+
+        scan(source, scan_callback, start, state)
+
+        old = ctx[2]
+        size = len(old_resume)
+        if old < size:
+            # Reuse the rest of indexed tokens
+            types += self.types[old:]
+            expressions += old_expressions[old:]
+            if delta:
+                starts += array('i', [pos + delta if pos != -1 else pos for pos in self.starts[old:]])
+                ends += array('i', [pos + delta if pos != -1 else pos for pos in self.ends[old:]])
+                delimiters += array('i', [pos + delta if pos != -1 else pos for pos in self.delimiters[old:]])
+                resume += array('i', [pos + delta if pos != -1 else pos for pos in old_resume[old:]])
+            else:
+                starts += self.starts[old:]
+                ends += self.ends[old:]
+                delimiters += self.delimiters[old:]
+                resume += old_resume[old:]
+
+            if ctx[0] == self.depths[old]:
+                depths += self.depths[old:]
+            else:
+                # Section depth is changed, update it for reused tokens
+                depth = ctx[0]
+                for code in self.types[old:]:
+                    depths.append(depth)
+                    if code == selector_code:
+                        depth += 1
+                    elif code == block_end_code:
+                        depth = max(0, depth - 1)
+
+        self.types[ix:] = types
+        self.starts[ix:] = starts
+        self.ends[ix:] = ends
+        self.delimiters[ix:] = delimiters
+        self.depths[ix:] = depths
+        self.resume[ix:] = resume
+        self.expressions[ix:] = expressions
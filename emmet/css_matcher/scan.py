@@ -1,3 +1,4 @@
+import re
 from ..scanner import Scanner
 from ..scanner_utils import is_quote, is_space
 
@@ -49,7 +50,22 @@ class Chars:
     LF = '\n'
     CR = '\r'
 
-def scan(source: str, callback: callable):
+re_space = re.compile('[ \t\n\r\u00a0]+')
+"Run of space characters, same as `whitespace()` consumer"
+
+re_plain = re.compile('(?:[^ \t\n\r\u00a0{};:()\'"/]|/(?!\\*))+')
+"Run of characters which have no special meaning for scanner"
+
+re_literal = {
+    '"': re.compile(r'"(?:[^"\\\n\r]|\\[\s\S])*'),
+    "'": re.compile(r"'(?:[^'\\\n\r]|\\[\s\S])*")
+}
+"Quoted string contents, same as `literal()` consumer"
+
+spaces = ' \t\n\r\u00a0'
+
+
+def scan(source: str, callback: callable, start=0, state: ScanState=None):
     """
     Performs fast scan of given stylesheet (CSS, LESS, SCSS) source code and runs
     callback for each token and its range found. The goal of this parser is to quickly
@@ -57,9 +73,145 @@ def scan(source: str, callback: callable):
     It doesn’t provide detailed info about CSS atoms like compound selectors,
     operators, quoted string etc. to reduce memory allocations: this data can be
     parsed later on demand.
+    :param start Location in `source` where scanning should start, must be
+    a location right after a block start, block end or property end
+    :param state Scanner state at `start` location. Callback may read it
+    to get expression context of emitted token
+    """
+    # Whitespace, comments, quoted strings and runs of regular characters are
+    # skipped with string search and regular expressions.
+    # Produces the same result as `scan_chars()`
+    if state is None:
+        state = ScanState()
+
+    token_start = state.start
+    token_end = state.end
+    prop_start = state.property_start
+    prop_end = state.property_end
+    prop_delimiter = state.property_delimiter
+    end = len(source)
+    pos = start
+
+    while pos < end:
+        ch = source[pos]
+        if ch in spaces:
+            pos = re_space.match(source, pos).end()
+            continue
+
+        if ch == Chars.Slash and source.startswith('/*', pos):
+            pos = source.find('*/', pos + 2)
+            pos = end if pos == -1 else pos + 2
+            continue
+
+        delimiter = pos
+        if ch == Chars.RightCurly or ch == Chars.Semicolon:
+            # Block or property end
+            pos += 1
+            if prop_start != -1:
+                # We have pending property
+                if callback(TokenType.PropertyName, prop_start, prop_end, prop_delimiter) is False:
+                    return
+
+                if token_start == -1:
+                    # Explicit property value state: emit empty value
+                    token_start = token_end = delimiter
+
+                if callback(TokenType.PropertyValue, token_start, token_end, delimiter) is False:
+                    return
+            elif token_start != -1 and callback(TokenType.PropertyName, token_start, token_end, delimiter) is False:
+                # Flush consumed token
+                return
+
+            if ch == Chars.RightCurly and callback(TokenType.BlockEnd, delimiter, pos, delimiter) is False:
+                return
+
+            token_start = token_end = prop_start = prop_end = prop_delimiter = -1
+            continue
+
+        if ch == Chars.LeftCurly:
+            # Block start
+            pos += 1
+            if token_start == -1 and prop_start == -1:
+                # No consumed selector, emit empty value as selector start
+                token_start = token_end = pos
+
+            if prop_start != -1:
+                # Value that looks like property name-value pair was
+                # actually a selector
+                token_start = prop_start
+
+            if callback(TokenType.Selector, token_start, token_end, delimiter) is False:
+                return
+
+            token_start = token_end = prop_start = prop_end = prop_delimiter = -1
+            continue
+
+        if ch == Chars.Colon:
+            pos += 1
+            if not state.expression:
+                colon_end = pos
+                while colon_end < end and source[colon_end] == Chars.Colon:
+                    colon_end += 1
+
+                if colon_end == pos:
+                    # Possible property delimiter, see `scan_chars()` for details
+                    if prop_start == -1:
+                        prop_start = token_start
+                    prop_end = token_end
+                    prop_delimiter = delimiter
+                    token_start = token_end = -1
+                    continue
+
+                pos = colon_end
+
+            # Known selector colon: character right after it is consumed
+            # as a part of token, whatever it is
+            ch = source[pos] if pos < end else ''
+
+        if token_start == -1:
+            token_start = pos
+
+        if ch == Chars.LeftRound:
+            state.expression += 1
+            pos += 1
+        elif ch == Chars.RightRound:
+            state.expression -= 1
+            pos += 1
+        elif is_quote(ch):
+            pos = re_literal[ch].match(source, pos).end()
+            if pos < end:
+                # Consume string terminator. Backslash here means it’s
+                # the last character of source, it’s consumed with
+                # the (missing) escaped character
+                pos += 2 if source[pos] == Chars.Backslash else 1
+        else:
+            pos += 1
+
+        if pos < end:
+            m = re_plain.match(source, pos)
+            if m:
+                pos = m.end()
+
+        token_end = pos
+
+    if prop_start != -1:
+        # Pending property name
+        if callback(TokenType.PropertyName, prop_start, prop_end, prop_delimiter) is False:
+            return
+
+    if token_start != -1:
+        # There’s pending token in state
+        callback(TokenType.PropertyValue if prop_start != -1 else TokenType.PropertyName, token_start, token_end, -1)
+
+
+def scan_chars(source: str, callback: callable, start=0, state: ScanState=None):
+    """
+    Same as `scan()` but reads source code character by character. Can be used
+    as a reference implementation of `scan()`
     """
-    scanner = Scanner(source)
-    state = ScanState()
+    scanner = Scanner(source, start)
+    if state is None:
+        state = ScanState()
     block_end = False
 
     def notify(token_type: TokenType, delimiter: int=None, start: int=None, end: int=None):
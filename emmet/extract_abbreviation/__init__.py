@@ -39,6 +39,9 @@ class ExtractedAbbreviation:
 
 SPECIAL_CHARS = '#.*:$-_!@%^+>/'
 
+re_line = re.compile(r'[^\r\n]*')
+re_word = re.compile(r'\S+')
+
 def extract_abbreviation(line: str, pos: int=None, options={}) -> ExtractedAbbreviation:
     """
     Extracts abbreviation from given line of source code.
@@ -77,9 +80,62 @@ def extract_abbreviation(line: str, pos: int=None, options={}) -> ExtractedAbbre
     if start == -1:
         return None
 
+    return extract_at(line, pos, start, opt)
+
+
+def extract_all(code: str, options={}) -> list:
+    """
+    Extracts all abbreviations from given source code in a single forward pass.
+    Abbreviation is looked up at the end of every word, as if
+    `extract_abbreviation()` was called with caret placed right before
+    whitespace or line end, so `lookAhead` option has no effect. If abbreviations
+    found at different words overlap, the rightmost one is kept. Returns list
+    of extracted abbreviations with locations in `code`. Options are the same
+    as in `extract_abbreviation()`
+    """
+    opt = create_options(options)
+    prefix = opt.get('prefix', '')
+    result = []
+
+    for m_line in re_line.finditer(code):
+        line = m_line.group(0)
+        offset = m_line.start()
+        offsets = start_offsets(line, prefix) if prefix else None
+        html_cache = {}
+        html_cache_start = 0
+
+        for m in re_word.finditer(line):
+            pos = m.end()
+            start = offsets[pos] if prefix else 0
+            if start == -1:
+                continue
+
+            if start != html_cache_start:
+                # Cached tag scanning outcomes depend on scanner bound
+                html_cache = {}
+                html_cache_start = start
+
+            abbr = extract_at(line, pos, start, opt, html_cache)
+            if abbr:
+                abbr.location += offset
+                abbr.start += offset
+                abbr.end += offset
+                while result and result[-1].end > abbr.start:
+                    result.pop()
+                result.append(abbr)
+
+    return result
+
+
+def extract_at(line: str, pos: int, start: int, options: dict, html_cache: dict=None) -> ExtractedAbbreviation:
+    """
+    Extracts abbreviation which ends at `pos` in given line. The `start` argument
+    is a left limit of abbreviation, found with `get_start_offset()`
+    """
     scanner = BackwardScanner(line, start)
     scanner.pos = pos
     stack = []
+    syntax = options.get('type')
 
     while not scanner.sol():
         ch = scanner.peek()
@@ -94,9 +150,9 @@ def extract_abbreviation(line: str, pos: int=None, options={}) -> ExtractedAbbre
                 scanner.pos -= 1
                 continue
 
-        if is_close_brace(ch, opt.get('type')):
+        if is_close_brace(ch, syntax):
             stack.append(ch)
-        elif is_open_brace(ch, opt.get('type')):
+        elif is_open_brace(ch, syntax):
             if not stack or stack.pop() != BRACE_PAIRS[ch]:
                 # unexpected brace
                 break
@@ -104,7 +160,7 @@ def extract_abbreviation(line: str, pos: int=None, options={}) -> ExtractedAbbre
             # respect all characters inside attribute sets or text nodes
             scanner.pos -= 1
             continue
-        elif is_at_html_tag(scanner) or not is_abbreviation(ch):
+        elif is_at_html_tag(scanner, html_cache) or not is_abbreviation(ch):
             break
 
         scanner.pos -= 1
@@ -113,7 +169,7 @@ def extract_abbreviation(line: str, pos: int=None, options={}) -> ExtractedAbbre
         # Found something, remove some invalid symbols from the
         # beginning and return abbreviation
         abbreviation = re.sub(r'^[*+>^]+', '', line[scanner.pos:pos])
-        prefix = opt.get('prefix', '')
+        prefix = options.get('prefix', '')
         start = start - len(prefix) if prefix else pos - len(abbreviation)
         return ExtractedAbbreviation(abbreviation, pos - len(abbreviation), start, pos)
 
@@ -156,6 +212,37 @@ def get_start_offset(line: str, pos: int, prefix: str):
     return -1
 
 
+def start_offsets(line: str, prefix: str) -> list:
+    """
+    Returns left limits of abbreviation for every location in `line`, the same as
+    `get_start_offset()` returns for each location, computed in a single
+    forward pass
+    """
+    result = [-1] * (len(line) + 1)
+    prefix_len = len(prefix)
+    # Locations of nearest open brackets
+    square = curly = -1
+
+    for pos in range(1, len(line) + 1):
+        ch = line[pos - 1]
+        if ch == Brackets.SquareR and square != -1:
+            # Skip attribute set, just like `consume_pair()` does
+            result[pos] = result[square]
+        elif ch == Brackets.CurlyR and curly != -1:
+            result[pos] = result[curly]
+        elif pos >= prefix_len and line.startswith(prefix, pos - prefix_len):
+            result[pos] = pos
+        else:
+            result[pos] = result[pos - 1]
+
+        if ch == Brackets.SquareL:
+            square = pos - 1
+        elif ch == Brackets.CurlyL:
+            curly = pos - 1
+
+    return result
+
+
 def consume_pair(scanner: BackwardScanner, close_ch: str, open_ch: str):
     "Consumes full character pair, if possible"
     start = scanner.pos
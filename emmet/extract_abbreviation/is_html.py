@@ -13,8 +13,13 @@ class Chars:
     AngleRight = '>'
 
 
-def is_html(scanner: BackwardScanner):
-    "Check if given reader’s current position points at the end of HTML tag"
+def is_html(scanner: BackwardScanner, cache: dict=None):
+    """
+    Check if given reader’s current position points at the end of HTML tag.
+    If `cache` is given, it stores outcome of tag scanning for every visited
+    location so that consequent checks with the same scanner bound don’t scan
+    the same attributes again
+    """
     start = scanner.pos
 
     if not scanner.consume(Chars.AngleRight):
@@ -22,8 +27,15 @@ def is_html(scanner: BackwardScanner):
 
     ok = False
     scanner.consume(Chars.Slash) # possibly self-closed element
+    visited = []
 
     while not scanner.sol():
+        if cache is not None:
+            if scanner.pos in cache:
+                ok = cache[scanner.pos]
+                break
+            visited.append(scanner.pos)
+
         scanner.consume_while(is_white_space)
 
         if consume_ident(scanner):
@@ -57,6 +69,10 @@ def is_html(scanner: BackwardScanner):
 
         break
 
+    if cache is not None:
+        for pos in visited:
+            cache[pos] = ok
+
     scanner.pos = start
     return ok
 
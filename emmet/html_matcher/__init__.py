@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from .utils import ScannerOptions, ElementType
 from .scan import scan
 from .attributes import attributes, AttributeToken
@@ -209,6 +210,166 @@ def balanced_inward(source: str, pos: int, opt: dict=None) -> list:
     return result
 
 
+def match_many(source: str, positions: list, opt: dict=None) -> list:
+    """
+    Same as `match()` but finds matched tags for all given `positions` in a single
+    pass over `source`. Returns list of matched tags (or `None`), one for each
+    location in `positions`
+    """
+    pool = []
+    stack = []
+    options = ScannerOptions(opt)
+    pending = sorted(set(positions))
+    result = {}
+
+    def resolve(name: str, open_range: tuple, close_range: tuple=None):
+        # Resolve pending locations inside given tag
+        lo = bisect_right(pending, open_range[0])
+        hi = bisect_left(pending, (close_range or open_range)[1])
+        if lo < hi:
+            tag = MatchedTag(name, get_attributes(source, open_range[0], open_range[1], name), open_range, close_range)
+            for pos in pending[lo:hi]:
+                result[pos] = tag
+            del pending[lo:hi]
+
+    def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
+        if elem_type == ElementType.Open and is_self_close(name, options):
+            elem_type = ElementType.SelfClose
+
+        if elem_type == ElementType.Open:
+            stack.append(alloc_tag(pool, name, start, end))
+        elif elem_type == ElementType.SelfClose:
+            resolve(name, (start, end))
+        else:
+            tag = stack and stack[-1]
+            if tag and tag.name == name:
+                resolve(name, (tag.start, tag.end), (start, end))
+                release_tag(pool, stack.pop())
+
+        if not pending:
+            return False
+
+    if pending:
+        scan(source, scan_callback, options.special)
+    return [result.get(pos) for pos in positions]
+
+
+def balanced_outward_many(source: str, positions: list, opt: dict=None) -> list:
+    """
+    Same as `balanced_outward()` but collects balanced tag models for all given
+    `positions` in a single pass over `source`. Returns list of models, one
+    for each location in `positions`
+    """
+    pool = []
+    stack = []
+    options = ScannerOptions(opt)
+    pending = sorted(set(positions))
+    result = dict((pos, []) for pos in pending)
+
+    def add(start: int, end: int, tag: BalancedTag):
+        for pos in pending[bisect_right(pending, start):bisect_left(pending, end)]:
+            result[pos].append(tag)
+
+    def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
+        if elem_type == ElementType.Close:
+            tag = stack and stack[-1]
+            if tag and tag.name == name:
+                add(tag.start, end, BalancedTag(name, (tag.start, tag.end), (start, end)))
+                release_tag(pool, stack.pop())
+        elif elem_type == ElementType.SelfClose or is_self_close(name, options):
+            add(start, end, BalancedTag(name, (start, end)))
+        else:
+            stack.append(alloc_tag(pool, name, start, end))
+
+    if pending:
+        scan(source, scan_callback, options.special)
+    return [result[pos] for pos in positions]
+
+
+def balanced_inward_many(source: str, positions: list, opt: dict=None) -> list:
+    """
+    Same as `balanced_inward()` but collects balanced tag models for all given
+    `positions` in a single pass over `source`. Returns list of models, one
+    for each location in `positions`
+    """
+    # First children are stored the same way as in `balanced_inward()`, but
+    # tags are not released when model is collected: the same tags may be
+    # required for other locations
+    pool = []
+    stack = []
+    options = ScannerOptions(opt)
+    pending = sorted(set(positions))
+    result = dict((pos, []) for pos in pending)
+
+    def alloc(name: str, start: int, end: int):
+        if pool:
+            tag = pool.pop()
+            tag.name = name
+            tag.ranges.append(start)
+            tag.ranges.append(end)
+            return tag
+
+        return InwardTag(name, [start, end])
+
+    def release(tag: InwardTag):
+        tag.ranges.clear()
+        tag.first_child = None
+        pool.append(tag)
+
+    def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
+        if elem_type == ElementType.Close:
+            if not stack:
+                return
+
+            tag = stack[-1]
+            if tag.name == name:
+                lo = bisect_left(pending, tag.ranges[0])
+                hi = bisect_right(pending, end)
+                if lo < hi:
+                    model = [BalancedTag(name, (tag.ranges[0], tag.ranges[1]), (start, end))]
+                    child = tag.first_child
+                    while child:
+                        res = BalancedTag(child.name, (child.ranges[0], child.ranges[1]))
+                        if len(child.ranges) > 2:
+                            res.close = (child.ranges[2], child.ranges[3])
+                        model.append(res)
+                        child = child.first_child
+
+                    for pos in pending[lo:hi]:
+                        result[pos] = model
+                    del pending[lo:hi]
+
+                stack.pop()
+                parent = stack and stack[-1]
+                if parent and not parent.first_child:
+                    tag.ranges.append(start)
+                    tag.ranges.append(end)
+                    parent.first_child = tag
+                else:
+                    release(tag)
+        elif elem_type == ElementType.SelfClose or is_self_close(name, options):
+            lo = bisect_right(pending, start)
+            hi = bisect_left(pending, end)
+            if lo < hi:
+                model = [BalancedTag(name, (start, end))]
+                for pos in pending[lo:hi]:
+                    result[pos] = model
+                del pending[lo:hi]
+
+            parent = stack and stack[-1]
+            if parent and not parent.first_child:
+                parent.first_child = alloc(name, start, end)
+        else:
+            stack.append(alloc(name, start, end))
+
+        if not pending:
+            return False
+
+    if pending:
+        scan(source, scan_callback, options.special)
+    return [result[pos] for pos in positions]
+
+
 def alloc_tag(pool: list, name: str, start: int, end: int):
     if pool:
         tag = pool.pop()
@@ -225,17 +386,22 @@ def release_tag(pool: list, tag: Tag):
 
 def get_attributes(source: str, start: int, end: int, name: str=None):
     "Returns parsed attributes from given source"
-    attrs = attributes(source[start:end], name)
-    for attr in attrs:
-        attr.name_start += start
-        attr.name_end += start
-        if attr.value is not None:
-            attr.value_start += start
-            attr.value_end += start
-
-    return attrs
+    return attributes(source, name, start, end)
 
 
 def is_self_close(name: str, options: ScannerOptions):
     "Check if given tag is self-close for current parsing context"
     return not options.xml and name in options.empty
+
+
+def __getattr__(name: str):
+    # Index and tree modules are imported on first use
+    if name == 'TagIndex':
+        from .index import TagIndex
+        return TagIndex
+
+    if name == 'TagTree':
+        from .tree import TagTree
+        return TagTree
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
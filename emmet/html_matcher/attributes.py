@@ -2,17 +2,58 @@ from ..scanner import Scanner
 from ..scanner_utils import eat_quoted, is_space
 from .utils import Chars, ident, consume_paired, scan_opt, is_unquoted, get_unquoted_value
 
+missing = object()
+"Marker of name or value which is not extracted from source yet"
+
 
 class AttributeToken:
-    __slots__ = ('name', 'value', 'name_start', 'name_end', 'value_start', 'value_end')
+    """
+    Attribute of HTML tag. Token parsed from source code stores ranges only:
+    name and value strings are extracted from source on first access. Until
+    both of them are extracted, token keeps a reference to the whole source
+    string; it’s released as soon as it’s no longer needed
+    """
+    __slots__ = ('source', 'name_start', 'name_end', 'value_start', 'value_end', '_name', '_value')
 
-    def __init__(self, name: str, name_start: int, name_end: int, value: str=None, value_start: int=None, value_end: int=None):
-        self.name = name
+    def __init__(self, name: str, name_start: int, name_end: int, value: str=None, value_start: int=None, value_end: int=None, source: str=None):
+        self.source = source
         self.name_start = name_start
         self.name_end = name_end
-        self.value = value
         self.value_start = value_start
         self.value_end = value_end
+        self._name = missing if name is None and source is not None else name
+        self._value = missing if value is None and source is not None else value
+
+    @property
+    def name(self) -> str:
+        if self._name is missing:
+            self._name = self.source[self.name_start:self.name_end]
+            self._release_source()
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+        self._release_source()
+
+    @property
+    def value(self) -> str:
+        if self._value is missing:
+            if self.value_start is None:
+                return None
+            self._value = self.source[self.value_start:self.value_end]
+            self._release_source()
+        return self._value
+
+    @value.setter
+    def value(self, value: str):
+        self._value = value
+        self._release_source()
+
+    def _release_source(self):
+        "Releases source string when both name and value are extracted"
+        if self._name is not missing and (self._value is not missing or self.value_start is None):
+            self.source = None
 
     def to_json(self):
         json = {
@@ -29,30 +70,33 @@ class AttributeToken:
         return json
 
 
-def attributes(src: str, name: str=None):
+def attributes(src: str, name: str=None, start: int=0, end: int=None):
     """
     Parses given string as list of HTML attributes.
     :param src A fragment to parse. If `name` argument is provided, it must be an
     opening tag (`<a foo="bar">`), otherwise it should be a fragment between element
     name and tag closing angle (`foo="bar"`)
     :param name Tag name
+    :param start, end Range of fragment in `src`: parser reads it right from `src`
+    and reports attribute ranges in `src`
     """
     result = []
-    start = 0
-    end = len(src)
+    if end is None:
+        end = len(src)
+
     if name:
-        start = len(name) + 1
-        end -= 2 if src.endswith('/>') else 1
+        self_close = end - start >= 2 and src.startswith('/>', end - 2)
+        start += len(name) + 1
+        end -= 2 if self_close else 1
 
     scanner = Scanner(src, start, end)
 
     while not scanner.eof():
         scanner.eat_while(is_space)
         if attribute_name(scanner):
-            token = AttributeToken(scanner.current(), scanner.start, scanner.pos)
+            token = AttributeToken(None, scanner.start, scanner.pos, source=src)
 
             if scanner.eat(Chars.Equals) and attribute_value(scanner):
-                token.value = scanner.current()
                 token.value_start = scanner.start
                 token.value_end = scanner.pos
 
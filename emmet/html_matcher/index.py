@@ -0,0 +1,300 @@
+from bisect import bisect_left
+from ..scanner import Scanner
+from .utils import ScannerOptions, ElementType
+from .scan import scan_from
+from . import MatchedTag, BalancedTag, get_attributes
+
+__doc__ = """
+Persistent index of tags in XML/HTML document. Unlike `match()`,
+`balanced_outward()` and `balanced_inward()` functions, which scan whole document
+on every call, index scans document once and answers queries for any location
+with binary search over tag list. Text edits are applied incrementally: only
+damaged part of document is re-scanned
+"""
+
+
+class LookaheadScanner(Scanner):
+    "Scanner which keeps track of the farthest location it has read"
+    __slots__ = ('reach',)
+
+    def __init__(self, source: str, start=0, end: int=None):
+        super(LookaheadScanner, self).__init__(source, start, end)
+        self.reach = start
+
+    def eof(self):
+        if self.pos >= self.end:
+            self.reach = self.end
+            return True
+        return False
+
+    def peek(self):
+        if self.pos < self.end:
+            if self.pos > self.reach:
+                self.reach = self.pos
+            return self.string[self.pos]
+
+        self.reach = self.end
+        return ''
+
+    def next(self):
+        ch = self.peek()
+        if ch:
+            self.pos += 1
+            return ch
+
+    def eat_while(self, match):
+        result = super(LookaheadScanner, self).eat_while(match)
+        if self.pos >= self.end:
+            self.reach = self.end
+        return result
+
+
+class TagIndex:
+    """
+    Index of tags in XML/HTML source. Tags are stored as scanner reports them,
+    in parallel lists of names, types and ranges. For every tag, index also
+    stores the farthest location scanner has read before reporting it: tags
+    which don’t depend on edited text are kept as is when document is updated
+    """
+    __slots__ = ('source', 'options', 'names', 'types', 'starts', 'ends',
+                 'reach', '_tree')
+
+    def __init__(self, source: str, opt: dict=None):
+        self.source = source
+        self.options = ScannerOptions(opt)
+        self.names = []
+        self.types = []
+        self.starts = []
+        self.ends = []
+        self.reach = []
+        self._tree = None
+        self._scan(0, 0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def edit(self, offset: int, length: int, text: str=''):
+        """
+        Updates index after replacing `length` characters of source at `offset`
+        with given `text`
+        """
+        source = self.source
+        if offset < 0 or length < 0 or offset + length > len(source):
+            raise ValueError('Edit range is out of source bounds')
+
+        self.source = source[:offset] + text + source[offset + length:]
+
+        # Find the last open tag that scanner reported without reading edited
+        # text: scanner state at the start of such tag is the same as before edit
+        ix = bisect_left(self.reach, offset) - 1
+        while ix >= 0 and self.types[ix] == ElementType.Close:
+            ix -= 1
+
+        if ix >= 0:
+            start = self.starts[ix]
+            reach = self.reach[ix - 1] if ix > 0 else start
+        else:
+            ix = start = reach = 0
+
+        self._scan(ix, start, reach, offset + len(text), offset + length, len(text) - length)
+
+    def match(self, pos: int) -> MatchedTag:
+        "Same as `match()` function but uses indexed tags"
+        tree = self._get_tree()
+        ix = self._innermost(tree, pos)
+        if ix != -1:
+            name = self.names[ix]
+            start = self.starts[ix]
+            end = self.ends[ix]
+            attrs = get_attributes(self.source, start, end, name)
+            pair = tree[0][ix]
+            if pair != ix:
+                return MatchedTag(name, attrs, (start, end), (self.starts[pair], self.ends[pair]))
+            return MatchedTag(name, attrs, (start, end))
+
+    def balanced_outward(self, pos: int) -> list:
+        "Same as `balanced_outward()` function but uses indexed tags"
+        tree = self._get_tree()
+        parents = tree[1]
+        result = []
+        ix = self._innermost(tree, pos)
+        while ix != -1:
+            result.append(self._balanced_tag(tree, ix))
+            ix = parents[ix]
+
+        return result
+
+    def balanced_inward(self, pos: int) -> list:
+        "Same as `balanced_inward()` function but uses indexed tags"
+        tree = self._get_tree()
+        pairs, _, _, first_child = tree
+        starts = self.starts
+        result = []
+
+        # Inward balancing picks the first closed tag which contains given
+        # location, including tag bounds
+        last = bisect_left(starts, pos) - 1
+        if last >= 0 and 0 <= pairs[last] < last and self.ends[last] == pos:
+            ix = pairs[last]
+        elif last + 1 < len(starts) and starts[last + 1] == pos and pairs[last + 1] > last + 1:
+            ix = last + 1
+        else:
+            ix = self._innermost(tree, pos)
+
+        if ix != -1:
+            result.append(self._balanced_tag(tree, ix))
+            if pairs[ix] != ix:
+                ix = first_child[ix]
+                while ix != -1:
+                    result.append(self._balanced_tag(tree, ix))
+                    ix = first_child[ix]
+
+        return result
+
+    def _scan(self, ix: int, start: int, reach=0, sync=None, sync_old=0, delta=0):
+        """
+        Scans source from `start` location and replaces indexed tags from `ix`
+        with the found ones. If `sync` location is given, scanning stops as soon
+        as it finds open tag at or after `sync` which is already in index at
+        `sync_old` location or later, shifted by `delta`: the rest of the index
+        is reused
+        """
+        names = []
+        types = []
+        starts = []
+        ends = []
+        reaches = []
+        old_starts = self.starts
+        tail = [len(old_starts)]
+        scanner = LookaheadScanner(self.source, start)
+        scanner.reach = max(reach, start)
+
+        def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
+            if sync is not None and start >= sync and elem_type != ElementType.Close:
+                old = bisect_left(old_starts, start - delta, ix)
+                if old < len(old_starts) and old_starts[old] == start - delta \
+                    and old_starts[old] >= sync_old \
+                    and self.types[old] == elem_type \
+                    and self.ends[old] == end - delta \
+                    and self.names[old] == name:
+                    # Found tag which is scanned exactly as before: from now on
+                    # scanner will produce the same tags
+                    tail[0] = old
+                    return False
+
+            names.append(name)
+            types.append(elem_type)
+            starts.append(start)
+            ends.append(end)
+            reaches.append(scanner.reach)
+
+        scan_from(scanner, scan_callback, self.options.special)
+
+        old = tail[0]
+        if delta:
+            # Shift locations of reused tags
+            starts += [pos + delta for pos in old_starts[old:]]
+            ends += [pos + delta for pos in self.ends[old:]]
+            reaches += [pos + delta for pos in self.reach[old:]]
+            old_end = len(old_starts)
+        else:
+            old_end = old
+
+        if names != self.names[ix:old] or types != self.types[ix:old]:
+            # Tag tree depends on tag names and types only, keep it if only
+            # tag locations were changed
+            self.names[ix:old] = names
+            self.types[ix:old] = types
+            self._tree = None
+
+        self.starts[ix:old_end] = starts
+        self.ends[ix:old_end] = ends
+        self.reach[ix:old_end] = reaches
+
+        # Reused tags also depend on locations read by scanner before them
+        reach = scanner.reach
+        for k in range(ix + len(names), len(self.reach)):
+            if self.reach[k] >= reach:
+                break
+            self.reach[k] = reach
+
+    def _get_tree(self):
+        """
+        Returns tag tree of current index. Tree is a tuple of lists, indexed
+        by tag location in index:
+        * pair: location of matching tag, tag itself for self-closing tags or
+          -1 for unmatched tags;
+        * parent: closest element which contains given element;
+        * scope: element which should be checked first when looking for
+          element that contains any location inside given tag;
+        * first child: first child element of given element.
+        """
+        if self._tree is None:
+            self._tree = build_tree(self.names, self.types, self.options)
+        return self._tree
+
+    def _innermost(self, tree: tuple, pos: int) -> int:
+        "Returns location of the innermost element which contains given location"
+        pairs, parents, scopes, _ = tree
+        ends = self.ends
+        last = bisect_left(self.starts, pos) - 1
+        if last < 0:
+            return -1
+
+        ix = scopes[last]
+        while ix != -1 and ends[pairs[ix]] <= pos:
+            ix = parents[ix]
+
+        return ix
+
+    def _balanced_tag(self, tree: tuple, ix: int) -> BalancedTag:
+        pair = tree[0][ix]
+        tag = BalancedTag(self.names[ix], (self.starts[ix], self.ends[ix]))
+        if pair != ix:
+            tag.close = (self.starts[pair], self.ends[pair])
+        return tag
+
+
+def build_tree(names: list, types: list, options: ScannerOptions):
+    "Builds tag tree from given tags, see `TagIndex._get_tree()`"
+    size = len(names)
+    pairs = [-1] * size
+    parents = [-1] * size
+    scopes = [-1] * size
+    first_child = [-1] * size
+    stack = []
+
+    empty = () if options.xml else set(options.empty)
+
+    # Match tags with the same rules as `match()` function
+    for ix in range(size):
+        elem_type = types[ix]
+        if elem_type == ElementType.Close:
+            if stack and names[stack[-1]] == names[ix]:
+                pair = stack.pop()
+                pairs[pair] = ix
+                pairs[ix] = pair
+        elif elem_type == ElementType.SelfClose or names[ix] in empty:
+            pairs[ix] = ix
+        else:
+            stack.append(ix)
+
+    # Build element hierarchy from matched tags
+    stack = []
+    for ix in range(size):
+        pair = pairs[ix]
+        parent = stack[-1] if stack else -1
+        if pair == -1:
+            scopes[ix] = parent
+        elif pair < ix:
+            stack.pop()
+            scopes[ix] = pair
+        else:
+            parents[ix] = parent
+            scopes[ix] = ix
+            if parent != -1 and first_child[parent] == -1:
+                first_child[parent] = ix
+            if pair != ix:
+                stack.append(ix)
+
+    return pairs, parents, scopes, first_child
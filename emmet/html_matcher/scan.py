@@ -1,3 +1,4 @@
+import re
 from ..scanner import Scanner
 from ..scanner_utils import is_space, eat_quoted
 from .utils import ElementType, Chars, consume_array, is_terminator, consume_section, ident
@@ -10,7 +11,21 @@ comment_close = '-->'
 pi_start = '<?'
 pi_end = '?>'
 
-def scan(source: str, callback: callable, special: dict=None):
+name_start_chars = 'A-Za-z:_\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u02FF\u0370-\u037D\u037F-\u1FFF'
+re_ident = re.compile('[%s][%s\\-.\\d\u00B7\u0300-\u036F]*' % (name_start_chars, name_start_chars))
+"Tag name, same as `ident()` consumer"
+
+re_pi = re.compile(r'\?>|["\']')
+"End of processing instruction or start of quoted string inside it"
+
+re_quoted = {
+    '"': re.compile(r'"(?:[^"\\]|\\[\s\S])*"'),
+    "'": re.compile(r"'(?:[^'\\]|\\[\s\S])*'")
+}
+"Quoted strings, same as `eat_quoted()` consumer"
+
+
+def scan(source: str, callback: callable, special: dict=None, start=0):
     """
     Performs fast scan of given source code: for each tag found it invokes callback
     with tag name, its type (open, close, self-close) and range in original source.
@@ -19,8 +34,84 @@ def scan(source: str, callback: callable, special: dict=None):
     If `callback` returns `false`, scanner stops parsing.
     :param special List of “special” HTML tags which should be ignored. Most likely
     it’s a "script" and "style" tags.
+    :param start Location in `source` where scanning should start. It must be
+    a location where scanner is not inside tag, comment or special element
     """
+    # Text, comments, CDATA, processing instructions and contents of special
+    # elements are skipped with string search, scanner is used for tags only.
+    # Produces the same result as `scan_chars()`
     scanner = Scanner(source)
+    end = len(source)
+    pos = start
+
+    while pos < end:
+        pos = source.find(Chars.LeftAngle, pos)
+        if pos == -1:
+            break
+
+        if source.startswith(cdata_open, pos):
+            pos = skip_to(source, cdata_close, pos + len(cdata_open))
+            continue
+
+        if source.startswith(comment_open, pos):
+            pos = skip_to(source, comment_close, pos + len(comment_open))
+            continue
+
+        if source.startswith(pi_start, pos):
+            pos = skip_processing_instruction(source, pos + len(pi_start))
+            continue
+
+        tag_start = pos
+        pos += 1
+        elem_type = ElementType.Open
+        if source.startswith(Chars.Slash, pos):
+            elem_type = ElementType.Close
+            pos += 1
+
+        m = re_ident.match(source, pos)
+        if not m:
+            continue
+
+        # Consumed tag name
+        scanner.pos = m.end()
+        if elem_type != ElementType.Close:
+            skip_attributes(scanner)
+            scanner.eat_while(is_space)
+            if scanner.eat(Chars.Slash):
+                elem_type = ElementType.SelfClose
+
+        pos = scanner.pos
+        if scanner.eat(Chars.RightAngle):
+            # Tag properly closed
+            pos = scanner.pos
+            name = m.group(0)
+            if callback(name, elem_type, tag_start, pos) is False:
+                break
+
+            if elem_type == ElementType.Open and special and is_special(special, name, source, tag_start, pos):
+                # Found opening tag of special element: skip its contents
+                # until closing tag
+                closing = '</%s>' % name
+                close_start = source.find(closing, pos)
+                if close_start == -1:
+                    break
+
+                pos = close_start + len(closing)
+                if callback(name, ElementType.Close, close_start, pos) is False:
+                    break
+
+
+def scan_chars(source: str, callback: callable, special: dict=None, start=0):
+    """
+    Same as `scan()` but reads source code character by character. Can be used
+    as a reference implementation of `scan()`
+    """
+    scan_from(Scanner(source, start), callback, special)
+
+
+def scan_from(scanner: Scanner, callback: callable, special: dict=None):
+    "Same as `scan()` but reads source code from given scanner"
+    source = scanner.string
     found = False
 
     while not scanner.eof():
@@ -65,6 +156,29 @@ def scan(source: str, callback: callable, special: dict=None):
             scanner.pos += 1
 
 
+def skip_to(source: str, suffix: str, pos: int):
+    "Returns location right after `suffix` in `source` or source end if there’s no suffix"
+    pos = source.find(suffix, pos)
+    return pos + len(suffix) if pos != -1 else len(source)
+
+
+def skip_processing_instruction(source: str, pos: int):
+    """
+    Returns location right after processing instruction which content starts at
+    `pos`, same as `processing_instruction()` consumer
+    """
+    while True:
+        m = re_pi.search(source, pos)
+        if not m:
+            return len(source)
+
+        if m.group(0) == pi_end:
+            return m.end()
+
+        quoted = re_quoted[m.group(0)].match(source, m.start())
+        pos = quoted.end() if quoted else m.start() + 1
+
+
 def skip_attributes(scanner: Scanner):
     "Skips attributes in current tag context"
     while not scanner.eof():
@@ -125,7 +239,7 @@ def is_special(special: dict, name: str, source: str, start: int, end: int):
         if not isinstance(type_values, list):
             return True
 
-        attrs = attributes(source[start + len(name) + 1:end - 1])
+        attrs = attributes(source, None, start + len(name) + 1, end - 1)
         value = get_attribute_value(attrs, 'type') or ''
         return value in type_values
 
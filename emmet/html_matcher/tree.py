@@ -0,0 +1,190 @@
+from array import array
+from bisect import bisect_left
+from .utils import ScannerOptions, ElementType
+from .scan import scan
+from . import BalancedTag
+
+__doc__ = """
+Compact tree of XML/HTML elements. Elements are stored in document order as
+parallel integer arrays instead of per-tag objects, tag names are stored once
+in name table. Useful for operations on whole document, like walking element
+hierarchy or answering many queries on large documents
+"""
+
+open_code = 0
+close_code = 1
+self_close_code = 2
+
+
+class TagTree:
+    """
+    Tree of matched elements in XML/HTML source, built with the same tag matching
+    rules as `balanced_outward()` function. Elements are addressed by their
+    index in document order; missing range or relation is stored as `-1`
+    """
+    __slots__ = ('names', 'name_ids', 'open_start', 'open_end', 'close_start',
+                 'close_end', 'parent', 'first_child', 'next_sibling')
+
+    def __init__(self, source: str, opt: dict=None):
+        self.names = []
+        "Table of unique tag names"
+
+        self.name_ids = array('i')
+        "Index of element name in name table"
+
+        self.open_start = array('i')
+        self.open_end = array('i')
+        "Range of opening (or self-closing) tag"
+
+        self.close_start = array('i')
+        self.close_end = array('i')
+        "Range of closing tag, `-1` for self-closing element"
+
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        "Element hierarchy: parent, first child and next sibling indexes"
+
+        self._build(source, ScannerOptions(opt))
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def name(self, ix: int) -> str:
+        "Returns tag name of element at `ix`"
+        return self.names[self.name_ids[ix]]
+
+    def open(self, ix: int) -> tuple:
+        "Returns range of opening tag of element at `ix`"
+        return (self.open_start[ix], self.open_end[ix])
+
+    def close(self, ix: int) -> tuple:
+        "Returns range of closing tag of element at `ix` or `None` if it’s self-closing"
+        if self.close_start[ix] != -1:
+            return (self.close_start[ix], self.close_end[ix])
+
+    def end(self, ix: int) -> int:
+        "Returns location where element at `ix` ends"
+        end = self.close_end[ix]
+        return end if end != -1 else self.open_end[ix]
+
+    def children(self, ix: int=-1):
+        "Iterates over indexes of child elements of `ix` or top-level elements"
+        child = self.first_child[ix] if ix != -1 else (0 if self.name_ids else -1)
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def ancestors(self, ix: int):
+        "Iterates over indexes of parent elements of `ix`, from closest one"
+        ix = self.parent[ix]
+        while ix != -1:
+            yield ix
+            ix = self.parent[ix]
+
+    def innermost(self, pos: int) -> int:
+        "Returns index of innermost element which contains `pos` or `-1`"
+        ix = bisect_left(self.open_start, pos) - 1
+        while ix != -1 and self.end(ix) <= pos:
+            ix = self.parent[ix]
+        return ix
+
+    def balanced_outward(self, pos: int) -> list:
+        "Same as `balanced_outward()` function but uses element tree"
+        result = []
+        ix = self.innermost(pos)
+        while ix != -1:
+            result.append(self.to_balanced(ix))
+            ix = self.parent[ix]
+        return result
+
+    def to_balanced(self, ix: int) -> BalancedTag:
+        "Returns balanced tag model for element at `ix`"
+        return BalancedTag(self.name(ix), self.open(ix), self.close(ix))
+
+    def _build(self, source: str, options: ScannerOptions):
+        names = self.names
+        name_lookup = {}
+        empty = () if options.xml else set(options.empty)
+
+        # Collect tags reported by scanner
+        tag_names = array('i')
+        tag_types = array('b')
+        starts = array('i')
+        ends = array('i')
+
+        def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
+            name_id = name_lookup.get(name)
+            if name_id is None:
+                name_id = name_lookup[name] = len(names)
+                names.append(name)
+
+            if elem_type == ElementType.Close:
+                tag_types.append(close_code)
+            elif elem_type == ElementType.SelfClose or name in empty:
+                tag_types.append(self_close_code)
+            else:
+                tag_types.append(open_code)
+
+            tag_names.append(name_id)
+            starts.append(start)
+            ends.append(end)
+
+        scan(source, scan_callback, options.special)
+
+        # Match opening and closing tags
+        size = len(tag_types)
+        pairs = array('i', [-1]) * size
+        stack = []
+        for ix in range(size):
+            code = tag_types[ix]
+            if code == close_code:
+                if stack and tag_names[stack[-1]] == tag_names[ix]:
+                    pair = stack.pop()
+                    pairs[pair] = ix
+                    pairs[ix] = pair
+            elif code == self_close_code:
+                pairs[ix] = ix
+            else:
+                stack.append(ix)
+
+        # Create elements from matched tags
+        last_child = array('i')
+        last_root = -1
+        stack = []
+        for ix in range(size):
+            pair = pairs[ix]
+            if pair == -1:
+                continue
+
+            if pair < ix:
+                elem = stack.pop()
+                self.close_start[elem] = starts[ix]
+                self.close_end[elem] = ends[ix]
+                continue
+
+            elem = len(self.name_ids)
+            parent = stack[-1] if stack else -1
+            self.name_ids.append(tag_names[ix])
+            self.open_start.append(starts[ix])
+            self.open_end.append(ends[ix])
+            self.close_start.append(-1)
+            self.close_end.append(-1)
+            self.parent.append(parent)
+            self.first_child.append(-1)
+            self.next_sibling.append(-1)
+            last_child.append(-1)
+
+            prev = last_child[parent] if parent != -1 else last_root
+            if prev != -1:
+                self.next_sibling[prev] = elem
+            elif parent != -1:
+                self.first_child[parent] = elem
+
+            if parent != -1:
+                last_child[parent] = elem
+            else:
+                last_root = elem
+
+            if pair != ix:
+                stack.append(elem)
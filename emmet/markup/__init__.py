@@ -1,14 +1,15 @@
-from ..config import Config
+from ..config import Config, DEFAULT_OPTIONS
 from ..abbreviation import parse as abbreviation, Abbreviation, AbbreviationNode, AbbreviationAttribute
 from .attributes import merge_attributes as attributes
-from .snippets import resolve_snippets as snippets
+from .snippets import resolve_snippets as snippets, parse_fingerprint
 from .implicit_tag import implicit_tag
-from .lorem import lorem
+from .lorem import lorem, create_generator as create_lorem_generator, use_generator as use_lorem_generator
 from .addon.xsl import xsl
 from .addon.bem import bem
 from .addon.label import label
 from .format import html, haml, slim, pug
 from .utils import walk
+from ..profiler import get_profiler, count_nodes
 
 FORMATTERS = {
     'html': html,
@@ -17,22 +18,20 @@ FORMATTERS = {
     'pug': pug
 }
 
-def parse(abbr: str, config: Config):
+def parse(abbr: str, config: Config, prepared: tuple=None):
     """
     Parses given Emmet abbreviation into a final abbreviation tree with all
-    required transformations applied
+    required transformations applied. Pass result of `prepare()` for the same
+    config as `prepared` to skip its calculation
     """
 
     text = config.get('text')
+    if prepared is None:
+        prepared = prepare(config)
+    options, fingerprint = prepared
+
     if isinstance(abbr, str):
-        abbr = abbreviation(abbr, {
-            'text': text,
-            'variables': config.variables,
-            'options': config.options,
-            'max_repeat': config.get('maxRepeat') or config.get('max_repeat'),
-            'jsx': bool(config.options.get('jsx.enabled')),
-            'href': config.options.get('markup.href')
-        })
+        abbr = abbreviation(abbr, options)
 
     # Run abbreviation resolve in two passes:
     # 1. Map each node to snippets, which are abbreviations as well. A single snippet
@@ -42,16 +41,83 @@ def parse(abbr: str, config: Config):
     if text:
         config.user_config['text'] = None
 
-    snippets(abbr, config)
-    walk(abbr, transform, config)
-    config.user_config['text'] = text
+    # Seeded lorem generator is created per expansion to produce the same text
+    # for the same abbreviation
+    generator = create_lorem_generator(config)
+    prev_generator = use_lorem_generator(generator) if generator else None
+
+    try:
+        profiler = get_profiler()
+        if profiler is None:
+            snippets(abbr, config, fingerprint)
+            walk(abbr, transform, config)
+        else:
+            profiler.measure('resolve_snippets', snippets, abbr, config, fingerprint)
+            profiler.measure('transform', walk, abbr, profiled_transform, (profiler, config))
+            profiler.count('output_nodes', count_nodes(abbr.children))
+    finally:
+        if generator:
+            use_lorem_generator(prev_generator)
+        config.user_config['text'] = text
+
     return abbr
 
-def stringify(abbr: Abbreviation, config: Config):
-    "Converts given abbreviation to string according to provided `config`"
+def prepare(config: Config) -> tuple:
+    """
+    Returns options of abbreviation parser and fingerprint of parsed snippets
+    for given config. Both depend on config only, so expansion of multiple
+    abbreviations with the same config may calculate them once
+    """
+    text = config.get('text')
+    options = {
+        'text': text,
+        'variables': config.variables,
+        'options': config.options,
+        'max_repeat': config.get('maxRepeat') or config.get('max_repeat'),
+        'jsx': bool(config.options.get('jsx.enabled')),
+        'href': config.options.get('markup.href'),
+        'tokenizer': config.options.get('markup.tokenizer'),
+        'lazy_repeat': lazy_repeat(config)
+    }
+
+    # Snippets are resolved without text, see `parse()`
+    if text:
+        config.user_config['text'] = None
+    try:
+        fingerprint = parse_fingerprint(config)
+    finally:
+        if text:
+            config.user_config['text'] = text
+
+    return options, fingerprint
+
+def lazy_repeat(config: Config) -> int:
+    """
+    Returns minimum repeat count for virtually repeated nodes or 0 if virtual
+    repeat is disabled or may produce different output with given config
+    """
+    options = config.options
+    threshold = options.get('markup.lazyRepeat') or 0
+    if threshold > 0:
+        if options.get('bem.enabled') or options.get('markup.valuePrefix') or \
+            options.get('output.text') is not DEFAULT_OPTIONS['output.text']:
+            return 0
+
+        for snippet in config.snippets.values():
+            if 'lorem' in snippet:
+                return 0
+
+    return threshold
+
+
+def stringify(abbr: Abbreviation, config: Config, sink=None):
+    """
+    Converts given abbreviation to string according to provided `config`.
+    If `sink` is given, output is written into it
+    """
     global FORMATTERS
     formatter = FORMATTERS.get(config.syntax, html)
-    return formatter(abbr, config)
+    return formatter(abbr, config, sink)
 
 
 def transform(node: AbbreviationNode, ancestors: list, config: Config):
@@ -68,3 +134,20 @@ def transform(node: AbbreviationNode, ancestors: list, config: Config):
 
     if config.options.get('bem.enabled'):
         bem(node, ancestors, config)
+
+
+def profiled_transform(node: AbbreviationNode, ancestors: list, state: tuple):
+    "Same as `transform()` but records every transformation in given profiler"
+    profiler, config = state
+    profiler.measure('implicit_tag', implicit_tag, node, ancestors, config)
+    profiler.measure('attributes', attributes, node, config)
+    profiler.measure('lorem', lorem, node, ancestors, config)
+
+    if config.syntax == 'xsl':
+        profiler.measure('xsl', xsl, node)
+
+    if config.type == 'markup':
+        profiler.measure('label', label, node)
+
+    if config.options.get('bem.enabled'):
+        profiler.measure('bem', bem, node, ancestors, config)
@@ -1,4 +1,5 @@
 from ...abbreviation import AbbreviationNode, AbbreviationAttribute
+from ...abbreviation.tokenizer.tokens import Field
 from ..utils import find
 
 def label(node: AbbreviationNode):
@@ -21,7 +22,7 @@ def is_empty_attribute(attr: AbbreviationAttribute):
 
     if len(attr.value) == 1:
         token = attr.value[0]
-        if token and not isinstance(token, str) and not token.name:
+        if isinstance(token, Field) and not token.name:
             # Attribute contains field
             return True
 
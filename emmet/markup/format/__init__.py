@@ -4,7 +4,7 @@ from ...abbreviation import Abbreviation
 from ...config import Config
 
 
-def haml(abbr: Abbreviation, config: Config):
+def haml(abbr: Abbreviation, config: Config, sink=None):
     return indent_format(abbr, config, {
         'beforeName': '%',
         'beforeAttribute': '(',
@@ -13,24 +13,24 @@ def haml(abbr: Abbreviation, config: Config):
         'afterTextLine': ' |',
         'booleanValue': 'true',
         'selfClose': '/'
-    })
+    }, sink)
 
 
-def pug(abbr: Abbreviation, config: Config):
+def pug(abbr: Abbreviation, config: Config, sink=None):
     return indent_format(abbr, config, {
         'beforeAttribute': '(',
         'afterAttribute': ')',
         'glueAttribute': ', ',
         'beforeTextLine': '| ',
         'selfClose': '/' if config.options.get('output.selfClosingStyle') == 'xml' else ''
-    })
+    }, sink)
 
 
-def slim(abbr: Abbreviation, config: Config):
+def slim(abbr: Abbreviation, config: Config, sink=None):
     return indent_format(abbr, config, {
         'beforeAttribute': ' ',
         'glueAttribute': ' ',
         'beforeTextLine': '| ',
         'selfClose': '/'
-    })
+    }, sink)
 
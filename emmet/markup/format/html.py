@@ -1,5 +1,5 @@
 import re
-from .walk import walk, WalkState
+from .walk import walk, iterate, WalkState
 from .utils import caret, is_inline_element, is_snippet, push_tokens, should_output_attribute
 from .comment import comment_node_before, comment_node_after, CommentWalkState
 from ...abbreviation import Abbreviation, AbbreviationNode, AbbreviationAttribute
@@ -20,10 +20,15 @@ class HTMLWalkState(WalkState):
     __slots__ = ('comment')
 
 
-def html(abbr: Abbreviation, config: Config):
-    state = HTMLWalkState(config)
+def html(abbr: Abbreviation, config: Config, sink=None):
+    """
+    Outputs given abbreviation as HTML. If `sink` is given, output is written
+    into it and the rest of output, if any, is returned
+    """
+    state = HTMLWalkState(config, sink)
     state.comment = CommentWalkState(config)
     walk(abbr, element, state)
+    state.out.flush()
     return state.out.value
 
 
@@ -251,7 +256,7 @@ def starts_with_block_tag(value: list, config: Config) -> bool:
     return False
 
 def _next(items: list, walk_next: callable):
-    for i, item in enumerate(items):
+    for i, item in iterate(items):
         walk_next(item, i, items)
 
 
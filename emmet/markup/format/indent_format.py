@@ -1,6 +1,6 @@
 import re
 
-from .walk import walk, WalkState
+from .walk import walk, iterate, WalkState
 from .utils import push_tokens, caret, split_by_lines, is_snippet, should_output_attribute
 from ...abbreviation import Abbreviation, AbbreviationNode, AbbreviationAttribute
 from ...abbreviation.tokenizer.tokens import Field
@@ -15,10 +15,11 @@ class IndentWalkState(WalkState):
     __slots__ = ('options')
 
 
-def indent_format(abbr: Abbreviation, config: Config, options={}):
-    state = IndentWalkState(config)
+def indent_format(abbr: Abbreviation, config: Config, options={}, sink=None):
+    state = IndentWalkState(config, sink)
     state.options = options
     walk(abbr, element, state)
+    state.out.flush()
     return state.out.value
 
 
@@ -47,7 +48,7 @@ def element(node: AbbreviationNode, index: int, items: list, state: IndentWalkSt
             out.push_string(state.options['selfClose'])
     else:
         push_value(node, state)
-        for index, child in enumerate(node.children):
+        for index, child in iterate(node.children):
             walk_next(child, index, node.children)
 
     out.level -= level
@@ -166,7 +167,13 @@ def value_length(tokens: list):
     l = 0
 
     for token in tokens:
-        l += len(token) if isinstance(token, str) else len(token.name)
+        if isinstance(token, Field):
+            l += len(token.name)
+        elif hasattr(token, 'chunks'):
+            # Streamed text knows its length, no need to produce it
+            l += len(token)
+        else:
+            l += len(str(token))
 
     return l
 
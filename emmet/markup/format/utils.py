@@ -23,12 +23,18 @@ def push_tokens(tokens: list, state: WalkState):
     largest_index = -1
 
     for t in tokens:
-        if isinstance(t, str):
-            out.push_string(t)
-        else:
+        if isinstance(t, Field):
             out.push_field(state.field + t.index, t.name)
             if t.index > largest_index:
                 largest_index = t.index
+        else:
+            # Plain string, lazy value like repeater number or streamed text
+            chunks = getattr(t, 'chunks', None)
+            if chunks is not None:
+                for chunk in chunks():
+                    out.push_string(chunk)
+            else:
+                out.push_string(str(t))
 
     if largest_index != -1:
         state.field += largest_index + 1
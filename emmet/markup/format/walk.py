@@ -1,4 +1,4 @@
-from ...abbreviation import Abbreviation, AbbreviationNode
+from ...abbreviation import Abbreviation, AbbreviationNode, RepeatedNodes, VirtualRepeater
 from ...config import Config
 from ...output_stream import OutputStream
 
@@ -6,7 +6,7 @@ from ...output_stream import OutputStream
 class WalkState:
     __slots__ = ('current', 'parent', 'ancestors', 'config', 'out', 'field')
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, sink=None):
         self.current = None
         "Context node"
 
@@ -19,13 +19,15 @@ class WalkState:
         self.config = config
         "Current output config"
 
-        self.out = OutputStream(config.options)
+        self.out = OutputStream(config.options, sink=sink)
         "Output stream"
 
         self.field = 1
         "Current field index, used to output field marks for editor tabstops"
 
 def walk(abbr: Abbreviation, visitor: callable, state: WalkState):
+    expand_repeated(abbr)
+
     def callback(ctx: AbbreviationNode, index: int, items: list):
         parent = state.parent
         current = state.current
@@ -41,5 +43,26 @@ def walk(abbr: Abbreviation, visitor: callable, state: WalkState):
         callback(node, index, items)
         state.ancestors.pop()
 
-    for index, child in enumerate(abbr.children):
+    for index, child in iterate(abbr.children):
         callback(child, index, abbr.children)
+
+
+def iterate(items: list):
+    """
+    Iterates over `(index, node)` pairs of given child nodes. For virtually
+    repeated nodes, a template node is returned for every copy with repeater
+    state updated
+    """
+    return items.walk() if isinstance(items, RepeatedNodes) else enumerate(items)
+
+
+def expand_repeated(node: AbbreviationNode):
+    "Replaces child lists of given node and its descendants which contain virtually repeated nodes with list views"
+    children = node.children
+    if isinstance(children, RepeatedNodes):
+        children = children.nodes
+    elif any(isinstance(child.repeat, VirtualRepeater) for child in children):
+        node.children = RepeatedNodes(children)
+
+    for child in children:
+        expand_repeated(child)
@@ -1,19 +1,173 @@
 import re
-from random import randint
+import random
+from importlib import import_module
+from threading import local
+from collections.abc import MutableMapping
 from ...abbreviation import AbbreviationNode
 from ...config import Config
 from ..implicit_tag import resolve_implicit_tag
-from .latin import vocabulary as latin
-from .russian import vocabulary as ru
-from .spanish import vocabulary as sp
 
 re_lorem = re.compile(r'^lorem([a-z]*)(\d*)(-\d*)?$', re.I)
 
-vocabularies = {
-    'ru': ru,
-    'sp': sp,
-    'latin': latin
+vocabulary_modules = {
+    'ru': '.russian',
+    'sp': '.spanish',
+    'latin': '.latin'
 }
+"Modules with vocabularies, loaded on first use"
+
+
+class Vocabularies(MutableMapping):
+    """
+    Vocabularies keyed by language. Built-in vocabularies are imported from
+    their modules on first access, other ones may be added as in regular dict
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self):
+        # `None` value is a built-in vocabulary which is not loaded yet
+        self._data = dict.fromkeys(vocabulary_modules)
+
+    def __getitem__(self, name: str) -> dict:
+        db = self._data[name]
+        if db is None:
+            db = self._data[name] = import_module(vocabulary_modules[name], __name__).vocabulary
+        return db
+
+    def __setitem__(self, name: str, db: dict):
+        self._data[name] = db
+
+    def __delitem__(self, name: str):
+        del self._data[name]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+vocabularies = Vocabularies()
+
+prepared_vocabularies = {}
+"Vocabularies prepared for sampling, keyed by language"
+
+_state = local()
+
+stream_threshold = 1000
+"Paragraphs with larger word count are produced lazily, when abbreviation is formatted"
+
+class LoremGenerator:
+    """
+    Generator of "Lorem ipsum" text which takes random numbers from given
+    `random.Random` instance or from global `random` module, if omitted
+    """
+    __slots__ = ('random',)
+
+    def __init__(self, rng: random.Random=None):
+        self.random = rng or random
+
+    def sample(self, arr: tuple, count: int) -> list:
+        "Returns up to `count` distinct random items from given list"
+        return self.random.sample(arr, min(len(arr), count))
+
+    def choice(self, val: str):
+        return val[self.random.randint(0, len(val) - 1)]
+
+    def sentence(self, words: list, end: str=None):
+        if words:
+            words = [words[0].capitalize()] + words[1:]
+
+        return ' '.join(words) + (end or self.choice('?!...')) # more dots than question marks
+
+    def insert_commas(self, words: list):
+        "Returns copy of given words with commas inserted at randomly selected words"
+        if len(words) < 2:
+            return words
+
+        randint = self.random.randint
+        words = words[:]
+        l = len(words)
+        total_commas = 0
+
+        if 3 < l <= 6:
+            total_commas = randint(0, 1)
+        elif 6 < l <= 12:
+            total_commas = randint(0, 2)
+        else:
+            total_commas = randint(1, 4)
+
+        for _ in range(total_commas):
+            pos = randint(0, l - 2)
+            if words[pos][-1] != ',':
+                words[pos] += ','
+
+        return words
+
+    def paragraph(self, db: dict, word_count: int, start_with_common=False):
+        """
+        Generate a paragraph of "Lorem ipsum" text
+        :param db Words dictionary
+        :param word_count Words count in paragraph
+        :param start_with_common Should paragraph start with common "lorem ipsum" sentence.
+        """
+        return ''.join(self.sentences(db, word_count, start_with_common))
+
+    def sentences(self, db: dict, word_count: int, start_with_common=False):
+        """
+        Generates sentences of "Lorem ipsum" paragraph one by one, every sentence
+        except first one is prefixed with space. Arguments are the same as
+        in `paragraph()` method
+        """
+        total_words = 0
+        sep = ''
+
+        if start_with_common and 'common' in db:
+            words = list(db['common'][0:word_count])
+            total_words += len(words)
+            yield self.sentence(self.insert_commas(words), '.')
+            sep = ' '
+
+        while total_words < word_count:
+            words = self.sample(db['words'], min(self.random.randint(2, 30), word_count - total_words))
+            total_words += len(words)
+            yield sep + self.sentence(self.insert_commas(words))
+            sep = ' '
+
+
+class LoremText:
+    """
+    Lazy value token with large "Lorem ipsum" paragraph: text is produced
+    sentence by sentence when abbreviation is formatted, with own random
+    generator seed so that it’s the same every time it’s produced
+    """
+    __slots__ = ('db', 'word_count', 'start_with_common', 'seed', '_length')
+
+    def __init__(self, db: dict, word_count: int, start_with_common: bool, seed: int):
+        self.db = db
+        self.word_count = word_count
+        self.start_with_common = start_with_common
+        self.seed = seed
+        self._length = None
+
+    def __len__(self):
+        "Returns length of text without producing it as a single string"
+        if self._length is None:
+            self._length = sum(len(chunk) for chunk in self.chunks())
+        return self._length
+
+    def chunks(self):
+        "Generates chunks of paragraph text"
+        generator = LoremGenerator(random.Random(self.seed))
+        return generator.sentences(self.db, self.word_count, self.start_with_common)
+
+    def __str__(self):
+        return ''.join(self.chunks())
+
+
+default_generator = LoremGenerator()
+"Generator used when no seed is given in config"
+
 
 def lorem(node: AbbreviationNode, ancestors: list, config: Config):
     if not node.name:
@@ -21,66 +175,61 @@ def lorem(node: AbbreviationNode, ancestors: list, config: Config):
 
     m = re_lorem.match(node.name)
     if m:
-        db = vocabularies.get(m.group(1)) or vocabularies.get('latin')
+        generator = getattr(_state, 'generator', None) or default_generator
+        db = get_vocabulary(m.group(1)) or get_vocabulary('latin')
         min_word_count = max(1, int(m.group(2))) if m.group(2) else 30
         max_word_count = max(min_word_count, int(m.group(3)[1:])) if m.group(3) else min_word_count
-        word_count = randint(min_word_count, max_word_count)
+        word_count = generator.random.randint(min_word_count, max_word_count)
         repeat = node.repeat or find_repeater(ancestors)
 
         node.name = node.attributes = None
-        node.value = [paragraph(db, word_count, not repeat or repeat.value == 0)]
+        start_with_common = not repeat or repeat.value == 0
+        if word_count > stream_threshold:
+            node.value = [LoremText(db, word_count, start_with_common, generator.random.getrandbits(64))]
+        else:
+            node.value = [generator.paragraph(db, word_count, start_with_common)]
 
         if node.repeat and len(ancestors) > 1:
             resolve_implicit_tag(node, ancestors, config)
 
-def sample(arr: list, count: int):
-    l = len(arr)
-    iterations = min(l, count)
-    result = []
+def get_vocabulary(name: str) -> dict:
+    """
+    Returns vocabulary for given language or `None` if there’s no such vocabulary.
+    Words of vocabulary are stored as tuple of unique items, ready for sampling
+    """
+    db = vocabularies.get(name)
+    if db is None:
+        return None
+
+    prepared = prepared_vocabularies.get(name)
+    if prepared is None or prepared[0] is not db:
+        data = { 'words': tuple(dict.fromkeys(db['words'])) }
+        if 'common' in db:
+            data['common'] = tuple(db['common'])
+        prepared = prepared_vocabularies[name] = (db, data)
+
+    return prepared[1]
 
-    while len(result) < iterations:
-        item = arr[randint(0, l - 1)]
-        if item not in result:
-            result.append(item)
 
-    return result
+def sample(arr: list, count: int):
+    return default_generator.sample(arr, count)
 
 
 def choice(val: str):
-    return val[randint(0, len(val) - 1)]
+    return default_generator.choice(val)
 
 
 def sentence(words: list, end: str=None):
-    if words:
-        words = [words[0].capitalize()] + words[1:]
+    return default_generator.sentence(words, end)
 
-    return ' '.join(words) + (end or choice('?!...')) # more dots than question marks
 
 def insert_commas(words: list):
     """
     Insert commas at randomly selected words. This function modifies values
     inside `words` array
     """
-    if len(words) < 2:
-        return words
-
-    words = words[:]
-    l = len(words)
-    total_commas = 0
-
-    if 3 < l <= 6:
-        total_commas = randint(0, 1)
-    elif 6 < l <= 12:
-        total_commas = randint(0, 2)
-    else:
-        total_commas = randint(1, 4)
+    return default_generator.insert_commas(words)
 
-    for _ in range(total_commas):
-        pos = randint(0, l - 2)
-        if words[pos][-1] != ',':
-            words[pos] += ','
-
-    return words
 
 def paragraph(db: dict, word_count: int, start_with_common=False):
     """
@@ -89,20 +238,30 @@ def paragraph(db: dict, word_count: int, start_with_common=False):
     :param word_count Words count in paragraph
     :param start_with_common Should paragraph start with common "lorem ipsum" sentence.
     """
-    result = []
-    total_words = 0
+    return default_generator.paragraph(db, word_count, start_with_common)
+
 
-    if start_with_common and 'common' in db:
-        words = db['common'][0:word_count]
-        total_words += len(words)
-        result.append(sentence(insert_commas(words), '.'))
+def create_generator(config: Config) -> LoremGenerator:
+    """
+    Creates generator for a single expansion with given config. Returns `None`
+    if config has no `lorem.seed` option, which is either a seed value or
+    `random.Random` instance
+    """
+    seed = config.options.get('lorem.seed')
+    if seed is None:
+        return None
 
-    while total_words < word_count:
-        words = sample(db['words'], min(randint(2, 30), word_count - total_words))
-        total_words += len(words)
-        result.append(sentence(insert_commas(words)))
+    return LoremGenerator(seed if isinstance(seed, random.Random) else random.Random(seed))
 
-    return ' '.join(result)
+
+def use_generator(generator: LoremGenerator=None) -> LoremGenerator:
+    """
+    Sets generator used for lorem ipsum nodes in current thread, `None` resets
+    it to default one. Returns previously used generator
+    """
+    prev = getattr(_state, 'generator', None)
+    _state.generator = generator
+    return prev
 
 
 def find_repeater(ancestors: list):
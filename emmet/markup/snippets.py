@@ -1,8 +1,16 @@
 from ..abbreviation import parse, Abbreviation, AbbreviationNode, AbbreviationAttribute
 from ..config import Config
+from ..cache import LRUCache, freeze, missing
+from ..snippets.compiled import get_compiled
 from .utils import walk, find_deepest
 
-def resolve_snippets(abbr: Abbreviation, config: Config):
+snippet_cache = LRUCache(512)
+"""
+Parsed snippets. Since snippet source is a part of cache key, updated snippet
+in config will never match outdated parsed tree
+"""
+
+def resolve_snippets(abbr: Abbreviation, config: Config, fingerprint=missing):
     """
     Finds matching snippet from `registry` and resolves it into a parsed abbreviation.
     Resolved node is then updated or replaced with matched abbreviation tree.
@@ -11,9 +19,13 @@ def resolve_snippets(abbr: Abbreviation, config: Config):
     e.g. a predefined set of name, attributes and so on, possibly a complex
     abbreviation with multiple elements. So we have to get snippet, parse it
     and recursively resolve it.
+
+    Pass `fingerprint` of config, if it’s already known, to skip its calculation
     """
     stack = []
     is_reversed = config.options.get('output.reverseAttributes', False)
+    if fingerprint is missing:
+        fingerprint = parse_fingerprint(config)
 
     def resolve(child: AbbreviationNode):
         snippet = config.snippets.get(child.name) if child.name else None
@@ -24,7 +36,7 @@ def resolve_snippets(abbr: Abbreviation, config: Config):
         if not snippet or snippet in stack:
             return None
 
-        snippet_abbr = parse(snippet, config)
+        snippet_abbr = parse_snippet(snippet, config, fingerprint)
         stack.append(snippet)
         walk_resolve(snippet_abbr, resolve, config)
         stack.pop()
@@ -46,6 +58,46 @@ def resolve_snippets(abbr: Abbreviation, config: Config):
     return abbr
 
 
+def parse_snippet(snippet: str, config: Config, fingerprint=None) -> Abbreviation:
+    """
+    Returns parsed abbreviation of given snippet. Parsed snippets are cached
+    per parsing options fingerprint so every call receives its own copy of
+    cached abbreviation tree
+    """
+    if fingerprint is None:
+        return parse(snippet, config)
+
+    key = (snippet, fingerprint)
+    abbr = snippet_cache.get(key)
+    if abbr is None:
+        compiled = get_compiled()
+        abbr = compiled['markup'].get(key) if compiled is not None else None
+        if abbr is not None:
+            # Precompiled built-in snippet
+            snippet_cache.set(key, abbr)
+            return abbr.clone()
+
+        abbr = parse(snippet, config)
+        snippet_cache.set(key, abbr.clone())
+        return abbr
+
+    return abbr.clone()
+
+
+def parse_fingerprint(config: Config):
+    """
+    Returns hashable fingerprint of config data that affects snippet parsing
+    or `None` if parsed snippets can’t be cached for given config
+    """
+    if config.get('text') is not None:
+        return None
+
+    try:
+        return freeze((config.variables, config.get('max_repeat'), bool(config.get('jsx'))))
+    except TypeError:
+        return None
+
+
 def walk_resolve(node: AbbreviationNode, resolve: callable, config: Config) -> list:
     children = []
 
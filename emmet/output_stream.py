@@ -1,3 +1,5 @@
+from queue import Queue, Empty
+from threading import Thread
 from .config import Config
 from .abbreviation.convert import AbbreviationAttribute, AbbreviationNode
 
@@ -5,9 +7,10 @@ expression_start = '{'
 expression_end = '}'
 
 class OutputStream:
-    __slots__ = ('options', '_value', 'level', 'offset', 'line', 'column')
+    __slots__ = ('options', '_value', 'level', 'offset', 'line', 'column',
+                 'sink', 'buffer_size', '_buffered')
 
-    def __init__(self, options={}, level=0):
+    def __init__(self, options={}, level=0, sink=None, buffer_size=8192):
         self._value = []
         self.options = options
         self.level = level
@@ -15,8 +18,19 @@ class OutputStream:
         self.line = 0
         self.column = 0
 
+        self.sink = sink
+        """
+        Optional object with `write()` method. If set, output is written into sink
+        in chunks of about `buffer_size` characters instead of being accumulated
+        in stream
+        """
+
+        self.buffer_size = buffer_size
+        self._buffered = 0
+
     @property
     def value(self):
+        "Output accumulated in stream: either full output or its part which isn’t written to sink yet"
         return ''.join(self._value)
 
     def _push(self, text: str):
@@ -26,6 +40,18 @@ class OutputStream:
         self.offset += l
         self.column += l
 
+        if self.sink is not None:
+            self._buffered += l
+            if self._buffered >= self.buffer_size:
+                self.flush()
+
+    def flush(self):
+        "Writes buffered output into sink, if any"
+        if self.sink is not None and self._value:
+            self.sink.write(''.join(self._value))
+            self._value = []
+            self._buffered = 0
+
     def push(self, text: str):
         "Pushes plain string into output stream without newline processing"
         process_text = self.options.get('output.text')
@@ -111,3 +137,64 @@ def str_case(text: str, case_type: str):
 
     return text
 
+
+
+class StreamClosed(Exception):
+    "Consumer of output stream is gone"
+
+
+class QueueSink:
+    "Output sink which sends written chunks to a bounded queue"
+    __slots__ = ('queue', 'closed')
+
+    def __init__(self, max_pending=4):
+        self.queue = Queue(max_pending)
+        self.closed = False
+
+    def write(self, chunk: str):
+        if self.closed:
+            raise StreamClosed()
+        self.queue.put(chunk)
+
+
+def iter_output(produce: callable, max_pending=4):
+    """
+    Runs `produce(sink)` in a separate thread and yields chunks written to sink.
+    At most `max_pending` chunks are buffered: producer waits until consumer
+    takes them. If consumer stops iteration, producer is stopped on next write
+    """
+    sink = QueueSink(max_pending)
+    done = object()
+    error = []
+
+    def run():
+        try:
+            produce(sink)
+        except StreamClosed:
+            pass
+        except BaseException as err:
+            error.append(err)
+        finally:
+            if not sink.closed:
+                sink.queue.put(done)
+
+    thread = Thread(target=run, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            chunk = sink.queue.get()
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        # Consumer is gone: unblock producer and wait until it stops
+        sink.closed = True
+        while thread.is_alive():
+            try:
+                sink.queue.get(timeout=0.05)
+            except Empty:
+                pass
+
+    if error:
+        raise error[0]
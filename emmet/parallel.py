@@ -0,0 +1,62 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+from .config import Config, get_config
+from . import expand_many
+
+__doc__ = "Parallel expansion of large batches of abbreviations in a process pool"
+
+worker_config = None
+"Config resolved in current worker process"
+
+
+def expand_parallel(abbrs, config: dict={}, global_config: dict={}, max_workers: int=None, chunk_size=256):
+    """
+    Expands given abbreviations in a pool of worker processes and yields results
+    in the same order as abbreviations. Abbreviations are sent to workers in
+    chunks of `chunk_size` items and only a limited amount of chunks is
+    in flight at once, so `abbrs` can be a lazy iterable of any size.
+    Config is sent to each worker once and resolved there, so both `config`
+    and `global_config` must be plain picklable dicts
+    """
+    if isinstance(config, Config):
+        raise TypeError('Config instance can’t be sent to worker process, use config dict instead')
+
+    # Arguments are validated right at call site, expansion starts
+    # when results are consumed
+    return iter_parallel(iter(abbrs), config, global_config, max_workers or os.cpu_count() or 1, chunk_size)
+
+
+def iter_parallel(items, config: dict, global_config: dict, max_workers: int, chunk_size: int):
+    "Yields results of `expand_parallel()`"
+    window = max_workers * 2
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(config, global_config)) as executor:
+        try:
+            while True:
+                while len(pending) < window:
+                    chunk = list(islice(items, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(expand_chunk, chunk))
+
+                if not pending:
+                    break
+
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def init_worker(config: dict, global_config: dict):
+    "Resolves config of worker process"
+    global worker_config
+    worker_config = get_config(config, global_config)
+
+
+def expand_chunk(abbrs: list) -> list:
+    "Expands given chunk of abbreviations in worker process"
+    return expand_many(abbrs, worker_config)
@@ -0,0 +1,186 @@
+import sys
+from time import perf_counter
+from threading import local
+
+__doc__ = """
+Optional instrumentation of abbreviation expansion. While profiler is active
+in current thread, every `expand()` call produces a report with wall time of
+each pipeline stage, amount of parsed tokens and nodes and, optionally, net
+amount of allocated memory blocks. When profiler is not active, pipeline
+only checks for its presence once per stage:
+
+    with profile() as profiler:
+        expand('ul>li*5')
+
+    print(profiler.reports[0].to_json())
+"""
+
+_state = local()
+
+
+class StageStats:
+    __slots__ = ('time', 'calls', 'allocations')
+
+    def __init__(self):
+        self.time = 0.0
+        "Total wall time of stage, in seconds"
+
+        self.calls = 0
+        "Amount of times stage was invoked"
+
+        self.allocations = 0
+        "Net amount of allocated memory blocks, if allocations are tracked"
+
+    def to_json(self):
+        return {
+            'time': self.time,
+            'calls': self.calls,
+            'allocations': self.allocations
+        }
+
+
+class ExpandReport:
+    """
+    Report of a single abbreviation expansion. Stages are stored in order of
+    their first invocation, nested stages are named as `parent/child`
+    """
+    __slots__ = ('abbreviation', 'type', 'time', 'stages', 'counts')
+
+    def __init__(self, abbreviation, abbr_type: str):
+        self.abbreviation = abbreviation
+        "Expanded abbreviation"
+
+        self.type = abbr_type
+        "Type of abbreviation, either `markup` or `stylesheet`"
+
+        self.time = 0.0
+        "Total wall time of expansion, in seconds"
+
+        self.stages = {}
+        "Stats of pipeline stages, keyed by stage name"
+
+        self.counts = {}
+        "Amount of processed items like tokens or nodes, keyed by item name"
+
+    def stage(self, name: str) -> StageStats:
+        "Returns stats of given stage, creating it if required"
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return stats
+
+    def to_json(self):
+        return {
+            'abbreviation': self.abbreviation if isinstance(self.abbreviation, str) else None,
+            'type': self.type,
+            'time': self.time,
+            'stages': dict((name, stats.to_json()) for name, stats in self.stages.items()),
+            'counts': dict(self.counts)
+        }
+
+
+class Profiler:
+    """
+    Collects reports of expansions made in current thread while profiler is
+    active. If `callback` is given, it’s invoked with every finished report
+    instead of storing it in `reports`
+    """
+    __slots__ = ('callback', 'allocations', 'reports', 'report', '_path', '_prev')
+
+    def __init__(self, callback: callable=None, allocations=False):
+        self.callback = callback
+        "Function invoked with every finished report"
+
+        self.allocations = allocations
+        "Track net amount of allocated memory blocks in every stage"
+
+        self.reports = []
+        "Finished expansion reports"
+
+        self.report = None
+        "Report of expansion in progress"
+
+        self._path = []
+        self._prev = None
+
+    def __enter__(self):
+        self._prev = get_profiler()
+        _state.profiler = self
+        return self
+
+    def __exit__(self, *args):
+        _state.profiler = self._prev
+        self._prev = None
+
+    def expand(self, abbr, abbr_type: str, fn: callable, *args):
+        """
+        Invokes `fn` with given arguments as expansion of given abbreviation and
+        records its report. Nested expansions are recorded as part of outer one
+        """
+        if self.report is not None:
+            return fn(*args)
+
+        report = self.report = ExpandReport(abbr, abbr_type)
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            report.time = perf_counter() - start
+            self.report = None
+            self._path.clear()
+            if self.callback:
+                self.callback(report)
+            else:
+                self.reports.append(report)
+
+    def measure(self, stage: str, fn: callable, *args):
+        "Invokes `fn` with given arguments and records its stats as given stage"
+        report = self.report
+        if report is None:
+            return fn(*args)
+
+        path = self._path
+        path.append(stage)
+        stats = report.stage('/'.join(path))
+        blocks = sys.getallocatedblocks() if self.allocations else 0
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            stats.time += perf_counter() - start
+            stats.calls += 1
+            if self.allocations:
+                stats.allocations += sys.getallocatedblocks() - blocks
+            path.pop()
+
+    def count(self, name: str, value: int):
+        """
+        Adds given value to `name` counter of current report. Counters of nested
+        stages are named as `stage/name`
+        """
+        report = self.report
+        if report is not None:
+            if self._path:
+                name = '/'.join(self._path + [name])
+            report.counts[name] = report.counts.get(name, 0) + value
+
+
+def get_profiler() -> Profiler:
+    "Returns profiler active in current thread, if any"
+    return getattr(_state, 'profiler', None)
+
+
+def profile(callback: callable=None, allocations=False) -> Profiler:
+    """
+    Creates profiler which should be used as context manager: expansions made
+    in current thread inside `with` block are recorded
+    """
+    return Profiler(callback, allocations)
+
+
+def count_nodes(nodes: list) -> int:
+    "Returns total amount of given abbreviation nodes and their descendants"
+    total = 0
+    for node in nodes:
+        total += 1 + count_nodes(node.children)
+    return total
@@ -0,0 +1,141 @@
+import asyncio
+from concurrent.futures import Executor
+from weakref import WeakKeyDictionary
+from functools import partial
+from . import expand, extract, Config
+from .action_utils import get_open_tag, select_item_html, select_item_css, get_css_section
+from .cache import freeze
+
+__doc__ = "Asyncio-friendly wrapper around Emmet entry points"
+
+
+class LoopState:
+    "Service data bound to a single event loop"
+    __slots__ = ('semaphore', 'inflight')
+
+    def __init__(self, max_pending: int):
+        self.semaphore = asyncio.Semaphore(max_pending)
+        "Limits amount of functions running in executor at once"
+
+        self.inflight = {}
+        "Running requests which can be shared, keyed by request key"
+
+
+class ExpandService:
+    """
+    Runs Emmet functions in executor so they don’t block asyncio event loop.
+    At most `max_pending` functions are running in executor at once, other
+    requests are waiting for a free slot. Identical requests which are in flight
+    at the same time share a single run. Each request may be limited by
+    `timeout` (in seconds): on timeout or cancellation of all its callers request
+    is cancelled, yet a function which is already running in a thread can’t be
+    interrupted and will finish in background. Service may be used from different
+    event loops: each loop has its own slots and in-flight requests
+    """
+    __slots__ = ('executor', 'max_pending', 'timeout', '_loops')
+
+    def __init__(self, executor: Executor=None, max_pending=16, timeout: float=None):
+        self.executor = executor
+        "Executor for running functions, default executor of event loop is used if not set"
+
+        self.max_pending = max_pending
+        "Maximum amount of functions running in executor at once"
+
+        self.timeout = timeout
+        "Default timeout of request, in seconds"
+
+        self._loops = WeakKeyDictionary()
+
+    async def run(self, fn: callable, *args, key=None, timeout: float=None):
+        """
+        Runs `fn(*args)` in executor and returns its result. Concurrent requests
+        with the same non-empty `key` share the same run
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        state = self.loop_state()
+        entry = state.inflight.get(key) if key is not None else None
+        if entry is None:
+            entry = [asyncio.ensure_future(self._call(state, fn, args)), 0]
+            if key is not None:
+                state.inflight[key] = entry
+                entry[0].add_done_callback(lambda t: self._release(state, key, entry))
+
+        entry[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry[0]), timeout)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not entry[0].done():
+                # No one waits for result anymore
+                entry[0].cancel()
+                self._release(state, key, entry)
+
+    async def expand(self, abbr: str, config: dict={}, global_config: dict={}, timeout: float=None) -> str:
+        "Async version of `emmet.expand()`"
+        key = request_key('expand', abbr, config, global_config)
+        return await self.run(expand, abbr, config, global_config, key=key, timeout=timeout)
+
+    async def extract(self, line: str, pos: int=None, options: dict={}, timeout: float=None):
+        "Async version of `emmet.extract()`"
+        key = request_key('extract', line, pos, options)
+        return await self.run(extract, line, pos, options, key=key, timeout=timeout)
+
+    async def get_open_tag(self, code: str, pos: int, timeout: float=None):
+        "Async version of `emmet.action_utils.get_open_tag()`"
+        return await self.run(get_open_tag, code, pos, key=('get_open_tag', code, pos), timeout=timeout)
+
+    async def get_css_section(self, code: str, pos: int, properties=False, timeout: float=None):
+        "Async version of `emmet.action_utils.get_css_section()`"
+        key = ('get_css_section', code, pos, properties)
+        return await self.run(get_css_section, code, pos, properties, key=key, timeout=timeout)
+
+    async def select_item_html(self, code: str, pos: int, is_prev=False, options: dict=None, timeout: float=None):
+        "Async version of `emmet.action_utils.select_item_html()`"
+        key = request_key('select_item_html', code, pos, is_prev, options)
+        return await self.run(select_item_html, code, pos, is_prev, options, key=key, timeout=timeout)
+
+    async def select_item_css(self, code: str, pos: int, is_prev=False, timeout: float=None):
+        "Async version of `emmet.action_utils.select_item_css()`"
+        key = ('select_item_css', code, pos, is_prev)
+        return await self.run(select_item_css, code, pos, is_prev, key=key, timeout=timeout)
+
+    def loop_state(self) -> LoopState:
+        "Returns service data for currently running event loop"
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = LoopState(self.max_pending)
+        return state
+
+    async def _call(self, state: LoopState, fn: callable, args: tuple):
+        async with state.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    def _release(self, state: LoopState, key, entry: list):
+        if key is not None and state.inflight.get(key) is entry:
+            del state.inflight[key]
+
+
+def request_key(*args):
+    "Returns key for coalescing requests with given arguments or `None` if requests can’t be coalesced"
+    if any(isinstance(arg, Config) for arg in args):
+        return None
+    try:
+        return freeze(args)
+    except TypeError:
+        return None
+
+
+default_service = None
+"Service used by `expand_async()`"
+
+
+async def expand_async(abbr: str, config: dict={}, global_config: dict={}, timeout: float=None) -> str:
+    "Expands given abbreviation in default executor without blocking event loop"
+    global default_service
+    if default_service is None:
+        default_service = ExpandService()
+    return await default_service.expand(abbr, config, global_config, timeout)
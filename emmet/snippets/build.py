@@ -0,0 +1,46 @@
+import os
+import sys
+import pickle
+from .compiled import header, file_name, markup_registries
+from . import stylesheet_snippets
+
+__doc__ = "Build step for precompiled built-in snippets, see `emmet.snippets.compiled`"
+
+
+def compile_snippets() -> dict:
+    "Compiles built-in snippet registries"
+    from ..config import get_config
+    from ..stylesheet.snippets import create_snippet, nest
+    from ..markup.snippets import parse_fingerprint
+    from ..abbreviation import parse
+
+    markup = {}
+    for syntax, registry in markup_registries:
+        config = get_config({ 'syntax': syntax })
+        fingerprint = parse_fingerprint(config)
+        for snippet in registry.values():
+            key = (snippet, fingerprint)
+            if key not in markup:
+                markup[key] = parse(snippet, config)
+
+    return {
+        'stylesheet': nest([create_snippet(k, v) for k, v in stylesheet_snippets.items()]),
+        'markup': markup
+    }
+
+
+def build(dest: str=None) -> str:
+    "Compiles built-in snippets and saves them into `dest` folder"
+    if dest is None:
+        dest = os.path.dirname(os.path.abspath(__file__))
+
+    file_path = os.path.join(dest, file_name)
+    with open(file_path, 'wb') as f:
+        f.write(header())
+        pickle.dump(compile_snippets(), f, pickle.HIGHEST_PROTOCOL)
+
+    return file_path
+
+
+if __name__ == '__main__':
+    sys.stdout.write('Compiled snippets saved to %s\n' % build(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,130 @@
+import os
+from . import markup_snippets, stylesheet_snippets, xsl_snippets, pug_snippets
+
+__doc__ = """
+Precompiled built-in snippets. At build time, stylesheet snippets are converted
+into internal representation and markup snippets are parsed into abbreviation
+trees, the result is stored next to this module. At runtime, compiled snippets
+are loaded on first use instead of compiling the same built-in snippets again
+in every process. Compiled data file starts with a plain-text header with
+format version and checksum of current snippet registries: outdated or missing
+data is ignored without unpickling it and snippets are compiled at runtime,
+as well as any user snippets. Checksum also covers source code of modules
+which produce compiled objects, so data compiled by different version of
+Emmet is ignored as well.
+
+Run `python -m emmet.snippets.build` to update compiled data in place
+"""
+
+version = 1
+"Version of compiled data format, must be increased when snippet structures change"
+
+file_name = 'compiled.pickle'
+
+markup_registries = (
+    ('html', markup_snippets),
+    ('xsl', xsl_snippets),
+    ('pug', pug_snippets)
+)
+
+not_loaded = object()
+_compiled = not_loaded
+
+
+compiler_sources = (
+    'abbreviation',
+    'css_abbreviation',
+    'config.py',
+    'markup/snippets.py',
+    'stylesheet/snippets.py',
+)
+"""
+Modules and packages of Emmet, relative to package root, which produce or
+define compiled objects: compiled data is outdated when their source changes
+"""
+
+
+def checksum() -> str:
+    """
+    Returns checksum of built-in snippet registries, compiled data format and
+    source code of modules which produce compiled objects
+    """
+    import hashlib
+    data = repr((version, stylesheet_snippets, [registry for _, registry in markup_registries]))
+    result = hashlib.sha1(data.encode('utf-8'))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for file_path in source_files(root):
+        result.update(os.path.relpath(file_path, root).replace(os.sep, '/').encode('utf-8'))
+        try:
+            with open(file_path, 'rb') as f:
+                result.update(f.read())
+        except OSError:
+            # Sources are unavailable: checksum won’t match the one of compiled
+            # data so snippets will be compiled at runtime
+            result.update(b'\0')
+
+    return result.hexdigest()
+
+
+def source_files(root: str) -> list:
+    "Returns sorted list of source files of compiler modules in `root` package folder"
+    result = []
+    for name in compiler_sources:
+        path = os.path.join(root, *name.split('/'))
+        if os.path.isdir(path):
+            for dirname, dirs, files in os.walk(path):
+                dirs[:] = [d for d in dirs if d != '__pycache__']
+                result += [os.path.join(dirname, f) for f in files if f.endswith('.py')]
+        else:
+            result.append(path)
+
+    return sorted(result)
+
+
+def header() -> bytes:
+    """
+    Returns plain-text header of compiled data file with current format version
+    and checksum. Header is compared before compiled data is unpickled
+    """
+    return ('emmet-snippets %d %s\n' % (version, checksum())).encode('ascii')
+
+
+def load(file_path: str=None) -> dict:
+    """
+    Loads compiled snippets from given file. Returns `None` if file is missing,
+    unreadable or doesn’t match current snippet registries: in this case,
+    compiled data is not unpickled at all
+    """
+    import pickle
+    if file_path is None:
+        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+
+    try:
+        with open(file_path, 'rb') as f:
+            expected = header()
+            if f.readline(len(expected) + 1) != expected:
+                return None
+            data = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    data['stylesheet_keys'] = dict((snippet.key, snippet) for snippet in data['stylesheet'])
+    return data
+
+
+def get_compiled() -> dict:
+    "Returns compiled built-in snippets, loaded on first call, or `None` if unavailable"
+    global _compiled
+    if _compiled is not_loaded:
+        _compiled = load()
+    return _compiled
+
+
+def reset(data=not_loaded):
+    "Sets compiled snippets to given data or resets them to be loaded again on next use"
+    global _compiled
+    _compiled = data
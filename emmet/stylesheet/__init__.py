@@ -2,41 +2,75 @@ import re
 from ..css_abbreviation import parse as abbreviation, tokens, CSSValue, CSSProperty, FunctionCall
 from ..config import Config
 from ..list_utils import some, get_item
-from .snippets import create_snippet, nest, CSSSnippetProperty, CSSSnippetRaw, CSSSnippetType
-from .score import calculate_score
+from ..snippets import stylesheet_snippets
+from ..snippets.compiled import get_compiled
+from .snippets import create_snippet, copy_snippet, nest, CSSSnippetProperty, CSSSnippetRaw, CSSSnippetType
+from .score import calculate_score, MatchIndex
 from .color import color
 from .format import stringify
 from .scope import CSSAbbreviationScope
+from ..profiler import get_profiler
 
 gradient_name = 'lg'
 
 
-def parse(abbr: str, config: Config):
+def parse(abbr: str, config: Config, prepared: 'MatchIndex'=None):
     """
     Parses given Emmet abbreviation into a final abbreviation tree with all
-    required transformations applied
+    required transformations applied. Pass result of `prepare()` for the same
+    config as `prepared` to skip its calculation
+    """
+    profiler = get_profiler()
+    filtered_snippets = prepare(config) if prepared is None else prepared
+
+    if isinstance(abbr, str):
+        abbr = abbreviation(abbr, { 'value': is_value_scope(config) })
+
+    if profiler is None:
+        for node in abbr:
+            resolve_node(node, filtered_snippets, config)
+    else:
+        for node in abbr:
+            profiler.measure('resolve_snippets', resolve_node, node, filtered_snippets, config)
+
+    return abbr
+
+
+def prepare(config: Config) -> 'MatchIndex':
+    """
+    Returns index of converted snippets for scope of given config. Index depends
+    on config only, so expansion of multiple abbreviations with the same config
+    may look it up once
     """
     snippets = config.cache.get('stylesheet_snippets') if config.cache is not None else None
 
     if snippets is None:
-        snippets = convert_snippets(config.snippets)
+        profiler = get_profiler()
+        if profiler is None:
+            snippets = convert_snippets(config.snippets)
+        else:
+            snippets = profiler.measure('convert_snippets', convert_snippets, config.snippets)
         if config.cache is not None:
             config.cache['stylesheet_snippets'] = snippets
 
-    if isinstance(abbr, str):
-        abbr = abbreviation(abbr, { 'value': is_value_scope(config) })
+    return get_snippets_for_scope(snippets, config)
 
-    filtered_snippets = get_snippets_for_scope(snippets, config)
 
-    for node in abbr:
-        resolve_node(node, filtered_snippets, config)
-
-    return abbr
+def convert_snippets(snippets: dict):
+    """
+    Converts given raw snippets into internal snippets representation. Built-in
+    snippets are taken from precompiled data, if available
+    """
+    compiled = get_compiled()
+    if compiled is None:
+        return nest([create_snippet(k, v) for (k, v) in snippets.items()])
 
+    if snippets == stylesheet_snippets:
+        return compiled['stylesheet'][:]
 
-def convert_snippets(snippets: dict):
-    "Converts given raw snippets into internal snippets representation"
-    result = [create_snippet(k, v) for (k, v) in snippets.items()]
+    builtin = compiled['stylesheet_keys']
+    result = [copy_snippet(builtin[k]) if k in builtin and stylesheet_snippets[k] == v else create_snippet(k, v)
+              for (k, v) in snippets.items()]
     return nest(result)
 
 
@@ -193,14 +227,19 @@ def find_best_match(abbr: str, items: list, min_score=0, partial_match=False):
     """
     Finds best matching item from `items` array
     :param abbr  Abbreviation to match
-    :param items List of items for match
+    :param items List of items for match or `MatchIndex` of items
     :param minScore The minimum score the best matched item should have to be a valid match.
     """
     max_score = 0
     matched_item = None
 
-    for item in items:
-        score = calculate_score(abbr, get_scoring_part(item), partial_match)
+    if isinstance(items, MatchIndex):
+        candidates = items.candidates(abbr, partial_match)
+    else:
+        candidates = [(item, get_scoring_part(item)) for item in items]
+
+    for item, key in candidates:
+        score = calculate_score(abbr, key, partial_match)
 
         if score == 1:
             # direct hit, no need to look further
@@ -239,12 +278,12 @@ def resolve_keyword(kw: str, config: Config, snippet: CSSSnippetProperty=None, m
     if possible
     """
     if snippet:
-        ref = find_best_match(kw, snippet.keywords.keys(), min_score)
+        ref = find_best_match(kw, snippet.get_keyword_index(), min_score)
         if ref:
             return snippet.keywords[ref]
 
         for dep in snippet.dependencies:
-            ref = find_best_match(kw, dep.keywords.keys(), min_score)
+            ref = find_best_match(kw, dep.get_keyword_index(), min_score)
             if ref:
                 return dep.keywords[ref]
 
@@ -329,15 +368,34 @@ def is_value_scope(config: Config):
     return False
 
 
-def get_snippets_for_scope(snippets: list, config: Config):
-    "Returns snippets for given scope"
+def get_snippets_for_scope(snippets: list, config: Config) -> MatchIndex:
+    "Returns index of snippets for given scope"
+    scope = None
+    if config.context and config.context['name'] in (CSSAbbreviationScope.Section, CSSAbbreviationScope.Property):
+        scope = config.context['name']
 
-    if config.context:
-        if config.context['name'] == CSSAbbreviationScope.Section:
-            return [s for s in snippets if s.type == CSSSnippetType.Raw]
+    cache_key = 'stylesheet_index:%s' % scope
+    index = config.cache.get(cache_key) if config.cache is not None else None
+    if index is not None and index.source is snippets:
+        return index
+
+    if scope == CSSAbbreviationScope.Section:
+        index = SnippetIndex(snippets, [s for s in snippets if s.type == CSSSnippetType.Raw])
+    elif scope == CSSAbbreviationScope.Property:
+        index = SnippetIndex(snippets, [s for s in snippets if s.type == CSSSnippetType.Property])
+    else:
+        index = SnippetIndex(snippets, snippets)
+
+    if config.cache is not None:
+        config.cache[cache_key] = index
+
+    return index
 
 
-        if config.context['name'] == CSSAbbreviationScope.Property:
-            return [s for s in snippets if s.type == CSSSnippetType.Property]
+class SnippetIndex(MatchIndex):
+    "Match index of CSS snippets, created from `source` list of converted snippets"
+    __slots__ = ('source',)
 
-    return snippets
+    def __init__(self, source: list, items: list):
+        super(SnippetIndex, self).__init__(items, get_scoring_part)
+        self.source = source
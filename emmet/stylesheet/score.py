@@ -77,3 +77,39 @@ def calculate_score(str1: str, str2: str, partial_match=False):
 def n_sum(n: int):
     "Calculates sum of first `n` numbers, e.g. 1+2+3+...n"
     return n * (n + 1) / 2
+
+
+class MatchIndex:
+    """
+    Index of items for fuzzy matching with `calculate_score()`. Since the first
+    characters of abbreviation and item must match, items are grouped by first
+    character of their lower-cased key so only items that could possibly match
+    given abbreviation are scored. Original item order is preserved in each group.
+    Matching is still linear in group size: with partial match, any item of group
+    may get the best score, so groups can’t be narrowed further by longer prefix
+    """
+    __slots__ = ('items', 'groups')
+
+    def __init__(self, items: list, key: callable=None):
+        self.items = list(items)
+        self.groups = {}
+
+        for item in self.items:
+            k = key(item) if key else item
+            self.groups.setdefault(k.lower()[0:1], []).append((item, k))
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def candidates(self, abbr: str, partial_match=False):
+        "Returns list of `(item, key)` pairs which could possibly match given abbreviation"
+        group = self.groups.get(abbr.lower()[0:1], [])
+        if partial_match:
+            return group
+
+        # Without partial match, abbreviation can’t be longer than matched key
+        abbr_len = len(abbr)
+        return [pair for pair in group if len(pair[1]) >= abbr_len]
@@ -1,6 +1,7 @@
 import re
 import collections
 from ..css_abbreviation import parse, tokens, CSSValue, FunctionCall
+from .score import MatchIndex
 
 
 re_property = re.compile(r'^([a-z-]+)(?:\s*:\s*([^\n\r;]+?);*)?$')
@@ -22,7 +23,7 @@ class CSSSnippetRaw:
 
 
 class CSSSnippetProperty:
-    __slots__ = ('type', 'key', 'value', 'property', 'keywords', 'dependencies')
+    __slots__ = ('type', 'key', 'value', 'property', 'keywords', 'dependencies', 'keyword_index')
 
     def __init__(self, key: str, prop: str, value: list, keywords: dict):
         self.type = CSSSnippetType.Property
@@ -31,6 +32,13 @@ class CSSSnippetProperty:
         self.value = value
         self.keywords = keywords
         self.dependencies = []
+        self.keyword_index = None
+
+    def get_keyword_index(self):
+        "Returns match index of snippet keywords"
+        if self.keyword_index is None:
+            self.keyword_index = MatchIndex(self.keywords.keys())
+        return self.keyword_index
 
 
 def create_snippet(key: str, value: str):
@@ -52,6 +60,16 @@ def create_snippet(key: str, value: str):
     return CSSSnippetRaw(key, value)
 
 
+def copy_snippet(snippet):
+    """
+    Returns copy of given converted snippet which can be nested again.
+    Parsed snippet value is shared with original snippet
+    """
+    if isinstance(snippet, CSSSnippetProperty):
+        return CSSSnippetProperty(snippet.key, snippet.property, snippet.value, snippet.keywords)
+    return snippet
+
+
 def nest(snippets: list):
     """
     Nests more specific CSS properties into shorthand ones, e.g.
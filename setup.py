@@ -1,4 +1,17 @@
+import os
+import sys
 import setuptools
+from setuptools.command.build_py import build_py
+
+
+class BuildPy(build_py):
+    "Builds package with precompiled built-in snippets"
+    def run(self):
+        super().run()
+        if not self.dry_run:
+            self.spawn([sys.executable, '-m', 'emmet.snippets.build',
+                        os.path.join(self.build_lib, 'emmet', 'snippets')])
+
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
@@ -14,6 +27,7 @@ setuptools.setup(
     url="https://github.com/emmetio/py-emmet",
     include_package_data=True,
     packages=setuptools.find_packages(exclude=('tests', 'tests.*',)),
+    cmdclass={'build_py': BuildPy},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -1,9 +1,13 @@
 import unittest
+import random
 import sys
 
 sys.path.append('../')
 
+from emmet import expand
 from emmet.abbreviation.tokenizer import tokenize
+from emmet.abbreviation.tokenizer.fast import tokenize as fast_tokenize
+from emmet.scanner import ScannerException
 
 def json_tokens(abbr: str):
     return [token.to_json() for token in tokenize(abbr)]
@@ -78,3 +82,34 @@ class TestScanner(unittest.TestCase):
             { 'type': 'Bracket', 'open': False, 'context': 'group', 'start': 6, 'end': 7 },
             { 'type': 'Repeater', 'count': 3, 'value': 0, 'implicit': False, 'start': 7, 'end': 9 }
         ])
+
+
+def safe_json_tokens(tokenizer: callable, abbr: str):
+    try:
+        return [token.to_json() for token in tokenizer(abbr)]
+    except ScannerException as err:
+        return (err.message, err.pos)
+
+
+class TestFastTokenizer(unittest.TestCase):
+    def test_parity(self):
+        abbrs = [
+            'ul>li', 'ul[title="foo+bar\'str\'" (attr)=bar]{(some > text)}',
+            'h${some${1:field placeholder}}', 'a{[}+a{}', '#sample*3', 'div[foo*3]',
+            '({a*2})*3', 'div.col-1/2.w-3/4>p', 'a\\.b\\>c', 'span{{foo}}+b{a{b$c}}',
+            'ul>li.item$@-3*5>a[href="#${1:url}" data-x=\'y\']{Item $@^$$}',
+            'Foo.Bar>x:y!', 'div{ text with  spaces }  +  p', '(a>b)^c^^d', 'p>{\u00a0\xa0}',
+            'div{', 'a[', 'a"b', '}{a}$}b'
+        ]
+
+        # Random abbreviations, including malformed ones
+        rnd = random.Random(1)
+        chars = 'ab1/2$#@^-*{}[]()"\'=.+>:! \\\t_Z'
+        abbrs += [''.join(rnd.choice(chars) for _ in range(rnd.randint(1, 16))) for _ in range(3000)]
+
+        for abbr in abbrs:
+            self.assertEqual(safe_json_tokens(fast_tokenize, abbr), safe_json_tokens(tokenize, abbr), abbr)
+
+    def test_select(self):
+        abbr = 'ul>li.item$*2>a[href="#"]{Item $}'
+        self.assertEqual(expand(abbr, { 'options': { 'markup.tokenizer': 'fast' } }), expand(abbr))
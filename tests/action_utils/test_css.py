@@ -4,7 +4,7 @@ import os.path
 
 sys.path.append('../../')
 
-from emmet.action_utils import select_item_css, get_css_section, CSSProperty
+from emmet.action_utils import select_item_css, get_css_section, get_css_sections, CSSProperty
 
 
 def read_file(file: str):
@@ -144,3 +144,13 @@ class TestCSSActionUtils(unittest.TestCase):
         self.assertEqual(value('before', prop[1]), '\n    ')
         self.assertEqual(value('after', prop[1]), ';')
 
+    def test_css_sections(self):
+        positions = list(range(len(sample) + 1))
+        sections = get_css_sections(sample, positions, True)
+        self.assertEqual([s and s.to_json() for s in sections],
+            [s and s.to_json() for s in (get_css_section(sample, pos, True) for pos in positions)])
+
+        # Locations inside the same section share parsed section
+        sections = get_css_sections(sample, [450, 207, 449], True)
+        self.assertIs(sections[0], sections[2])
+        self.assertEqual(len(sections[1].properties), 3)
@@ -5,6 +5,8 @@ import os.path
 sys.path.append('../../')
 
 from emmet.action_utils import select_item_html, get_open_tag
+from emmet.action_utils.html import shift_attribute_ranges
+from emmet.html_matcher import attributes
 
 
 def read_file(file: str):
@@ -110,3 +112,10 @@ class TestHTMLActionUtils(unittest.TestCase):
         })
 
         self.assertEqual(get_open_tag(sample, 74), None)
+
+    def test_shift_attribute_ranges(self):
+        code = '<div><a href="/" title=x disabled/></div>'
+        attrs = shift_attribute_ranges(attributes(code[5:35], 'a'), 5)
+        self.assertEqual([attr.to_json() for attr in attrs], [attr.to_json() for attr in attributes(code, 'a', 5, 35)])
+        self.assertEqual([attr.name for attr in attrs], ['href', 'title', 'disabled'])
+        self.assertEqual((attrs[0].value, attrs[0].value_start), ('"/"', 13))
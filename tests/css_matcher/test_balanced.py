@@ -39,6 +39,14 @@ class TestCSSBalancedModels(unittest.TestCase):
             (0, 283)
         ])
 
+        # Sections after the first top-level one
+        self.assertEqual(outward(code + 'a { b { c: d; } }', 346), [
+            (348, 349),
+            (345, 350),
+            (341, 352),
+            (337, 354)
+        ])
+
     def test_inward(self):
         self.assertEqual(inward(code, 62), [
             (61, 198),
@@ -0,0 +1,100 @@
+import unittest
+import random
+import sys
+import os.path
+
+sys.path.append('../../')
+
+from emmet.css_matcher import CSSIndex, match, balanced_inward, balanced_outward, scan
+from emmet.css_matcher.index import token_types
+from emmet.action_utils import get_css_section
+
+def read_file(file: str):
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirname, file), 'r') as f:
+        return f.read(None)
+
+def to_json(item):
+    return item and item.to_json()
+
+def tokens(source: str):
+    result = []
+    scan(source, lambda *args: result.append(args))
+    return result
+
+fragments = [
+    'a', ' ', 'b:hover', '{', '}', ';', 'color', ':', 'red', '(', ')', '/*', '*/',
+    '"x;}"', '\'', '\n', '$v', '@media (min-width: 1px)', 'url(x.png)', '::before'
+]
+
+
+class TestCSSIndex(unittest.TestCase):
+    def assertQueries(self, index: CSSIndex):
+        source = index.source
+        for pos in range(len(source) + 1):
+            self.assertEqual(to_json(index.match(pos)), to_json(match(source, pos)))
+            self.assertEqual(index.balanced_outward(pos), balanced_outward(source, pos))
+            self.assertEqual(index.balanced_inward(pos), balanced_inward(source, pos))
+            self.assertEqual(to_json(get_css_section(source, pos, True, index)),
+                to_json(get_css_section(source, pos, True)))
+
+    def assertTokens(self, index: CSSIndex):
+        indexed = list(zip([token_types[t] for t in index.types], index.starts, index.ends, index.delimiters))
+        self.assertEqual(indexed, tokens(index.source))
+
+    def test_queries(self):
+        code = read_file('sample.scss')
+        index = CSSIndex(code + 'a { b { c: d; } }')
+        self.assertEqual(len(index), 34)
+        self.assertEqual(index.balanced_outward(346), [
+            (348, 349),
+            (345, 350),
+            (341, 352),
+            (337, 354)
+        ])
+        self.assertQueries(index)
+
+    def test_edit(self):
+        code = read_file('sample.scss')
+        index = CSSIndex(code)
+
+        index.edit(66, 0, 'color: red; ')
+        self.assertEqual(to_json(index.match(69)), {
+            'type': 'property',
+            'start': 66,
+            'end': 77,
+            'body_start': 73,
+            'body_end': 76
+        })
+
+        index.edit(0, 0, '/* ')
+        self.assertEqual(len(index), 0)
+        index.edit(0, 3)
+        self.assertTokens(index)
+        self.assertQueries(index)
+
+        with self.assertRaises(ValueError):
+            index.edit(-1, 0, 'a')
+
+    def test_random_edits(self):
+        rnd = random.Random(42)
+        for _ in range(50):
+            source = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 30)))
+            index = CSSIndex(source)
+            for _ in range(5):
+                offset = rnd.randint(0, len(source))
+                length = rnd.randint(0, min(10, len(source) - offset))
+                text = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 3)))
+                index.edit(offset, length, text)
+                source = source[:offset] + text + source[offset + length:]
+
+                # Incrementally updated index must be the same as a fresh one
+                self.assertEqual(index.source, source)
+                self.assertTokens(index)
+                self.assertEqual(index.depths, CSSIndex(source).depths)
+
+            self.assertQueries(index)
+
+
+if __name__ == '__main__':
+    unittest.main()
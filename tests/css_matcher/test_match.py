@@ -4,7 +4,7 @@ import os.path
 
 sys.path.append('../../')
 
-from emmet.css_matcher import match
+from emmet.css_matcher import match, match_many
 
 def read_file(file: str):
     dirname = os.path.dirname(os.path.abspath(__file__))
@@ -39,3 +39,10 @@ class TestCSSMatch(unittest.TestCase):
             'body_start': 145,
             'body_end': 149
         })
+
+    def test_match_many(self):
+        positions = list(range(len(code) + 1))
+        result = match_many(code, positions)
+        self.assertEqual([m and m.to_json() for m in result],
+            [m and m.to_json() for m in (match(code, pos) for pos in positions)])
+        self.assertEqual(match_many(code, [140, 63, 140])[0].to_json(), match(code, 140).to_json())
@@ -1,15 +1,28 @@
 import unittest
+import random
 import sys
+import os.path
 
 sys.path.append('../../')
 
 from emmet.css_matcher import scan
+from emmet.css_matcher.scan import scan_chars
 
-def tokens(source: str):
+def read_file(file: str):
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirname, file), 'r') as f:
+        return f.read(None)
+
+def tokens(source: str, scanner=scan):
     result = []
-    scan(source, lambda token_type, start, end, delimiter: result.append([source[start:end], token_type, start, end, delimiter]))
+    scanner(source, lambda token_type, start, end, delimiter: result.append([source[start:end], token_type, start, end, delimiter]))
     return result
 
+fragments = [
+    'a', 'b.c', ' ', '\n', '{', '}', ';', ':', '::', '(', ')', '"', '\'', '\\',
+    '/*', '*/', '/', '*', '@media', 'url(x;y)', '"a}b"', '$v: 1px', '\u00a0'
+]
+
 
 class TestCSSScanner(unittest.TestCase):
     def test_selectors(self):
@@ -109,3 +122,13 @@ class TestCSSScanner(unittest.TestCase):
             ['}', 'blockEnd', 17, 18, 17],
             ['}', 'blockEnd', 19, 20, 19]
         ])
+
+    def test_scan_chars(self):
+        # Fast scanner must produce the same result as character scanner
+        doc = read_file('sample.scss')
+        self.assertEqual(tokens(doc), tokens(doc, scan_chars))
+
+        rnd = random.Random(42)
+        for _ in range(500):
+            code = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 30)))
+            self.assertEqual(tokens(code), tokens(code, scan_chars))
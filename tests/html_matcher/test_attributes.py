@@ -41,3 +41,45 @@ class TestHTMLMatcherAttributes(unittest.TestCase):
                 'value_end': 32
             }
         ])
+
+    def test_parse_source_range(self):
+        # Attributes are parsed right from source, ranges point to source
+        source = '<div><a href="/" title=x/><br/></div>'
+        attrs = attributes(source, 'a', 5, 26)
+        self.assertEqual([attr.to_json() for attr in attrs], [
+            {
+                'name': 'href',
+                'value': '"/"',
+                'name_start': 8,
+                'name_end': 12,
+                'value_start': 13,
+                'value_end': 16
+            },
+            {
+                'name': 'title',
+                'value': 'x',
+                'name_start': 17,
+                'name_end': 22,
+                'value_start': 23,
+                'value_end': 24
+            }
+        ])
+        self.assertEqual(json_attrs(source[5:26], 'a')[0]['name_start'], 3)
+        self.assertEqual(attributes(source, 'br', 26, 31), [])
+
+        # Strings are extracted on first access
+        attr = attributes(source, None, 7, 16)[0]
+        self.assertIs(attr.source, source)
+        self.assertEqual(attr.name, 'href')
+        self.assertIs(attr.source, source)
+        self.assertEqual(attr.value, '"/"')
+        # Source is released when all strings are extracted
+        self.assertIsNone(attr.source)
+
+        # Explicitly unset value is not extracted again
+        attr = attributes(source, None, 7, 16)[0]
+        attr.value = None
+        self.assertIsNone(attr.value)
+        self.assertEqual(attr.name, 'href')
+        self.assertIsNone(attr.source)
+        self.assertEqual(attr.to_json(), { 'name': 'href', 'name_start': 8, 'name_end': 12 })
@@ -4,7 +4,7 @@ import os.path
 
 sys.path.append('../../')
 
-from emmet.html_matcher import balanced_inward, balanced_outward
+from emmet.html_matcher import balanced_inward, balanced_outward, balanced_inward_many, balanced_outward_many
 
 def inward(src: str, pos: int):
     return [tag.to_json() for tag in balanced_inward(src, pos)]
@@ -64,3 +64,16 @@ class TestHTMLBalancedModels(unittest.TestCase):
         self.assertEqual(inward(doc, 114), [
             { 'name': 'br', 'open': [112, 118] }
         ])
+
+    def test_many(self):
+        doc = read_file('sample.html')
+        positions = list(range(len(doc) + 1))
+        positions.reverse()
+
+        result = balanced_outward_many(doc, positions)
+        self.assertEqual([[tag.to_json() for tag in model] for model in result],
+            [outward(doc, pos) for pos in positions])
+
+        result = balanced_inward_many(doc, positions)
+        self.assertEqual([[tag.to_json() for tag in model] for model in result],
+            [inward(doc, pos) for pos in positions])
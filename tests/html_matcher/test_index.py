@@ -0,0 +1,98 @@
+import unittest
+import random
+import sys
+import os.path
+
+sys.path.append('../../')
+
+from emmet.html_matcher import TagIndex, match, balanced_inward, balanced_outward
+
+def read_file(file: str):
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirname, file), 'r') as f:
+        return f.read(None)
+
+def tag_json(tag):
+    if tag:
+        return {
+            'name': tag.name,
+            'attributes': [attr.to_json() for attr in tag.attributes],
+            'open': tag.open,
+            'close': tag.close
+        }
+
+fragments = [
+    '<div>', '</div>', '<p class="a">', '</p>', '<br>', '<img src="x" />',
+    'text ', '<!-- c -->', '<!--', '-->', '<script>', 'if (a<b) {}', '</script>',
+    '<![CDATA[ x ]]>', '<?pi "?" ?>', '<a [x]=', '"', '\'', ']', '>', '<', '/'
+]
+
+
+class TestTagIndex(unittest.TestCase):
+    def assertQueries(self, index: TagIndex, opt: dict=None):
+        source = index.source
+        for pos in range(len(source) + 1):
+            self.assertEqual(tag_json(index.match(pos)), tag_json(match(source, pos, opt)))
+            self.assertEqual([tag.to_json() for tag in index.balanced_outward(pos)],
+                [tag.to_json() for tag in balanced_outward(source, pos, opt)])
+            self.assertEqual([tag.to_json() for tag in index.balanced_inward(pos)],
+                [tag.to_json() for tag in balanced_inward(source, pos, opt)])
+
+    def test_queries(self):
+        doc = read_file('sample.html')
+        index = TagIndex(doc)
+        self.assertEqual(len(index), 24)
+        self.assertQueries(index)
+
+        index = TagIndex(doc, { 'xml': True })
+        self.assertQueries(index, { 'xml': True })
+
+    def test_edit(self):
+        doc = read_file('sample.html')
+        index = TagIndex(doc)
+
+        index.edit(1, 2, 'ol')
+        index.edit(181, 2, 'ol')
+        self.assertEqual(index.source, doc.replace('ul>', 'ol>'))
+        self.assertEqual(tag_json(index.match(114)), {
+            'name': 'br',
+            'attributes': [],
+            'open': (112, 118),
+            'close': None
+        })
+        self.assertEqual([tag.name for tag in index.balanced_outward(114)], ['br', 'div', 'li', 'ol'])
+
+        index.edit(0, 0, '<!-- ')
+        self.assertEqual(index.balanced_outward(119), [])
+        index.edit(0, 5)
+        self.assertEqual(index.source, doc.replace('ul>', 'ol>'))
+        self.assertQueries(index)
+
+        with self.assertRaises(ValueError):
+            index.edit(len(doc), 1)
+
+    def test_random_edits(self):
+        rnd = random.Random(42)
+        for _ in range(50):
+            opt = rnd.choice([None, { 'xml': True }])
+            source = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 20)))
+            index = TagIndex(source, opt)
+            for _ in range(5):
+                offset = rnd.randint(0, len(source))
+                length = rnd.randint(0, min(10, len(source) - offset))
+                text = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 2)))
+                index.edit(offset, length, text)
+                source = source[:offset] + text + source[offset + length:]
+
+                # Incrementally updated index must be the same as a fresh one
+                fresh = TagIndex(source, opt)
+                self.assertEqual(index.names, fresh.names)
+                self.assertEqual(index.types, fresh.types)
+                self.assertEqual(index.starts, fresh.starts)
+                self.assertEqual(index.ends, fresh.ends)
+
+            self.assertQueries(index, opt)
+
+
+if __name__ == '__main__':
+    unittest.main()
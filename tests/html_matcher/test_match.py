@@ -3,7 +3,7 @@ import sys
 
 sys.path.append('../../')
 
-from emmet.html_matcher import match
+from emmet.html_matcher import match, match_many
 
 html = """<ul>
     <li><a href="">text <img src="foo.png"><link rel="sample"> <b></b></a></li>
@@ -86,3 +86,15 @@ class TestHTMLMatch(unittest.TestCase):
         }])
         self.assertEqual(tag.open, (69, 90))
         self.assertEqual(tag.close, None)
+
+    def test_match_many(self):
+        positions = list(range(len(html) + 1)) + [12, 0]
+        tags = match_many(html, positions)
+        self.assertEqual(len(tags), len(positions))
+        for pos, tag in zip(positions, tags):
+            expected = match(html, pos)
+            self.assertEqual(tag and (tag.name, attrs(tag), tag.open, tag.close),
+                expected and (expected.name, attrs(expected), expected.open, expected.close))
+
+        self.assertEqual(match_many(xml, [70], { 'xml': True })[0].open, (69, 90))
+        self.assertEqual(match_many(html, []), [])
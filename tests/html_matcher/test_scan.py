@@ -1,18 +1,26 @@
 import unittest
+import random
 import sys
 
 sys.path.append('../../')
 
 from emmet.html_matcher import scan, ElementType, ScannerOptions
+from emmet.html_matcher.scan import scan_chars
 
-def get_tags(code: str, opt={}):
+def get_tags(code: str, opt={}, scanner=scan):
     tags = []
     options = ScannerOptions(opt)
     def scan_callback(name: str, elem_type: ElementType, start: int, end: int):
         tags.append([name, elem_type, start, end])
-    scan(code, scan_callback, options.special)
+    scanner(code, scan_callback, options.special)
     return tags
 
+fragments = [
+    '<div>', '</div>', '<p class="a">', '<br/>', 'text', '<!--', '-->', '<![CDATA[',
+    ']]>', '<?pi "?>" ?>', '<?', '?>', '<script>', '<script type="x">', '</script>',
+    '<a [x]={y}>', '"', '\'', '\\', '<', '</', '>', '/', ' ', '\n', '<é·a>', '<1>'
+]
+
 
 class TestHTMLMatchScan(unittest.TestCase):
     def test_open_tag(self):
@@ -84,3 +92,16 @@ class TestHTMLMatchScan(unittest.TestCase):
         self.assertEqual(get_tags('<a><!-- <foo /><bar><b>'), [
             ['a', ElementType.Open, 0, 3],
         ])
+
+    def test_processing_instructions(self):
+        self.assertEqual(get_tags('<a><?php echo "?><b>" ?><c>'), [
+            ['a', ElementType.Open, 0, 3],
+            ['c', ElementType.Open, 24, 27]
+        ])
+
+    def test_scan_chars(self):
+        # Fast scanner must produce the same result as character scanner
+        rnd = random.Random(42)
+        for _ in range(500):
+            code = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 30)))
+            self.assertEqual(get_tags(code), get_tags(code, scanner=scan_chars))
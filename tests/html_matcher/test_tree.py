@@ -0,0 +1,54 @@
+import unittest
+import random
+import sys
+import os.path
+
+sys.path.append('../../')
+
+from emmet.html_matcher import TagTree, balanced_outward
+
+def read_file(file: str):
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(dirname, file), 'r') as f:
+        return f.read(None)
+
+def outward(tags: list):
+    return [tag.to_json() for tag in tags]
+
+fragments = [
+    '<div>', '</div>', '<p class="a">', '</p>', '<br>', '<img src="x" />',
+    'text ', '<!-- c -->', '<script>', 'if (a<b) {}', '</script>', '</br>'
+]
+
+
+class TestTagTree(unittest.TestCase):
+    def test_tree(self):
+        doc = read_file('sample.html')
+        tree = TagTree(doc)
+
+        self.assertEqual([tree.name(ix) for ix in tree.children()], ['ul'])
+        self.assertEqual([tree.name(ix) for ix in tree.children(0)], ['li', 'li', 'li', 'li'])
+        self.assertEqual(tree.open(0), (0, 4))
+        self.assertEqual(tree.close(0), (179, 184))
+
+        ix = tree.innermost(114)
+        self.assertEqual(tree.name(ix), 'br')
+        self.assertEqual(tree.close(ix), None)
+        self.assertEqual([tree.name(p) for p in tree.ancestors(ix)], ['div', 'li', 'ul'])
+        self.assertEqual(len(set(tree.names)), len(tree.names))
+
+        for pos in range(len(doc) + 1):
+            self.assertEqual(outward(tree.balanced_outward(pos)), outward(balanced_outward(doc, pos)))
+
+    def test_random(self):
+        rnd = random.Random(42)
+        for _ in range(100):
+            opt = rnd.choice([None, { 'xml': True }])
+            source = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(0, 20)))
+            tree = TagTree(source, opt)
+            for pos in range(len(source) + 1):
+                self.assertEqual(outward(tree.balanced_outward(pos)), outward(balanced_outward(source, pos, opt)))
+
+
+if __name__ == '__main__':
+    unittest.main()
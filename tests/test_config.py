@@ -0,0 +1,168 @@
+import unittest
+import sys
+
+sys.path.append('../')
+
+from emmet import expand, expand_many, get_config, profile, Config, ResultCache
+from emmet.config import config_cache, clear_config_cache
+
+
+class TestConfigFactory(unittest.TestCase):
+    def setUp(self):
+        clear_config_cache()
+
+    def test_shared_data(self):
+        a = get_config({ 'syntax': 'jsx', 'options': { 'output.indent': '  ' } })
+        b = get_config({ 'syntax': 'jsx', 'options': { 'output.indent': '  ' }, 'text': 'foo' })
+        c = get_config({ 'syntax': 'jsx', 'options': { 'output.indent': '    ' } })
+
+        self.assertIsNot(a, b)
+        self.assertIs(a.options, b.options)
+        self.assertIs(a.snippets, b.snippets)
+        self.assertIs(a.cache, b.cache)
+        self.assertIsNot(a.options, c.options)
+        self.assertEqual(b.get('text'), 'foo')
+        self.assertEqual(a.get('text'), None)
+        self.assertEqual(a.options.get('output.indent'), '  ')
+        self.assertTrue(a.options.get('jsx.enabled'))
+
+        # Global config is a part of key
+        d = get_config({ 'syntax': 'jsx' }, { 'markup': { 'options': { 'output.indent': '  ' } } })
+        self.assertEqual(d.options.get('output.indent'), '  ')
+        self.assertIsNot(d.options, get_config({ 'syntax': 'jsx' }).options)
+
+    def test_read_only(self):
+        config = get_config({ 'type': 'stylesheet' })
+        with self.assertRaises(TypeError):
+            config.options['output.indent'] = '  '
+
+    def test_context(self):
+        a = get_config({ 'type': 'stylesheet', 'context': { 'name': 'padding' } })
+        b = get_config({ 'type': 'stylesheet' })
+        self.assertIs(a.snippets, b.snippets)
+        self.assertEqual(a.context, { 'name': 'padding' })
+        self.assertEqual(b.context, None)
+
+    def test_eviction(self):
+        max_size = config_cache.max_size
+        config_cache.max_size = 2
+        try:
+            a = get_config({ 'syntax': 'html' })
+            get_config({ 'syntax': 'xml' })
+            get_config({ 'syntax': 'html' })
+            get_config({ 'syntax': 'pug' })
+            self.assertEqual(len(config_cache), 2)
+            self.assertIs(get_config({ 'syntax': 'html' }).options, a.options)
+            self.assertIsNot(get_config({ 'syntax': 'xml' }).options, a.options)
+        finally:
+            config_cache.max_size = max_size
+
+    def test_unhashable(self):
+        # Config with unhashable data still works, but is not shared
+        config = { 'options': { 'markup.attributes': { 'class': bytearray(b'foo') } } }
+        self.assertIsNot(get_config(config).options, get_config(config).options)
+
+    def test_expand(self):
+        self.assertEqual(expand('ul>.item$*', { 'text': ['foo', 'bar'] }), '<ul>\n\t<li class="item1">foo</li>\n\t<li class="item2">bar</li>\n</ul>')
+        self.assertEqual(expand('ul>.item$*2'), '<ul>\n\t<li class="item1"></li>\n\t<li class="item2"></li>\n</ul>')
+        self.assertEqual(expand('p10', { 'type': 'stylesheet' }), 'padding: 10px;')
+        self.assertEqual(expand('p10', { 'type': 'stylesheet' }), 'padding: 10px;')
+        self.assertEqual(expand('s', { 'type': 'stylesheet', 'context': { 'name': 'align-content' } }), 'start')
+        self.assertEqual(expand('a', { 'type': 'stylesheet', 'context': { 'name': 'align-content' } }), 'auto')
+        self.assertEqual(expand('a', { 'type': 'stylesheet' }), 'align-self: start;')
+
+    def test_expand_many(self):
+        abbrs = ['ul>.item$*', 'a', '!', 'img']
+        self.assertEqual(expand_many(abbrs, { 'text': ['foo', 'bar'] }), [expand(abbr, { 'text': ['foo', 'bar'] }) for abbr in abbrs])
+
+        abbrs = ['p10', 'm10-20', 'bd1-s', 'dib', 'poa']
+        self.assertEqual(expand_many(abbrs, { 'syntax': 'stylus' }), [expand(abbr, { 'syntax': 'stylus' }) for abbr in abbrs])
+
+        # Config without cache
+        config = Config({ 'type': 'stylesheet' })
+        self.assertEqual(expand_many(abbrs, config), [expand(abbr, config) for abbr in abbrs])
+        self.assertEqual(config.cache, None)
+
+        abbrs = ['p>lorem4', 'ul>li*2>lorem2', 'lorem10']
+        config = { 'options': { 'lorem.seed': 1 } }
+        self.assertEqual(expand_many(abbrs, config), [expand(abbr, config) for abbr in abbrs])
+
+        abbrs = ['bd', 'p', 'fz']
+        config = { 'type': 'stylesheet', 'context': { 'name': '@@property' } }
+        self.assertEqual(expand_many(abbrs, config), [expand(abbr, config) for abbr in abbrs])
+
+        with profile() as profiler:
+            expand_many(['a', 'b'])
+        self.assertEqual([r.abbreviation for r in profiler.reports], ['a', 'b'])
+
+
+class TestResultCache(unittest.TestCase):
+    def test_cache(self):
+        cache = ResultCache()
+        self.assertEqual(expand('ul>li*2', result_cache=cache), '<ul>\n\t<li></li>\n\t<li></li>\n</ul>')
+        self.assertEqual(expand('ul>li*2', result_cache=cache), '<ul>\n\t<li></li>\n\t<li></li>\n</ul>')
+        self.assertEqual(expand('m10', { 'type': 'stylesheet' }, result_cache=cache), 'margin: 10px;')
+        self.assertEqual(expand('m10', { 'type': 'stylesheet' }, result_cache=cache), 'margin: 10px;')
+        self.assertEqual(expand('m10', result_cache=cache), '<m10></m10>')
+        self.assertEqual(expand('p', { 'syntax': 'css' }, { 'stylesheet': { 'options': { 'stylesheet.between': ':' } } }, result_cache=cache), '<p></p>')
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['size'], 4)
+
+    def test_bypass(self):
+        cache = ResultCache()
+        field = lambda index, placeholder, **kwargs: '${%d}' % index
+
+        expand('lorem2', result_cache=cache)
+        expand('p>Lorem', result_cache=cache)
+        expand('foo', { 'snippets': { 'foo': 'p>lorem' } }, result_cache=cache)
+        expand('a', { 'options': { 'output.field': field } }, result_cache=cache)
+        self.assertEqual(cache.stats()['bypasses'], 4)
+        self.assertEqual(len(cache), 0)
+
+        # Resolved config
+        self.assertEqual(expand('a', Config(), result_cache=cache), '<a href=""></a>')
+        self.assertEqual(cache.stats()['bypasses'], 5)
+        self.assertEqual(len(cache), 0)
+
+        # Known pure callback
+        cache = ResultCache(pure=[field])
+        expand('a', { 'options': { 'output.field': field } }, result_cache=cache)
+        self.assertEqual(expand('a', { 'options': { 'output.field': field } }, result_cache=cache), '<a href="${1}">${2}</a>')
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        # Seeded lorem ipsum
+        cache = ResultCache()
+        seeded = { 'options': { 'lorem.seed': 1 } }
+        output = expand('p>lorem4', seeded, result_cache=cache)
+        self.assertEqual(expand('p>lorem4', seeded, result_cache=cache), output)
+        self.assertEqual(expand('p>lorem4', {}, { 'html': seeded }, result_cache=cache), output)
+        expand('p>lorem4', {}, { 'css': seeded }, result_cache=cache)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['bypasses']), (1, 1))
+
+    def test_limits(self):
+        cache = ResultCache(max_size=2)
+        for abbr in ('a', 'b', 'a', 'c'):
+            expand(abbr, result_cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(cache.key('b', {}, {})), None)
+        self.assertEqual(cache.get(cache.key('a', {}, {})), '<a href=""></a>')
+
+        cache = ResultCache(max_memory=200)
+        expand('ul>li*20', result_cache=cache)
+        self.assertEqual(len(cache), 0)
+        expand('a', result_cache=cache)
+        expand('b', result_cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.memory, 200)
+
+        cache = ResultCache(ttl=0)
+        expand('a', result_cache=cache)
+        expand('a', result_cache=cache)
+        self.assertEqual(cache.stats()['hits'], 0)
+        self.assertEqual(len(cache), 1)
+
+if __name__ == '__main__':
+    unittest.main()
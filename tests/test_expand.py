@@ -1,8 +1,11 @@
 import unittest
+import subprocess
 import sys
+import os
 
 sys.path.append('../')
 
+import emmet
 from emmet import expand
 
 def field(index: int, placeholder: str, **kwargs):
@@ -173,3 +176,22 @@ class TestExpandPug(unittest.TestCase):
     def test_basics(self):
         self.assertEqual(expand('!', { 'syntax': 'pug' }),
             'doctype html\nhtml(lang="en")\n\thead\n\t\tmeta(charset="UTF-8")\n\t\tmeta(name="viewport", content="width=device-width, initial-scale=1.0")\n\t\ttitle Document\n\tbody ')
+
+
+class TestPackage(unittest.TestCase):
+    def run_python(self, code: str) -> str:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.check_output([sys.executable, '-c', code], cwd=root).decode('utf-8').strip()
+
+    def test_star_import(self):
+        names = self.run_python('from emmet import *; print(" ".join(sorted(n for n in dir() if not n.startswith("__"))))').split()
+        self.assertEqual(sorted(names), sorted(emmet.__all__))
+        for name in ('Config', 'markup_abbreviation', 'stringify_markup', 'extract', 'Abbreviation',
+                     'AbbreviationNode', 'AbbreviationAttribute', 'expand', 'ScannerException'):
+            self.assertIn(name, names)
+        self.assertNotIn('import_module', names)
+
+    def test_submodules(self):
+        self.assertEqual(self.run_python('import emmet; print(emmet.markup.__name__, emmet.stylesheet.__name__)'),
+            'emmet.markup emmet.stylesheet')
+        self.assertFalse(hasattr(emmet, 'missing_module'))
@@ -1,9 +1,11 @@
 import unittest
+import random
 import sys
 
 sys.path.append('../')
 
-from emmet.extract_abbreviation import extract_abbreviation, is_at_html_tag, ExtractedAbbreviation
+from emmet.extract_abbreviation import extract_abbreviation, extract_all, start_offsets, get_start_offset, \
+    is_at_html_tag, ExtractedAbbreviation
 from emmet.extract_abbreviation.reader import BackwardScanner
 from emmet.extract_abbreviation.is_html import consume_quoted
 
@@ -22,6 +24,23 @@ def result(abbreviation: str, location: int, start=None):
     return ExtractedAbbreviation(abbreviation, location, start, location + len(abbreviation))
 
 
+def extract_all_words(code: str, options={}):
+    "Reference implementation of `extract_all()`: extracts abbreviation at every word end"
+    items = []
+    offset = 0
+    for line in code.split('\n'):
+        for word_end in range(1, len(line) + 1):
+            if not line[word_end - 1].isspace() and (word_end == len(line) or line[word_end].isspace()):
+                abbr = extract_abbreviation(line, word_end, options)
+                if abbr:
+                    while items and items[-1].end > abbr.start + offset:
+                        items.pop()
+                    items.append(ExtractedAbbreviation(abbr.abbreviation, abbr.location + offset,
+                        abbr.start + offset, abbr.end + offset))
+        offset += len(line) + 1
+    return items
+
+
 class TestExtractAbbreviation(unittest.TestCase):
     def test_basic(self):
         self.assertEqual(extract('.bar'), result('.bar', 0))
@@ -67,6 +86,33 @@ class TestExtractAbbreviation(unittest.TestCase):
         # Absent prefix
         self.assertEqual(extract('<foo>bar[a b="c"]>baz', {'prefix': '&&'}), None)
 
+    def test_extract_all(self):
+        code = 'Hello ul>li*2\n<div>\n  p.a[title="a b"]{x y}'
+        self.assertEqual(extract_all(code), [
+            result('Hello', 0),
+            result('ul>li*2', 6),
+            result('p.a[title="a b"]{x y}', 22)
+        ])
+
+        code = '<foo>bar[a b="c"]>baz text <a>b'
+        self.assertEqual(extract_all(code, { 'prefix': '<' }), [
+            result('text', 22, 0),
+            result('a>b', 28, 27)
+        ])
+        self.assertEqual(extract_all(code, { 'prefix': '&&' }), [])
+        self.assertEqual(extract_all('a { p10+m5 }', { 'type': 'stylesheet' }), [result('a', 0), result('p10+m5', 4)])
+
+    def test_extract_all_random(self):
+        rnd = random.Random(1)
+        alphabet = 'abc  <>[]{}()"\'=/.*+#-:\n\t'
+        for _ in range(2000):
+            code = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 30)))
+            for options in ({}, { 'prefix': '<' }, { 'prefix': '&&', 'type': 'stylesheet' }):
+                self.assertEqual(extract_all(code, options), extract_all_words(code, options), (code, options))
+
+            for line in code.split('\n'):
+                self.assertEqual(start_offsets(line, '<'), [get_start_offset(line, pos, '<') for pos in range(len(line) + 1)])
+
     def test_brackets_inside_curly_braces(self):
         self.assertEqual(extract('foo div{[}+a{}'), result('div{[}+a{}', 4))
         self.assertEqual(extract('div{}}'), None)
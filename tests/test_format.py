@@ -232,3 +232,36 @@ class TestSlimFormat(unittest.TestCase):
         self.assertEqual(output_slim('{${0} ${1:foo} ${2:bar}}*2'), ' foo bar foo bar')
         self.assertEqual(output_slim('ul>li*2', field), 'ul\n\tli ${1}\n\tli ${2}')
         self.assertEqual(output_slim('div>img[src]/', field), 'div\n\timg src="${1}" alt="${2}"/')
+
+
+class TestLazyRepeat(unittest.TestCase):
+    abbrs = [
+        'ul>li*3>a', 'ul>li.item$*5>a[href="#$"]{Item $@-}', 'ul>.item$$$*12',
+        'table>tr*3>td.c$@^*2{$@3}', 'ul>li*2>span*3.c$@^', 'select>option[value=$]{Option $}*5',
+        'ul>li*3>label>input', 'li*3>b{a\nb $}', 'p*3{<h$ >}', 'a*3[title="x $"]+b*2',
+        'ul>li*3>a[href=${1:url}]{${2:t} $}', 'div*3>{$}+span', 'input:c*3', 'dl>(dt+dd)*3',
+        'span*12{$}', 'li$*3', '.x*3>.y$*3', 'div[a=$ b.]*3', 'div{foo}*3>b', '{$}*3'
+    ]
+
+    def test_output(self):
+        for options in ({}, { 'comment.enabled': True }, { 'output.format': False }):
+            eager = Config({ 'options': dict(options, **{ 'output.field': tabstops }) })
+            lazy = Config({ 'options': dict(options, **{ 'output.field': tabstops, 'markup.lazyRepeat': 1 }) })
+            for fmt in (html, haml, pug, slim):
+                for abbr in self.abbrs:
+                    self.assertEqual(fmt(parse(abbr, lazy), lazy), fmt(parse(abbr, eager), eager), abbr)
+
+    def test_max_repeat(self):
+        eager = Config({ 'max_repeat': 7 })
+        lazy = Config({ 'max_repeat': 7, 'options': { 'markup.lazyRepeat': 1 } })
+        for abbr in ('ul>li*3>a*2', 'ul>li*2>a*2', 'li*10'):
+            self.assertEqual(html(parse(abbr, lazy), lazy), html(parse(abbr, eager), eager), abbr)
+
+    def test_template(self):
+        def count(node):
+            return sum(count(child) + 1 for child in node.children)
+
+        config = Config({ 'options': { 'markup.lazyRepeat': 10 } })
+        abbr = parse('ul>li.item$*10000>a[href=#$]', config)
+        self.assertEqual(count(abbr), 3)
+        self.assertEqual(count(parse('ul>li.item$*9>a', config)), 19)
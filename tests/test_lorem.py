@@ -4,12 +4,22 @@ import re
 
 sys.path.append('../')
 
-from emmet import expand
+from random import Random
+from emmet import expand, expand_many, iter_expand, markup_abbreviation, Config
+from emmet.markup.format.indent_format import value_length
+from emmet.markup.lorem import LoremText, vocabularies, paragraph, sample, choice, sentence, insert_commas
 
 def word_count(text: str):
     return len(text.split(' '))
 
 
+class Unprintable(LoremText):
+    __slots__ = ()
+
+    def __str__(self):
+        raise AssertionError('Text must not be produced as a single string')
+
+
 class TestLoremIpsum(unittest.TestCase):
     def test_single(self):
         output = expand('lorem')
@@ -59,3 +69,67 @@ class TestLoremIpsum(unittest.TestCase):
         self.assertEqual(len(lines), 5)
         self.assertTrue(re.match(r'^^<li>Lorem,?\sipsum', lines[1]))
         self.assertFalse(re.match(r'^^<li>Lorem,?\sipsum', lines[2]))
+
+    def test_seed(self):
+        config = { 'options': { 'lorem.seed': 42 } }
+        output = expand('ul>li*3>lorem10-20', config)
+        self.assertEqual(expand('ul>li*3>lorem10-20', config), output)
+        self.assertNotEqual(expand('ul>li*3>lorem10-20', { 'options': { 'lorem.seed': 43 } }), output)
+        self.assertEqual(expand_many(['a', 'ul>li*3>lorem10-20'], config)[1], output)
+
+        # Every paragraph has its own text
+        lines = expand('lorem8*3', config).splitlines()
+        self.assertEqual(len(set(lines)), 3)
+
+        # Random instance is used as is
+        config = { 'options': { 'lorem.seed': Random(1) } }
+        self.assertNotEqual(expand('lorem10', config), expand('lorem10', config))
+
+    def test_large(self):
+        output = expand('lorem5000', { 'options': { 'lorem.seed': 'seed' } })
+        self.assertTrue(re.match(r'^Lorem,?\sipsum', output))
+        self.assertEqual(word_count(output), 5000)
+
+        # Words of every sentence are distinct
+        for sentence in re.split(r'[.?!]\s*', output):
+            words = [w.strip(',').lower() for w in sentence.split()]
+            self.assertEqual(len(words), len(set(words)))
+
+    def test_stream(self):
+        config = { 'options': { 'lorem.seed': 1 } }
+        abbr = markup_abbreviation('p>lorem3000', Config(config))
+        text = abbr.children[0].children[0].value[0]
+        self.assertIsInstance(text, LoremText)
+        self.assertEqual(str(text), str(text))
+        self.assertEqual(word_count(str(text)), 3000)
+
+        output = expand('p>lorem3000', config)
+        self.assertEqual(output, '<p>%s</p>' % text)
+        self.assertEqual(''.join(iter_expand('p>lorem3000', config)), output)
+        self.assertEqual(word_count(expand('p>lorem3000', { 'syntax': 'pug' })), 3000)
+
+        # Length of multi-line value is measured without producing text
+        self.assertEqual(len(text), len(str(text)))
+        text.__class__ = Unprintable
+        self.assertEqual(value_length(['foo', text]), len(text) + 3)
+
+    def test_module_api(self):
+        latin = vocabularies['latin']
+        self.assertEqual(sorted(vocabularies), ['latin', 'ru', 'sp'])
+        self.assertEqual(latin['common'][0], 'lorem')
+
+        text = paragraph(latin, 12, True)
+        self.assertTrue(re.match(r'^Lorem,?\sipsum', text))
+        self.assertEqual(word_count(text), 12)
+        self.assertEqual(len(set(sample(latin['words'], 5))), 5)
+        self.assertIn(choice('abc'), 'abc')
+        self.assertEqual(sentence(['foo', 'bar'], '.'), 'Foo bar.')
+        self.assertEqual(len(insert_commas(['a', 'b', 'c'])), 3)
+
+        # Custom vocabulary
+        vocabularies['xx'] = { 'words': ['foo', 'bar', 'baz'] }
+        try:
+            self.assertEqual(set(expand('loremxx3').rstrip('.?!').lower().replace(',', '').split()), {'foo', 'bar', 'baz'})
+        finally:
+            del vocabularies['xx']
+
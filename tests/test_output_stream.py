@@ -2,9 +2,18 @@ import unittest
 import sys
 
 sys.path.append('../')
-from emmet.output_stream import OutputStream, tag_name, attr_name, self_close, is_inline
+from emmet import expand, expand_markup, iter_expand, get_config
+from emmet.output_stream import OutputStream, iter_output, tag_name, attr_name, self_close, is_inline
 from emmet.config import Config
 
+class Sink:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk: str):
+        self.chunks.append(chunk)
+
+
 class TestOutputStream(unittest.TestCase):
     def test_stream(self):
         conf = Config({'options': {'output.baseIndent': '>>'}})
@@ -79,3 +88,40 @@ class TestOutputStream(unittest.TestCase):
         self.assertEqual(is_inline('a', config), True)
         self.assertEqual(is_inline('b', config), True)
         self.assertEqual(is_inline('c', config), False)
+
+    def test_sink(self):
+        sink = Sink()
+        out = OutputStream(Config().options, sink=sink, buffer_size=4)
+        out.push('aa')
+        self.assertEqual(sink.chunks, [])
+        out.push_string('bb\ncc')
+        self.assertEqual(sink.chunks, ['aabb'])
+        out.flush()
+        self.assertEqual(sink.chunks, ['aabb', '\ncc'])
+        self.assertEqual(out.value, '')
+        self.assertEqual(out.offset, 7)
+        self.assertEqual(out.line, 1)
+
+        for syntax in ('html', 'pug'):
+            abbr = 'ul>li.item$*300>a[href="#$"]{Item $}'
+            sink = Sink()
+            self.assertEqual(expand_markup(abbr, get_config({ 'syntax': syntax }), sink), '')
+            self.assertTrue(len(sink.chunks) > 1)
+            self.assertEqual(''.join(sink.chunks), expand(abbr, { 'syntax': syntax }))
+
+    def test_iter(self):
+        abbr = 'table>tr*200>td*5{Cell $}'
+        self.assertEqual(''.join(iter_expand(abbr, max_pending=1)), expand(abbr))
+        self.assertEqual(list(iter_expand('p10', { 'type': 'stylesheet' })), ['padding: 10px;'])
+
+        # Stop producer when consumer is gone
+        chunks = iter_expand('ul>li*5000', max_pending=1)
+        self.assertTrue(next(chunks))
+        chunks.close()
+
+        def fail(sink):
+            sink.write('a')
+            raise ValueError('b')
+
+        with self.assertRaises(ValueError):
+            list(iter_output(fail))
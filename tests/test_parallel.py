@@ -0,0 +1,31 @@
+import unittest
+import sys
+
+sys.path.append('../')
+
+from emmet import expand, Config
+from emmet.parallel import expand_parallel
+
+
+class TestParallelExpand(unittest.TestCase):
+    def test_expand(self):
+        abbrs = ['ul>li.item$*%d' % (i % 5 + 1) for i in range(50)]
+        result = list(expand_parallel(abbrs, { 'syntax': 'pug' }, max_workers=2, chunk_size=7))
+        self.assertEqual(result, [expand(abbr, { 'syntax': 'pug' }) for abbr in abbrs])
+
+        # Lazy input
+        abbrs = ('p%d' % i for i in range(30))
+        self.assertEqual(list(expand_parallel(abbrs, { 'type': 'stylesheet' }, max_workers=2, chunk_size=4)),
+            [expand('p%d' % i, { 'type': 'stylesheet' }) for i in range(30)])
+
+        self.assertEqual(list(expand_parallel([], max_workers=2)), [])
+
+    def test_config_instance(self):
+        with self.assertRaises(TypeError):
+            expand_parallel(['a'], Config())
+
+        with self.assertRaises(TypeError):
+            expand_parallel(None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import threading
+import sys
+
+sys.path.append('../')
+from emmet import expand, profile
+from emmet.profiler import get_profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_markup(self):
+        with profile() as profiler:
+            self.assertIs(get_profiler(), profiler)
+            self.assertEqual(expand('ul>li.item*2'), '<ul>\n\t<li class="item"></li>\n\t<li class="item"></li>\n</ul>')
+        self.assertIsNone(get_profiler())
+
+        self.assertEqual(len(profiler.reports), 1)
+        report = profiler.reports[0]
+        self.assertEqual(report.abbreviation, 'ul>li.item*2')
+        self.assertEqual(report.type, 'markup')
+        self.assertEqual(report.counts['nodes'], 3)
+        self.assertEqual(report.counts['output_nodes'], 3)
+        self.assertGreater(report.counts['tokens'], 0)
+
+        for stage in ('tokenize', 'parser', 'convert', 'resolve_snippets', 'transform', 'formatter'):
+            self.assertEqual(report.stages[stage].calls, 1, stage)
+
+        self.assertEqual(report.stages['transform/implicit_tag'].calls, 3)
+        self.assertEqual(report.stages['transform/lorem'].calls, 3)
+        self.assertNotIn('transform/bem', report.stages)
+        self.assertGreaterEqual(report.time, report.stages['transform'].time)
+
+        json = report.to_json()
+        self.assertEqual(json['stages']['parser']['calls'], 1)
+        self.assertEqual(json['counts']['nodes'], 3)
+
+    def test_stylesheet(self):
+        reports = []
+        with profile(reports.append, allocations=True) as profiler:
+            expand('p10+m5', {'type': 'stylesheet'})
+            expand('bd', {'type': 'stylesheet'})
+
+        self.assertEqual(profiler.reports, [])
+        self.assertEqual([r.abbreviation for r in reports], ['p10+m5', 'bd'])
+        self.assertEqual(reports[0].type, 'stylesheet')
+        self.assertEqual(reports[0].counts['nodes'], 2)
+        self.assertEqual(reports[0].stages['resolve_snippets'].calls, 2)
+        self.assertEqual(reports[0].stages['formatter'].calls, 1)
+
+    def test_disabled(self):
+        with profile() as profiler:
+            # Profiler is bound to thread where it was activated
+            thread = threading.Thread(target=lambda: expand('a'))
+            thread.start()
+            thread.join()
+
+        expand('b')
+        self.assertEqual(profiler.reports, [])
+
+    def test_nested(self):
+        with profile() as outer:
+            with profile() as inner:
+                expand('a')
+            expand('b')
+
+        self.assertEqual([r.abbreviation for r in inner.reports], ['a'])
+        self.assertEqual([r.abbreviation for r in outer.reports], ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import asyncio
+import threading
+import sys
+
+sys.path.append('../')
+
+from emmet import expand, extract
+from emmet.service import ExpandService, expand_async
+
+
+class TestExpandService(unittest.TestCase):
+    def test_expand(self):
+        async def run():
+            service = ExpandService()
+            return await asyncio.gather(
+                expand_async('ul>li*2'),
+                service.expand('p10', { 'type': 'stylesheet' }),
+                service.extract('foo ul>li', 9),
+                service.select_item_css('a { color: red; }', 0))
+
+        result = asyncio.run(run())
+        self.assertEqual(result[0], expand('ul>li*2'))
+        self.assertEqual(result[1], 'padding: 10px;')
+        self.assertEqual(result[2].abbreviation, extract('foo ul>li', 9).abbreviation)
+        self.assertEqual(result[3].ranges, [(0, 1)])
+
+    def test_coalesce(self):
+        calls = []
+        event = threading.Event()
+
+        def fn(value):
+            calls.append(value)
+            event.wait(5)
+            return value * 2
+
+        async def run():
+            service = ExpandService()
+            tasks = [service.run(fn, 1, key='a') for _ in range(3)] + [service.run(fn, 2, key='b')]
+            asyncio.get_running_loop().call_later(0.05, event.set)
+            return await asyncio.gather(*tasks)
+
+        self.assertEqual(asyncio.run(run()), [2, 2, 2, 4])
+        self.assertEqual(sorted(calls), [1, 2])
+
+    def test_timeout(self):
+        event = threading.Event()
+        calls = []
+
+        async def run():
+            service = ExpandService(max_pending=1)
+            with self.assertRaises(asyncio.TimeoutError):
+                await service.run(event.wait, 5, key='slow', timeout=0.05)
+
+            # Request waiting for free slot is cancelled and never runs
+            slow = asyncio.ensure_future(service.run(event.wait, 5))
+            queued = asyncio.ensure_future(service.run(calls.append, 1))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            event.set()
+            await slow
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            self.assertEqual(service.loop_state().inflight, {})
+
+        asyncio.run(run())
+        self.assertEqual(calls, [])
+
+    def test_event_loops(self):
+        # The same service is used from different event loops under contention
+        service = ExpandService(max_pending=1)
+
+        async def run():
+            return await asyncio.gather(*[service.run(abs, -i) for i in range(5)])
+
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+        self.assertEqual(asyncio.run(expand_async('a')), expand('a'))
+        self.assertEqual(asyncio.run(expand_async('b')), expand('b'))
+
+if __name__ == '__main__':
+    unittest.main()
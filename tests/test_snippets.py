@@ -1,11 +1,31 @@
 import unittest
 import sys
+import os
+import pickle
+import tempfile
 
 sys.path.append('../')
 
 from emmet import expand
 from emmet.config import markup_snippets, xsl_snippets
 from emmet.abbreviation import parse
+from emmet.markup.snippets import snippet_cache
+from emmet.config import clear_config_cache
+from emmet.snippets import compiled
+from emmet.snippets.build import build
+
+
+class Unpickled:
+    "Counts how many times its instances are unpickled"
+    calls = 0
+
+    def __reduce__(self):
+        return (unpickled, ())
+
+
+def unpickled():
+    Unpickled.calls += 1
+    return None
 
 
 class TestSnippets(unittest.TestCase):
@@ -18,3 +38,93 @@ class TestSnippets(unittest.TestCase):
     def test_xsl(self):
         for _, v in enumerate(xsl_snippets):
             self.assertTrue(parse(v))
+
+    def test_parsed_cache(self):
+        snippet_cache.clear()
+        self.assertEqual(expand('input:c'), '<input type="checkbox" name="" id="">')
+        misses = snippet_cache.misses
+        self.assertTrue(misses > 0)
+
+        # Cached snippet tree must not be affected by modifications of resolved tree
+        self.assertEqual(expand('input:c.foo[value=bar]'), '<input type="checkbox" name="" id="" class="foo" value="bar">')
+        self.assertEqual(expand('input:c'), '<input type="checkbox" name="" id="">')
+        self.assertEqual(snippet_cache.misses, misses)
+        self.assertTrue(snippet_cache.hits >= 2)
+
+        # Updated snippet is parsed again
+        self.assertEqual(expand('input:c', { 'snippets': { 'input:c': 'input[type=radio]' } }), '<input type="radio">')
+        self.assertEqual(snippet_cache.misses, misses + 1)
+
+        # Variables are part of parsed snippet
+        self.assertEqual(expand('html[lang=${lang}]'), '<html lang="en"></html>')
+        self.assertEqual(expand('!!!'), '<!DOCTYPE html>')
+        self.assertIn('lang="ru"', expand('html:5', { 'variables': { 'lang': 'ru' } }))
+        self.assertIn('lang="en"', expand('html:5'))
+
+    def test_compiled(self):
+        abbrs = [
+            ('p10', { 'type': 'stylesheet' }),
+            ('bd+', { 'type': 'stylesheet' }),
+            ('m10-a!', { 'type': 'stylesheet', 'syntax': 'scss' }),
+            ('foo', { 'type': 'stylesheet', 'snippets': { 'foo': 'foo: bar' } }),
+            ('p', { 'type': 'stylesheet', 'snippets': { 'p': 'padding: auto|inherit' } }),
+            ('html:5', {}),
+            ('input:c', {}),
+            ('tem', { 'syntax': 'xsl' }),
+            ('input:c', { 'snippets': { 'input:c': 'input[type=radio]' } }),
+        ]
+        expected = [expand(abbr, config) for abbr, config in abbrs]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data = compiled.load(build(tmp))
+            self.assertIsNotNone(data)
+
+            clear_config_cache()
+            snippet_cache.clear()
+            compiled.reset(data)
+            try:
+                self.assertEqual([expand(abbr, config) for abbr, config in abbrs], expected)
+            finally:
+                compiled.reset()
+                clear_config_cache()
+                snippet_cache.clear()
+
+            # Outdated or foreign data is ignored without unpickling it
+            file_path = os.path.join(tmp, compiled.file_name)
+            payload = pickle.dumps(Unpickled())
+            for content in (b'emmet-snippets 1 outdated\n' + payload, payload):
+                with open(file_path, 'wb') as f:
+                    f.write(content)
+                self.assertIsNone(compiled.load(file_path))
+            self.assertEqual(Unpickled.calls, 0)
+
+            with open(file_path, 'wb') as f:
+                f.write(compiled.header() + payload)
+            self.assertIsNone(compiled.load(file_path))
+            self.assertEqual(Unpickled.calls, 1)
+            self.assertIsNone(compiled.load(os.path.join(tmp, 'missing')))
+
+    def test_compiled_sources(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(compiled.__file__)))
+        files = [os.path.relpath(f, root).replace(os.sep, '/') for f in compiled.source_files(root)]
+        self.assertIn('abbreviation/convert.py', files)
+        self.assertIn('abbreviation/tokenizer/__init__.py', files)
+        self.assertIn('stylesheet/snippets.py', files)
+
+        # Compiled data is outdated when compiler source changes
+        source_files = compiled.source_files
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'convert.py')
+            with open(source, 'w') as f:
+                f.write('a = 1')
+
+            compiled.source_files = lambda root: [source]
+            try:
+                file_path = build(tmp)
+                self.assertIsNotNone(compiled.load(file_path))
+
+                with open(source, 'w') as f:
+                    f.write('a = 2')
+                self.assertIsNone(compiled.load(file_path))
+            finally:
+                compiled.source_files = source_files
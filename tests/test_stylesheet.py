@@ -4,8 +4,8 @@ import sys
 sys.path.append('../')
 
 from emmet import expand_stylesheet, parse_stylesheet_snippets, Config
-from emmet.stylesheet import CSSAbbreviationScope
-from emmet.stylesheet.score import calculate_score as score
+from emmet.stylesheet import CSSAbbreviationScope, find_best_match
+from emmet.stylesheet.score import calculate_score as score, MatchIndex
 
 def field(index: int, placeholder: str, **kwargs):
     if placeholder:
@@ -60,6 +60,14 @@ class TestStylesheetScoring(unittest.TestCase):
         self.assertEqual(pick('p', items), 'p')
         self.assertEqual(pick('poa', items), 'pos')
 
+    def test_match_index(self):
+        items = ['p', 'pb', 'pl', 'pos', 'pa', 'oa', 'soa', 'pr', 'pt', 'a-b', 'abb', 'Pa', '']
+        index = MatchIndex(items)
+
+        for abbr in ['p', 'poa', 'P', 'ab', 'abb', 'o', 'x', '', 'pbbb']:
+            for partial in (True, False):
+                self.assertEqual(find_best_match(abbr, index, 0, partial), find_best_match(abbr, items, 0, partial), abbr)
+
 
 class TestStylesheetAbbreviations(unittest.TestCase):
     def test_keyword(self):